@@ -10,17 +10,29 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.storage import Store
 
 from .client import ACInfinityClient
 from .const import ConfigurationKey, DEFAULT_POLLING_INTERVAL, DOMAIN, PLATFORMS, HOST, ControllerPropertyKey, \
-    EntityConfigValue
+    EntityConfigValue, DEFAULT_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_REQUESTS_PER_REFRESH, DEFAULT_MAX_STALENESS, DEFAULT_SETTINGS_POLLING_INTERVAL, \
+    ENTITY_PROPERTY_KEYS, SNAPSHOT_STORAGE_VERSION, TOKEN_STORAGE_VERSION, DEFAULT_MIN_POLLING_INTERVAL, DEFAULT_MAX_POLLING_INTERVAL
 from .core import (
     ACInfinityDataUpdateCoordinator,
+    ACInfinityPropertyProjection,
     ACInfinityService,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# the snapshot store of each config entry, by entry id
+_SNAPSHOT_STORES = f"{DOMAIN}_snapshot_stores"
+
+# the token store of each config entry, by entry id
+_TOKEN_STORES = f"{DOMAIN}_token_stores"
+
+# the fields of the devInfoListAll payload that any entity reads; the service drops the rest as it ingests each refresh
+_PROPERTY_PROJECTION = ACInfinityPropertyProjection(ENTITY_PROPERTY_KEYS)
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up AC Infinity from a config entry."""
@@ -33,17 +45,77 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         else DEFAULT_POLLING_INTERVAL
     )
 
+    min_polling_interval = (
+        int(entry.data[ConfigurationKey.MIN_POLLING_INTERVAL])
+        if ConfigurationKey.MIN_POLLING_INTERVAL in entry.data
+        else DEFAULT_MIN_POLLING_INTERVAL
+    )
+
+    max_polling_interval = (
+        int(entry.data[ConfigurationKey.MAX_POLLING_INTERVAL])
+        if ConfigurationKey.MAX_POLLING_INTERVAL in entry.data
+        else DEFAULT_MAX_POLLING_INTERVAL
+    )
+
+    settings_polling_interval = (
+        int(entry.data[ConfigurationKey.SETTINGS_POLLING_INTERVAL])
+        if ConfigurationKey.SETTINGS_POLLING_INTERVAL in entry.data
+        else DEFAULT_SETTINGS_POLLING_INTERVAL
+    )
+
+    max_concurrent_requests = (
+        int(entry.data[ConfigurationKey.MAX_CONCURRENT_REQUESTS])
+        if ConfigurationKey.MAX_CONCURRENT_REQUESTS in entry.data
+        else DEFAULT_MAX_CONCURRENT_REQUESTS
+    )
+
+    max_requests_per_refresh = (
+        int(entry.data[ConfigurationKey.MAX_REQUESTS_PER_REFRESH])
+        if ConfigurationKey.MAX_REQUESTS_PER_REFRESH in entry.data
+        else DEFAULT_MAX_REQUESTS_PER_REFRESH
+    )
+
+    max_staleness = (
+        int(entry.data[ConfigurationKey.MAX_STALENESS])
+        if ConfigurationKey.MAX_STALENESS in entry.data
+        else DEFAULT_MAX_STALENESS
+    )
+
+    # reuse the token from the last log in, so warm restarts and reloads skip the log in round-trip
+    email = entry.data[CONF_EMAIL]
+    token_store = __token_store(hass, entry)
+    persisted_token = await token_store.async_load()
+    token = persisted_token["token"] if persisted_token and persisted_token.get("email") == email else None
+
+    def save_token(new_token: str | None) -> None:
+        token_store.async_delay_save(lambda: {"email": email, "token": new_token}, 0)
+
     service = ACInfinityService(
-        ACInfinityClient(HOST, entry.data[CONF_EMAIL], entry.data[CONF_PASSWORD])
+        ACInfinityClient(HOST, email, entry.data[CONF_PASSWORD], token=token, token_listener=save_token),
+        max_concurrent_requests=max_concurrent_requests,
+        max_requests_per_refresh=max_requests_per_refresh,
+        property_projection=_PROPERTY_PROJECTION,
     )
 
     coordinator = ACInfinityDataUpdateCoordinator(
-        hass, entry, service, polling_interval
+        hass,
+        entry,
+        service,
+        polling_interval,
+        snapshot_store=__snapshot_store(hass, entry),
+        max_staleness=max_staleness,
+        settings_polling_interval=settings_polling_interval,
+        min_polling_interval=min_polling_interval,
+        max_polling_interval=max_polling_interval,
     )
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
-    await coordinator.async_config_entry_first_refresh()
+    if await coordinator.async_load_snapshot():
+        # entities come up right away from the last good snapshot; fresh data follows in the background
+        entry.async_create_background_task(hass, coordinator.async_refresh(), f"{DOMAIN} initial refresh")
+    else:
+        await coordinator.async_config_entry_first_refresh()
     await __initialize_new_devices_if_any(hass, entry, coordinator.ac_infinity)
 
     # Set up platforms with updated configuration
@@ -58,6 +130,24 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+def __snapshot_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """The storage the last good data of a config entry is persisted in between restarts. The same instance is
+    returned for the life of Home Assistant, so removing it also cancels a save it still has pending."""
+    stores = hass.data.setdefault(_SNAPSHOT_STORES, {})
+    if entry.entry_id not in stores:
+        stores[entry.entry_id] = Store(hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.snapshot")
+    return stores[entry.entry_id]
+
+
+def __token_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    """The storage the log in token of a config entry is persisted in between restarts. The same instance is
+    returned for the life of Home Assistant, so removing it also cancels a save it still has pending."""
+    stores = hass.data.setdefault(_TOKEN_STORES, {})
+    if entry.entry_id not in stores:
+        stores[entry.entry_id] = Store(hass, TOKEN_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.token")
+    return stores[entry.entry_id]
+
+
 async def __initialize_new_devices_if_any(
     hass: HomeAssistant, 
     entry: ConfigEntry, 
@@ -151,12 +241,21 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         coordinator = hass.data[DOMAIN][entry.entry_id]
+        await coordinator.async_flush_snapshot()
         await coordinator.ac_infinity.close()
         hass.data[DOMAIN].pop(entry.entry_id)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the persisted data of a config entry when it is deleted."""
+    await __snapshot_store(hass, entry).async_remove()
+    hass.data[_SNAPSHOT_STORES].pop(entry.entry_id, None)
+    await __token_store(hass, entry).async_remove()
+    hass.data[_TOKEN_STORES].pop(entry.entry_id, None)
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload the config entry when options change."""
     await hass.config_entries.async_reload(entry.entry_id)
@@ -12,6 +12,7 @@ from homeassistant.core import HomeAssistant
 
 from custom_components.ac_infinity.const import (
     DOMAIN,
+    SENSOR_VALUE_KEYS,
     ControllerPropertyKey,
     DevicePropertyKey,
     SensorPropertyKey,
@@ -147,6 +148,7 @@ SENSOR_DESCRIPTIONS: dict[int, ACInfinitySensorBinarySensorEntityDescription] =
         enabled_fn=enabled_fn_sensor,
         suitable_fn=__suitable_fn_sensor_default,
         get_value_fn=__get_value_fn_sensor_value_default,
+        data_keys=SENSOR_VALUE_KEYS,
     ),
 }
 
@@ -292,4 +294,4 @@ async def async_setup_entry(
                 )
                 entities.append_if_suitable(device_entity)
 
-    add_entities_callback(entities)
+    entities.async_add(coordinator, add_entities_callback)
@@ -1,5 +1,11 @@
+import asyncio
 import json
 import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar, Token
+from typing import Any
 from urllib.parse import urlencode
 
 import aiohttp
@@ -18,22 +24,202 @@ API_URL_MODE_AND_SETTINGS = "/api/dev/modeAndSetting"
 API_URL_GET_DEV_SETTING = "/api/dev/getDevSetting"
 API_URL_UPDATE_ADV_SETTING = "/api/dev/updateAdvSetting"
 
+# response codes returned when the token sent with a request is missing, expired or revoked
+API_AUTH_FAILURE_CODES = frozenset({401, 403, 10001})
+
+# endpoints that change values or log in; they are sent ahead of reads when the request budget runs low
+API_WRITE_URLS = frozenset({API_URL_LOGIN, API_URL_ADD_DEV_MODE, API_URL_MODE_AND_SETTINGS, API_URL_UPDATE_ADV_SETTING})
+
+# the longest, in seconds, a single request may take; less if the current deadline leaves less time
+REQUEST_TIMEOUT = 10
+
+# the sustained number of requests per second sent to the AC Infinity API, and how many can be sent in a burst
+REQUEST_RATE = 1.0
+REQUEST_BURST = 30
+
+# the part of the burst that only writes can use, so that changes made by the user are not held up by refreshes
+WRITE_RESERVE = 5
+
+
+class ACInfinityDeadline:
+    """A point in time by which a unit of work, such as a refresh with all its requests and retries, must be done.
+    Entered as a context manager, it becomes the current deadline of the task and of any tasks it creates,
+    and each request then only waits for the time that is left."""
+
+    _current: ContextVar["ACInfinityDeadline | None"] = ContextVar("ac_infinity_deadline", default=None)
+
+    def __init__(self, timeout: float) -> None:
+        """
+        Args:
+            timeout: the time, in seconds, from now until the deadline
+        """
+        self._expires_at = time.monotonic() + timeout
+        self._tokens: list[Token] = []
+
+    @classmethod
+    def current(cls) -> "ACInfinityDeadline | None":
+        """The deadline of the current task, or None if there is none"""
+        return cls._current.get()
+
+    @property
+    def remaining(self) -> float:
+        """The time, in seconds, left until the deadline; zero once it has passed"""
+        return max(0.0, self._expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining <= 0
+
+    def __enter__(self) -> "ACInfinityDeadline":
+        self._tokens.append(self._current.set(self))
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._current.reset(self._tokens.pop())
+
+
+class ACInfinityRateLimiter:
+    """A token bucket limiting the rate requests are sent to the AC Infinity API at. Reads leave the last few tokens
+    to writes, and wait while any write is waiting, so writes are sent first when the budget runs low."""
+
+    def __init__(self, rate: float = REQUEST_RATE, burst: int = REQUEST_BURST, write_reserve: int = WRITE_RESERVE) -> None:
+        """
+        Args:
+            rate: the number of tokens added back to the bucket each second
+            burst: the number of tokens the bucket holds when full
+            write_reserve: the number of tokens reads leave in the bucket for writes
+        """
+        self._rate = rate
+        self._burst = burst
+        self._write_reserve = min(write_reserve, burst - 1)
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._waiting_writes = 0
+
+        # monotonic send time of each request of the last minute, by endpoint
+        self._sent: dict[str, deque[float]] = {}
+
+    @property
+    def remaining(self) -> float:
+        """The part of the burst left to send requests with, from 0 to 1"""
+        self.__refill()
+        return self._tokens / self._burst
+
+    @property
+    def requests_per_minute(self) -> dict[str, int]:
+        """The number of requests sent in the last minute, by endpoint"""
+        now = time.monotonic()
+        for sent in self._sent.values():
+            while sent and now - sent[0] > 60:
+                sent.popleft()
+
+        return {endpoint: len(sent) for endpoint, sent in self._sent.items()}
+
+    async def acquire(self, endpoint: str) -> None:
+        """Waits until the budget allows a request to the given endpoint, and takes a token for it. Gives up with
+        ACInfinityClientDeadlineExceeded if the current deadline would pass first.
+
+        Args:
+            endpoint: the path of the endpoint the request is sent to, without its query string
+        """
+        is_write = endpoint in API_WRITE_URLS
+        if is_write:
+            self._waiting_writes += 1
+
+        try:
+            while True:
+                self.__refill()
+                floor = 1.0 if is_write else 1.0 + self._write_reserve
+                if self._tokens >= floor and (is_write or not self._waiting_writes):
+                    break
+
+                # a read held back only by a waiting write checks again once the write could have taken its token
+                wait = (floor - self._tokens if self._tokens < floor else 1.0) / self._rate
+                deadline = ACInfinityDeadline.current()
+                if deadline is not None and deadline.remaining < wait:
+                    raise ACInfinityClientDeadlineExceeded("Request budget would not allow the request before the deadline")
+
+                _LOGGER.debug("Request budget used up; waiting %.2f seconds to call %s", wait, endpoint)
+                await asyncio.sleep(wait)
+        finally:
+            if is_write:
+                self._waiting_writes -= 1
+
+        self._tokens -= 1
+        self._sent.setdefault(endpoint, deque()).append(time.monotonic())
+
+    def __refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(float(self._burst), self._tokens + (now - self._refilled_at) * self._rate)
+        self._refilled_at = now
+
 
 class ACInfinityClient:
     """Encapsulates http calls to the AC Infinity API"""
 
-    def __init__(self, host: str, email: str, password: str) -> None:
+    def __init__(
+        self,
+        host: str,
+        email: str,
+        password: str,
+        *,
+        token: str | None = None,
+        token_listener: Callable[[str | None], None] | None = None,
+        rate_limiter: ACInfinityRateLimiter | None = None,
+    ) -> None:
         """
         Args:
             host: The base host of the AC Infinity API
             email: The e-mail to log in as, as configured by the user via config_flow
             password: The password to log in with, as configured by the user via config_flow
+            token: A token obtained by a previous log in, to reuse instead of logging in again
+            token_listener: Called with the new token whenever it is obtained by logging in or discarded, so it can be persisted
+            rate_limiter: Limits the rate requests are sent at; shared by reads and writes
         """
         self._host = host
         self._email = email
         self._password = password
-        self._user_id: str | None = None
+        self._user_id: str | None = token
+        self._token_listener = token_listener
+        self._login_task: asyncio.Task | None = None
         self._session: aiohttp.ClientSession | None = None
+        self._rate_limiter = rate_limiter or ACInfinityRateLimiter()
+
+        # identical read requests in flight share one future, and responses are memoized until the next refresh generation
+        self._generation = 0
+        self._in_flight: dict[tuple[str, str, int], asyncio.Future] = {}
+        self._memo: dict[tuple[str, str, int], Any] = {}
+
+    @property
+    def rate_limiter(self) -> ACInfinityRateLimiter:
+        """Limits the rate requests are sent at, and counts the requests sent per endpoint"""
+        return self._rate_limiter
+
+    @property
+    def generation(self) -> int:
+        """The current refresh generation. Memoized responses are only reused within the generation they were fetched in"""
+        return self._generation
+
+    def begin_refresh_generation(self) -> int:
+        """Starts a new refresh generation, discarding all responses memoized during previous generations.
+        Requests already in flight are still shared, but their responses will not be memoized.
+        """
+        self._generation += 1
+        self._memo.clear()
+        self._in_flight.clear()
+        return self._generation
+
+    def invalidate_device(self, controller_id: str | int, device_port: int) -> None:
+        """Discards memoized and in-flight read responses for a port, so the next read fetches fresh values.
+
+        Args:
+            controller_id: The parent controller id of the port
+            device_port: The port on the controller to invalidate
+        """
+        for path in (API_URL_GET_DEV_MODE_SETTING, API_URL_GET_DEV_SETTING):
+            key = (path, str(controller_id), device_port)
+            self._memo.pop(key, None)
+            self._in_flight.pop(key, None)
 
     async def login(self):
         """Call the log in endpoint with the configured email and password, and obtain the user id to use for subsequent calls"""
@@ -48,12 +234,25 @@ class ACInfinityClient:
             {"appEmail": self._email, "appPasswordl": normalized_password},
             headers,
         )
-        self._user_id = response["data"]["appId"]
+        self.__set_token(response["data"]["appId"])
 
     def is_logged_in(self):
         """returns true if the user id is set, false otherwise"""
         return True if self._user_id else False
 
+    @property
+    def token(self) -> str | None:
+        """The token sent with authenticated requests, or None if not logged in"""
+        return self._user_id
+
+    def __set_token(self, token: str | None) -> None:
+        if token == self._user_id:
+            return
+
+        self._user_id = token
+        if self._token_listener is not None:
+            self._token_listener(token)
+
     async def get_account_controllers(self):
         """Obtains a list of controllers, including metadata and some sensor values.
         Does not include information related to settings.
@@ -79,10 +278,7 @@ class ACInfinityClient:
             raise ACInfinityClientCannotConnect("AC Infinity client is not logged in.")
 
         headers = self.__create_headers(use_auth_token=True)
-        body = await self.__post(
-            API_URL_GET_DEV_MODE_SETTING, {"devId": controller_id, "port": device_port}, headers
-        )
-        return body["data"]
+        return await self.__get_coalesced(API_URL_GET_DEV_MODE_SETTING, controller_id, device_port, headers)
 
     @staticmethod
     def __transfer_values(device_control_keys: list[str], new_values: dict, existing_values: dict):
@@ -101,7 +297,11 @@ class ACInfinityClient:
         return updated
 
     async def update_device_controls(
-        self, controller_id: str | int, device_port: int, key_values: dict[str, int]
+        self,
+        controller_id: str | int,
+        device_port: int,
+        key_values: dict[str, int],
+        existing_values: dict | None = None,
     ):
         """Sets the provided settings on a port to a new values
 
@@ -109,15 +309,15 @@ class ACInfinityClient:
             controller_id: The parent controller id
             device_port: The port on the controller the device is plugged into
             key_values: The key value pairs of settings to set
+            existing_values: A recent snapshot of the port's current values to build the payload from.
+                When omitted, the current values are fetched from the API first.
         """
         if not self.is_logged_in():
             raise ACInfinityClientCannotConnect("AC Infinity client is not logged in.")
 
         headers = self.__create_headers(use_auth_token=True)
-        body = await self.__post(
-            API_URL_GET_DEV_MODE_SETTING, {"devId": controller_id, "port": device_port}, headers
-        )
-        existing_values = body["data"]
+        if existing_values is None:
+            existing_values = await self.__get_coalesced(API_URL_GET_DEV_MODE_SETTING, controller_id, device_port, headers)
 
         device_control_keys: list[str] = [
             getattr(DeviceControlKey, attr)
@@ -126,10 +326,18 @@ class ACInfinityClient:
         ]
 
         updated = self.__transfer_values(device_control_keys, key_values, existing_values)
-        _ = await self.__post(f"{API_URL_ADD_DEV_MODE}?{urlencode(updated)}", None, headers)
+        try:
+            _ = await self.__post(f"{API_URL_ADD_DEV_MODE}?{urlencode(updated)}", None, headers)
+        finally:
+            self.invalidate_device(controller_id, device_port)
 
     async def update_device_settings(
-        self, controller_id: str | int, device_port: int, device_name: str, key_values: dict[str, int]
+        self,
+        controller_id: str | int,
+        device_port: int,
+        device_name: str,
+        key_values: dict[str, int],
+        existing_values: dict | None = None,
     ):
         """Sets the provided settings on a port to a new values
 
@@ -138,15 +346,15 @@ class ACInfinityClient:
             device_port: The port on the controller the device is plugged into
             device_name: The name of the device
             key_values: The key value pairs of settings to set
+            existing_values: A recent snapshot of the port's current values to build the payload from.
+                When omitted, the current values are fetched from the API first.
         """
         if not self.is_logged_in():
             raise ACInfinityClientCannotConnect("AC Infinity client is not logged in.")
 
         headers = self.__create_headers(use_auth_token=True)
-        body = await self.__post(
-            API_URL_GET_DEV_SETTING, {"devId": controller_id, "port": device_port}, headers
-        )
-        existing_values = body["data"]
+        if existing_values is None:
+            existing_values = await self.__get_coalesced(API_URL_GET_DEV_SETTING, controller_id, device_port, headers)
 
         device_settings_keys: list[str] = [
             getattr(AdvancedSettingsKey, attr)
@@ -157,10 +365,17 @@ class ACInfinityClient:
         updated = self.__transfer_values(device_settings_keys, key_values, existing_values)
         updated[AdvancedSettingsKey.DEV_NAME] = device_name
 
-        _ = await self.__post(f"{API_URL_UPDATE_ADV_SETTING}?{urlencode(updated)}", None, headers)
+        try:
+            _ = await self.__post(f"{API_URL_UPDATE_ADV_SETTING}?{urlencode(updated)}", None, headers)
+        finally:
+            self.invalidate_device(controller_id, device_port)
 
     async def update_ai_device_control_and_settings(
-        self, controller_id: str | int, device_port: int, key_values: dict[str, int]
+        self,
+        controller_id: str | int,
+        device_port: int,
+        key_values: dict[str, int],
+        existing_values: dict | None = None,
     ):
         """Sets the provided settings on a port to a new values
 
@@ -168,15 +383,15 @@ class ACInfinityClient:
             controller_id: id of the controller
             device_port: port of the device
             key_values: The key value pairs of settings to set
+            existing_values: A recent snapshot of the port's current values to build the payload from.
+                When omitted, the current values are fetched from the API first.
         """
         if not self.is_logged_in():
             raise ACInfinityClientCannotConnect("AC Infinity client is not logged in.")
 
         headers = self.__create_headers(use_auth_token=True, use_min_version=True)
-        body = await self.__post(
-            API_URL_GET_DEV_MODE_SETTING, {"devId": controller_id, "port": device_port}, headers
-        )
-        existing_values = body["data"]
+        if existing_values is None:
+            existing_values = await self.__get_coalesced(API_URL_GET_DEV_MODE_SETTING, controller_id, device_port, headers)
 
         flattened = existing_values[DeviceControlKey.DEV_SETTING].copy()
         flattened.update(existing_values)
@@ -207,7 +422,10 @@ class ACInfinityClient:
                 raise ValueError(f"Unable to find setting id string - Unknown atType {at_type}")
 
         url = f"{API_URL_MODE_AND_SETTINGS}?{urlencode(updated)}"
-        _ = await self.__put(url, headers)
+        try:
+            _ = await self.__put(url, headers)
+        finally:
+            self.invalidate_device(controller_id, device_port)
 
     async def close(self) -> None:
         """Close the session when done"""
@@ -215,6 +433,65 @@ class ACInfinityClient:
             await self._session.close()
         self._session = None
 
+    async def __get_coalesced(self, path: str, controller_id: str | int, device_port: int, headers: dict):
+        """Obtains the data of a per-port read endpoint. Identical requests already in flight are joined rather than
+        re-sent, and responses are memoized for the rest of the current refresh generation.
+
+        Args:
+            path: The read endpoint to call
+            controller_id: The parent controller id of the port
+            device_port: The port on the controller to read
+            headers: The headers to send if a new request has to be made
+        """
+        key = (path, str(controller_id), device_port)
+        return await self.__coalesce(
+            key,
+            lambda: self.__post(path, {"devId": controller_id, "port": device_port}, headers),
+        )
+
+    async def __coalesce(self, key: tuple[str, str, int], request: Callable[[], Awaitable[dict]]):
+        """single-flight and memoize a request by key; returns the data field of the response body"""
+        while True:
+            if key in self._memo:
+                return self._memo[key]
+
+            in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                break
+
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                # the request we joined was cancelled by its owner; issue our own unless we were cancelled ourselves
+                task = asyncio.current_task()
+                if not in_flight.cancelled() or (task is not None and task.cancelling()):
+                    raise
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        generation = self._generation
+        try:
+            body = await request()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as ex:
+            future.set_exception(ex)
+            future.exception()  # mark as retrieved; followers re-raise it themselves
+            raise
+        finally:
+            if self._in_flight.get(key) is future:
+                self._in_flight.pop(key)
+            else:
+                # invalidated while in flight; the response may predate a write, so don't memoize it
+                generation = -1
+
+        data = body["data"]
+        if generation == self._generation:
+            self._memo[key] = data
+        future.set_result(data)
+        return data
+
     async def __get_session(self) -> aiohttp.ClientSession:
         """Get or create the HTTP session"""
         if self._session is None or self._session.closed:
@@ -224,35 +501,98 @@ class ACInfinityClient:
     async def __post(self, path, post_data, headers):
         """generically make a post request to the AC Infinity API"""
         session = await self.__get_session()
-        async with async_timeout.timeout(10), session.post(
-            f"{self._host}{path}", data=post_data, headers=headers
-        ) as response:
-            if response.status != 200:
-                raise ACInfinityClientCannotConnect
 
-            body = await response.json()
-            if body["code"] != 200:
-                if path == API_URL_LOGIN:
-                    raise ACInfinityClientInvalidAuth
-                else:
-                    raise ACInfinityClientRequestFailed(body)
+        async def send(request_headers: dict) -> dict:
+            async with async_timeout.timeout(self.__get_request_timeout()), session.post(
+                f"{self._host}{path}", data=post_data, headers=request_headers
+            ) as response:
+                if response.status != 200:
+                    raise ACInfinityClientCannotConnect
 
-            return body
+                return await response.json()
+
+        return await self.__send(path, headers, send)
 
     async def __put(self, path, headers):
         """generically make a put request to the AC Infinity API"""
         session = await self.__get_session()
-        async with async_timeout.timeout(10), session.put(
-            f"{self._host}{path}", headers=headers
-        ) as response:
-            if response.status != 200:
-                raise ACInfinityClientCannotConnect
 
-            body = await response.json()
-            if body["code"] != 200:
-                raise ACInfinityClientRequestFailed(body)
+        async def send(request_headers: dict) -> dict:
+            async with async_timeout.timeout(self.__get_request_timeout()), session.put(
+                f"{self._host}{path}", headers=request_headers
+            ) as response:
+                if response.status != 200:
+                    raise ACInfinityClientCannotConnect
+
+                return await response.json()
 
-            return body
+        return await self.__send(path, headers, send)
+
+    async def __send(self, path: str, headers: dict, send: Callable[[dict], Awaitable[dict]]) -> dict:
+        """Sends a request and checks the response code. If the token the request was sent with is rejected,
+        logs in again and replays the request once with the new token.
+
+        Args:
+            path: The endpoint the request is sent to
+            headers: The headers to send
+            send: Sends the request with the given headers, and returns the response body
+        """
+        endpoint = path.split("?", 1)[0]
+        await self._rate_limiter.acquire(endpoint)
+        body = await send(headers)
+        if self.__is_token_rejected(path, body, headers):
+            _LOGGER.info("AC Infinity token was rejected (code %s); logging in again", body["code"])
+            await self.__login_again(headers["token"])
+            headers = {**headers, "token": self._user_id}
+            await self._rate_limiter.acquire(endpoint)
+            body = await send(headers)
+
+        if body["code"] != 200:
+            if path == API_URL_LOGIN:
+                raise ACInfinityClientInvalidAuth
+            elif self.__is_token_rejected(path, body, headers) and headers["token"] == self._user_id:
+                # rejected even after logging in again; forget it so the next attempt starts with a fresh log in
+                self.__set_token(None)
+
+            raise ACInfinityClientRequestFailed(body)
+
+        return body
+
+    @staticmethod
+    def __get_request_timeout() -> float:
+        """the timeout for a request about to be sent, capped by the time left until the current deadline"""
+        deadline = ACInfinityDeadline.current()
+        if deadline is None:
+            return REQUEST_TIMEOUT
+        if deadline.expired:
+            raise ACInfinityClientDeadlineExceeded("Deadline passed before the request to the AC Infinity API was sent")
+
+        return min(REQUEST_TIMEOUT, deadline.remaining)
+
+    @staticmethod
+    def __is_token_rejected(path: str, body: dict, headers: dict) -> bool:
+        return path != API_URL_LOGIN and "token" in headers and body["code"] in API_AUTH_FAILURE_CODES
+
+    async def __login_again(self, rejected_token: str | None) -> None:
+        """Replaces a rejected token by logging in again. Concurrent callers share a single log in, and callers
+        whose token was already replaced by someone else return right away.
+
+        Args:
+            rejected_token: The token the API rejected
+        """
+        if self._user_id is not None and self._user_id != rejected_token:
+            return
+
+        if self._login_task is None:
+            self._login_task = asyncio.ensure_future(self.login())
+            self._login_task.add_done_callback(self.__login_task_done)
+
+        await asyncio.shield(self._login_task)
+
+    def __login_task_done(self, task: asyncio.Task) -> None:
+        self._login_task = None
+        if not task.cancelled():
+            task.exception()  # mark as retrieved; each waiting caller re-raises it
 
     def __create_headers(self, use_auth_token: bool, use_min_version: bool = False) -> dict:
         """Creates a header object to use in a request to the AC Infinity API"""
@@ -274,6 +614,10 @@ class ACInfinityClientCannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
 
 
+class ACInfinityClientDeadlineExceeded(ACInfinityClientCannotConnect):
+    """Error to indicate a request was not sent because the current deadline had passed"""
+
+
 class ACInfinityClientInvalidAuth(HomeAssistantError):
     """Error to indicate there is invalid auth."""
 
@@ -21,7 +21,11 @@ from custom_components.ac_infinity.client import (
 from . import ACInfinityService
 from .const import (
     ConfigurationKey,
+    DEFAULT_MAX_POLLING_INTERVAL,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_MIN_POLLING_INTERVAL,
     DEFAULT_POLLING_INTERVAL,
+    DEFAULT_SETTINGS_POLLING_INTERVAL,
     DOMAIN,
     HOST, ControllerPropertyKey, DevicePropertyKey, EntityConfigValue,
 )
@@ -261,38 +265,43 @@ class OptionsFlow(ACInfinityFlowBase, config_entries.OptionsFlow):
             polling_interval = user_input.get(
                 ConfigurationKey.POLLING_INTERVAL, DEFAULT_POLLING_INTERVAL
             )
+            min_polling_interval = user_input.get(
+                ConfigurationKey.MIN_POLLING_INTERVAL,
+                self.__get_saved_conf_value(ConfigurationKey.MIN_POLLING_INTERVAL, DEFAULT_MIN_POLLING_INTERVAL)
+            )
+            max_polling_interval = user_input.get(
+                ConfigurationKey.MAX_POLLING_INTERVAL,
+                max(
+                    self.__get_saved_conf_value(ConfigurationKey.MAX_POLLING_INTERVAL, DEFAULT_MAX_POLLING_INTERVAL),
+                    polling_interval
+                )
+            )
+            settings_polling_interval = user_input.get(
+                ConfigurationKey.SETTINGS_POLLING_INTERVAL,
+                self.__get_saved_conf_value(ConfigurationKey.SETTINGS_POLLING_INTERVAL, DEFAULT_SETTINGS_POLLING_INTERVAL)
+            )
+            max_staleness = user_input.get(
+                ConfigurationKey.MAX_STALENESS, self.__get_saved_conf_value(ConfigurationKey.MAX_STALENESS, DEFAULT_MAX_STALENESS)
+            )
             password: str | None = user_input.get(ConfigurationKey.UPDATE_PASSWORD, None)
 
-            if polling_interval < 5:
-                errors[ConfigurationKey.POLLING_INTERVAL] = "invalid_polling_interval"
+            errors = self.__validate_polling(
+                polling_interval, min_polling_interval, max_polling_interval, settings_polling_interval, max_staleness
+            )
 
             if password:
-                email = self.config_entry.data[CONF_EMAIL]
-                # noinspection PyBroadException
-
-                client = ACInfinityClient(
-                    HOST,
-                    email,
-                    password,
-                )
-
-                try:
-                    await client.login()
-                    _ = await client.get_account_controllers()
-                except ACInfinityClientCannotConnect:
-                    errors[ConfigurationKey.UPDATE_PASSWORD] = "cannot_connect"
-                except ACInfinityClientInvalidAuth:
-                    errors[ConfigurationKey.UPDATE_PASSWORD] = "invalid_auth"
-                except Exception:  # pylint: disable=broad-except
-                    _LOGGER.exception("Unexpected exception")
-                    errors[ConfigurationKey.UPDATE_PASSWORD] = "unknown"
-                finally:
-                    await client.close()
+                password_error = await self.__validate_password(password)
+                if password_error:
+                    errors[ConfigurationKey.UPDATE_PASSWORD] = password_error
 
             if not errors:
 
                 new_data = self.config_entry.data.copy()
                 new_data[ConfigurationKey.POLLING_INTERVAL] = polling_interval
+                new_data[ConfigurationKey.MIN_POLLING_INTERVAL] = min_polling_interval
+                new_data[ConfigurationKey.MAX_POLLING_INTERVAL] = max_polling_interval
+                new_data[ConfigurationKey.SETTINGS_POLLING_INTERVAL] = settings_polling_interval
+                new_data[ConfigurationKey.MAX_STALENESS] = max_staleness
                 if password:
                     new_data[CONF_PASSWORD] = password
 
@@ -310,12 +319,77 @@ class OptionsFlow(ACInfinityFlowBase, config_entries.OptionsFlow):
                     vol.Required(ConfigurationKey.POLLING_INTERVAL,
                                  default=self.__get_saved_conf_value(ConfigurationKey.POLLING_INTERVAL,
                                                                      DEFAULT_POLLING_INTERVAL)): int,
+                    vol.Required(ConfigurationKey.MIN_POLLING_INTERVAL,
+                                 default=self.__get_saved_conf_value(ConfigurationKey.MIN_POLLING_INTERVAL,
+                                                                     DEFAULT_MIN_POLLING_INTERVAL)): int,
+                    vol.Required(ConfigurationKey.MAX_POLLING_INTERVAL,
+                                 default=self.__get_saved_conf_value(ConfigurationKey.MAX_POLLING_INTERVAL,
+                                                                     DEFAULT_MAX_POLLING_INTERVAL)): int,
+                    vol.Required(ConfigurationKey.SETTINGS_POLLING_INTERVAL,
+                                 default=self.__get_saved_conf_value(ConfigurationKey.SETTINGS_POLLING_INTERVAL,
+                                                                     DEFAULT_SETTINGS_POLLING_INTERVAL)): int,
+                    vol.Required(ConfigurationKey.MAX_STALENESS,
+                                 default=self.__get_saved_conf_value(ConfigurationKey.MAX_STALENESS,
+                                                                     DEFAULT_MAX_STALENESS)): int,
                     vol.Optional(ConfigurationKey.UPDATE_PASSWORD): str
                 }
             ),
             errors=errors
         )
 
+    @staticmethod
+    def __validate_polling(
+        polling_interval: int,
+        min_polling_interval: int,
+        max_polling_interval: int,
+        settings_polling_interval: int,
+        max_staleness: int,
+    ) -> dict[str, str]:
+        """returns the errors of the polling options, by the field they are shown on"""
+        errors: dict[str, str] = {}
+        if polling_interval < 5:
+            errors[ConfigurationKey.POLLING_INTERVAL] = "invalid_polling_interval"
+
+        if min_polling_interval < 5 or min_polling_interval > max(polling_interval, 5):
+            errors[ConfigurationKey.MIN_POLLING_INTERVAL] = "invalid_min_polling_interval"
+
+        if max_polling_interval < polling_interval:
+            errors[ConfigurationKey.MAX_POLLING_INTERVAL] = "invalid_max_polling_interval"
+
+        if settings_polling_interval < 5:
+            errors[ConfigurationKey.SETTINGS_POLLING_INTERVAL] = "invalid_settings_polling_interval"
+
+        if max_staleness < 0:
+            errors[ConfigurationKey.MAX_STALENESS] = "invalid_max_staleness"
+
+        return errors
+
+    async def __validate_password(self, password: str) -> str | None:
+        """logs in with the new password; returns the error to show if that fails"""
+        email = self.config_entry.data[CONF_EMAIL]
+        # noinspection PyBroadException
+
+        client = ACInfinityClient(
+            HOST,
+            email,
+            password,
+        )
+
+        try:
+            await client.login()
+            _ = await client.get_account_controllers()
+        except ACInfinityClientCannotConnect:
+            return "cannot_connect"
+        except ACInfinityClientInvalidAuth:
+            return "invalid_auth"
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Unexpected exception")
+            return "unknown"
+        finally:
+            await client.close()
+
+        return None
+
     async def async_step_controller_select(self, user_input: dict[str, Any] | None = None):
         if user_input is not None:
             self.current_device_id = user_input["device_id"]
@@ -15,11 +15,38 @@ PLATFORMS = [
 HOST = "http://www.acinfinityserver.com"
 
 DEFAULT_POLLING_INTERVAL = 10
+DEFAULT_MIN_POLLING_INTERVAL = 5
+DEFAULT_MAX_POLLING_INTERVAL = 60
+ADAPTIVE_POLLING_BACKOFF = 1.5
+LOW_REQUEST_BUDGET = 0.25
+ERROR_BACKOFF_FACTOR = 2
+MAX_ERROR_BACKOFF_INTERVAL = 600
+ERROR_RATE_WINDOW = 10
+DEFAULT_SETTINGS_POLLING_INTERVAL = 300
+DEFAULT_REFRESH_DEADLINE = 10
+DEFAULT_MAX_STALENESS = 900
+DEFAULT_MAX_CONCURRENT_REQUESTS = 8
+DEFAULT_MAX_REQUESTS_PER_REFRESH = 16
+DEFAULT_WRITE_SNAPSHOT_MAX_AGE = 15
+DEFAULT_WRITE_COALESCE_WINDOW = 0.25
+SNAPSHOT_STORAGE_VERSION = 1
+TOKEN_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 30
+DEFAULT_CIRCUIT_FAILURE_THRESHOLD = 3
+DEFAULT_CIRCUIT_RESET_TIMEOUT = 60
+DEFAULT_RETRY_BUDGET = 10
+DEFAULT_RETRY_BUDGET_RATIO = 0.2
 ISSUE_URL = "https://github.com/dalinicus/homeassistant-acinfinity/issues/new?template=Blank+issue"
 
 
 class ConfigurationKey:
     POLLING_INTERVAL = "polling_interval"
+    MIN_POLLING_INTERVAL = "min_polling_interval"
+    MAX_POLLING_INTERVAL = "max_polling_interval"
+    SETTINGS_POLLING_INTERVAL = "settings_polling_interval"
+    MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+    MAX_REQUESTS_PER_REFRESH = "max_requests_per_refresh"
+    MAX_STALENESS = "max_staleness"
     UPDATE_PASSWORD = "update_password"
     ENTITIES = "entities"
     MODIFIED_AT = "modified_at"
@@ -33,6 +60,12 @@ class EntityConfigValue:
     Disable = "disable"
 
 
+class CustomControllerPropertyKey:
+    # Derived sensors
+    POLLING_INTERVAL = "pollingInterval"
+    REFRESH_ERROR_RATE = "refreshErrorRate"
+
+
 class CustomDevicePropertyKey:
     # Derived sensors
     NEXT_STATE_CHANGE = "nextStateChange"
@@ -146,6 +179,77 @@ class DevicePropertyKey:
     ONLINE = "online"
     STATE = "loadState"
     REMAINING_TIME = "remainTime"
+    CURRENT_MODE = "curMode"
+    MODE_TYPE = "modeTye"
+    LOAD_TYPE = "loadType"
+    IS_OPEN_AUTOMATION = "isOpenAutomation"
+    ADVANCED_UPDATE_TIME = "advUpdateTime"
+
+
+# port summary fields from /api/user/devInfoListAll that change along with the port's mode settings;
+# live readings such as speak, loadState and remainTime are left out as they change without the settings changing
+PORT_FINGERPRINT_KEYS = (
+    DevicePropertyKey.CURRENT_MODE,
+    DevicePropertyKey.MODE_TYPE,
+    DevicePropertyKey.LOAD_TYPE,
+    DevicePropertyKey.IS_OPEN_AUTOMATION,
+    DevicePropertyKey.ADVANCED_UPDATE_TIME,
+    DevicePropertyKey.NAME,
+    DevicePropertyKey.ONLINE,
+)
+
+
+# port summary fields from /api/user/devInfoListAll that show a port doing something; a change in any of them
+# between refreshes shortens the polling interval
+PORT_ACTIVITY_KEYS = (
+    DevicePropertyKey.SPEAK,
+    DevicePropertyKey.STATE,
+    DevicePropertyKey.CURRENT_MODE,
+    DevicePropertyKey.ONLINE,
+)
+
+
+# controller, port and sensor fields from /api/user/devInfoListAll read by the integration itself. The service keeps
+# these, along with the fields the entity descriptions declare they read, and drops the rest of each payload
+PROPERTY_KEYS = frozenset({
+    ControllerPropertyKey.DEVICE_ID,
+    ControllerPropertyKey.DEVICE_CODE,
+    ControllerPropertyKey.DEVICE_NAME,
+    ControllerPropertyKey.DEVICE_TYPE,
+    ControllerPropertyKey.DEVICE_INFO,
+    ControllerPropertyKey.MAC_ADDR,
+    ControllerPropertyKey.HW_VERSION,
+    ControllerPropertyKey.SW_VERSION,
+    ControllerPropertyKey.PORT_COUNT,
+    ControllerPropertyKey.PORTS,
+    ControllerPropertyKey.SENSORS,
+    SensorPropertyKey.ACCESS_PORT,
+    SensorPropertyKey.SENSOR_TYPE,
+    DevicePropertyKey.PORT,
+    DevicePropertyKey.NAME,
+    DevicePropertyKey.REMAINING_TIME,
+    *PORT_FINGERPRINT_KEYS,
+    *PORT_ACTIVITY_KEYS,
+})
+
+# the fields of a sensor its value is read from
+SENSOR_VALUE_KEYS = (SensorPropertyKey.SENSOR_PRECISION, SensorPropertyKey.SENSOR_DATA)
+SENSOR_TEMPERATURE_KEYS = (*SENSOR_VALUE_KEYS, SensorPropertyKey.SENSOR_UNIT)
+
+# controller, port and sensor fields read by the entity descriptions, as their key or data_keys. Kept along with
+# PROPERTY_KEYS as each payload is ingested, so a description that starts reading another field must list it here
+ENTITY_PROPERTY_KEYS = frozenset({
+    ControllerPropertyKey.TEMPERATURE,
+    ControllerPropertyKey.HUMIDITY,
+    ControllerPropertyKey.VPD,
+    ControllerPropertyKey.ONLINE,
+    ControllerPropertyKey.TIME_ZONE,
+    *SENSOR_TEMPERATURE_KEYS,
+    DevicePropertyKey.ONLINE,
+    DevicePropertyKey.STATE,
+    DevicePropertyKey.SPEAK,
+    DevicePropertyKey.REMAINING_TIME,
+})
 
 
 # noinspection SpellCheckingInspection
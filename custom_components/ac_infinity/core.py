@@ -1,28 +1,61 @@
 import asyncio
+import contextlib
 import json
 import logging
+import random
+import time
 from abc import abstractmethod, ABC
-from collections.abc import Awaitable
-from dataclasses import dataclass
-from datetime import timedelta
-from typing import Any, Callable
+from collections import deque
+from collections.abc import Awaitable, Iterable, Mapping
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from functools import partial
+from types import MappingProxyType
+from typing import Any, Callable, Protocol
 
 import aiohttp
-import async_timeout
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.core import callback
+from homeassistant.helpers.entity import DeviceInfo, EntityCategory
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
     UpdateFailed,
 )
+from homeassistant.util import dt as dt_util
 
 from custom_components.ac_infinity.client import ACInfinityClient, ACInfinityClientInvalidAuth, \
-    ACInfinityClientCannotConnect, ACInfinityClientRequestFailed
+    ACInfinityClientCannotConnect, ACInfinityClientRequestFailed, ACInfinityClientDeadlineExceeded, ACInfinityDeadline
 from .const import (
+    ADAPTIVE_POLLING_BACKOFF,
     AI_CONTROLLER_TYPES,
+    DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+    DEFAULT_CIRCUIT_RESET_TIMEOUT,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_POLLING_INTERVAL,
+    DEFAULT_MAX_REQUESTS_PER_REFRESH,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_MIN_POLLING_INTERVAL,
+    DEFAULT_REFRESH_DEADLINE,
+    DEFAULT_RETRY_BUDGET,
+    DEFAULT_RETRY_BUDGET_RATIO,
+    DEFAULT_SETTINGS_POLLING_INTERVAL,
+    DEFAULT_WRITE_COALESCE_WINDOW,
+    DEFAULT_WRITE_SNAPSHOT_MAX_AGE,
     DOMAIN,
+    ERROR_BACKOFF_FACTOR,
+    ERROR_RATE_WINDOW,
+    LOW_REQUEST_BUDGET,
     MANUFACTURER,
+    MAX_ERROR_BACKOFF_INTERVAL,
+    PORT_ACTIVITY_KEYS,
+    PORT_FINGERPRINT_KEYS,
+    PROPERTY_KEYS,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_STORAGE_VERSION,
+    AtType,
     ControllerPropertyKey,
     ControllerType,
     DeviceControlKey,
@@ -37,14 +70,30 @@ ACINFINITY_API_ERROR = "Retry limit exceeded contacting the AC Infinity API.  Th
 
 _LOGGER = logging.getLogger(__name__)
 
+# write endpoints that queued writes are coalesced per port for
+_WRITE_KIND_CONTROLS = "controls"
+_WRITE_KIND_SETTINGS = "settings"
+_WRITE_KIND_AI = "ai"
+
 
 class ACInfinityController:
     """
     A UIS enabled AC Infinity Controller
     """
 
+    __slots__ = (
+        "_controller_id",
+        "_mac_addr",
+        "_controller_name",
+        "_controller_type",
+        "_identifier",
+        "_devices",
+        "_device_info",
+        "_sensors",
+    )
+
     def __init__(
-        self, controller_json: dict[str, Any]
+        self, controller_json: Mapping[str, Any]
     ) -> None:
         """
         Args:
@@ -79,6 +128,32 @@ class ACInfinityController:
             sensors = controller_json[ControllerPropertyKey.DEVICE_INFO][ControllerPropertyKey.SENSORS] or []
             self._sensors = [ACInfinitySensor(self, sensor) for sensor in sensors]
 
+    @staticmethod
+    def topology_key(controller_json: Mapping[str, Any]) -> tuple:
+        """returns the values of the controller json that the model objects are built from; the models only need to be
+        rebuilt when these change
+
+        Args:
+            controller_json: Json of an individual controller, as given to the constructor
+        """
+        device_info = controller_json.get(ControllerPropertyKey.DEVICE_INFO) or {}
+        return (
+            controller_json.get(ControllerPropertyKey.DEVICE_ID),
+            controller_json.get(ControllerPropertyKey.MAC_ADDR),
+            controller_json.get(ControllerPropertyKey.DEVICE_NAME),
+            controller_json.get(ControllerPropertyKey.DEVICE_TYPE),
+            controller_json.get(ControllerPropertyKey.HW_VERSION),
+            controller_json.get(ControllerPropertyKey.SW_VERSION),
+            tuple(
+                (device.get(DevicePropertyKey.PORT), device.get(DevicePropertyKey.NAME))
+                for device in device_info.get(ControllerPropertyKey.PORTS) or ()
+            ),
+            tuple(
+                (sensor.get(SensorPropertyKey.ACCESS_PORT), sensor.get(SensorPropertyKey.SENSOR_TYPE))
+                for sensor in device_info.get(ControllerPropertyKey.SENSORS) or ()
+            ),
+        )
+
     @property
     def controller_id(self) -> str:
         """The unique identifier of the UIS Controller"""
@@ -142,6 +217,8 @@ class ACInfinitySensor:
     with or without a UIS child device (fan, light, etc...) plugged into it.
     """
 
+    __slots__ = ("_controller", "_sensor_port", "_sensor_type")
+
     def __init__(self, controller: ACInfinityController, sensor_json: dict[str, Any]) -> None:
         """
         Args:
@@ -182,6 +259,8 @@ class ACInfinityDevice:
     with or without a UIS child device (fan, light, etc...) plugged into it.
     """
 
+    __slots__ = ("_controller", "_device_port", "_device_name")
+
     def __init__(
         self, controller: ACInfinityController, device_json: dict[str, Any]
     ) -> None:
@@ -218,34 +297,739 @@ class ACInfinityDevice:
         return self._controller.device_info
 
 
-class ACInfinityService:
-    """Service layer object responsible for initializing and updating values from the AC Infinity API"""
+class ACInfinityTopologyChange:
+    """The controllers, ports and sensors added or removed between two topologies. Controllers are identified by
+    (controller_id,), ports by (controller_id, device_port) and sensors by (controller_id, sensor_port, sensor_type)"""
 
-    MIN_TIME_BETWEEN_UPDATES = timedelta(seconds=5)
+    __slots__ = ("added", "removed")
+
+    def __init__(self, added: frozenset[tuple], removed: frozenset[tuple]) -> None:
+        self.added = added
+        self.removed = removed
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed)
+
+
+class ACInfinityTopology:
+    """The controllers of the account along with their ports and sensors, shared by every platform. Rebuilt only when
+    a controller, port or sensor is added, removed or renamed, reusing the models of the controllers that were not."""
+
+    __slots__ = ("_controllers", "_keys", "_identifiers")
+
+    def __init__(self, controllers: list[ACInfinityController] | None = None, keys: dict[str, tuple] | None = None) -> None:
+        """
+        Args:
+            controllers: the controller models
+            keys: the topology key of each controller, by controller id
+        """
+        self._controllers = controllers or []
+        self._keys = keys or {}
+        self._identifiers = frozenset(
+            identifier
+            for controller in self._controllers
+            for identifier in (
+                (controller.controller_id,),
+                *((controller.controller_id, device.device_port) for device in controller.devices),
+                *((controller.controller_id, sensor.sensor_port, sensor.sensor_type) for sensor in controller.sensors),
+            )
+        )
+
+    @property
+    def controllers(self) -> list[ACInfinityController]:
+        """The controller models, in the order the API returned them"""
+        return self._controllers
+
+    @property
+    def identifiers(self) -> frozenset[tuple]:
+        """The identifiers of every controller, port and sensor, as used by ACInfinityTopologyChange"""
+        return self._identifiers
+
+    def rebuilt(self, controller_properties: Mapping[str, Mapping[str, Any]]) -> "ACInfinityTopology":
+        """returns this topology if the controller properties still describe it, otherwise a new topology built from them
+
+        Args:
+            controller_properties: the controller properties by controller id, as stored by the service
+        """
+        keys = {controller_id: ACInfinityController.topology_key(value) for controller_id, value in controller_properties.items()}
+        if keys == self._keys:
+            return self
+
+        previous = {controller.controller_id: controller for controller in self._controllers}
+        controllers = [
+            previous[controller_id]
+            if controller_id in previous and self._keys.get(controller_id) == key
+            else ACInfinityController(controller_properties[controller_id])
+            for controller_id, key in keys.items()
+        ]
+        return ACInfinityTopology(controllers, keys)
+
+    def changes_since(self, previous: "ACInfinityTopology | None") -> ACInfinityTopologyChange:
+        """returns the controllers, ports and sensors added and removed since the given topology
+
+        Args:
+            previous: an earlier topology, or None to report everything as added
+        """
+        previous_identifiers = previous.identifiers if previous is not None else frozenset()
+        return ACInfinityTopologyChange(
+            self._identifiers - previous_identifiers, previous_identifiers - self._identifiers
+        )
+
+
+class _QueuedWrite:
+    """Key/values queued to be written to a port, waiting out the coalesce window"""
+
+    def __init__(self, device_name: str, future: asyncio.Future) -> None:
+        self.key_values: dict[str, int] = {}
+        self.previous_values: dict[str, Any] = {}
+        self.device_name = device_name
+        self.future = future
+        self.task: asyncio.Task | None = None
+
+
+class _PortRead:
+    """The controls and settings of a port as read from the API, waiting to be published"""
+
+    def __init__(self, controls: dict[str, Any] | None, settings: dict[str, Any], fingerprint: tuple | None = None) -> None:
+        self.controls = controls
+        self.settings = settings
+        self.fingerprint = fingerprint
+        self.fetched_at = time.monotonic()
+        self.read_at = dt_util.utcnow()
+
+
+class ACInfinityCircuitOpen(ACInfinityClientCannotConnect):
+    """Error to indicate a call was skipped because the AC Infinity API has been failing"""
+
+
+@dataclass(frozen=True)
+class ACInfinityRetryPolicy:
+    """How calls to an AC Infinity API endpoint are retried when they fail to connect"""
+
+    description: str
+    max_retries: int = 4
+    base_delay: float = 1.0
+    max_delay: float = 8.0
+    jitter: float = 0.5
+
+    def get_delay(self, retry: int) -> float:
+        """The time, in seconds, to wait before a retry. Doubles with each retry up to max_delay, with up to
+        the jitter fraction of it removed at random so that retries after a shared outage are spread out.
+
+        Args:
+            retry: the retry about to be made, starting at 1
+        """
+        delay = min(self.max_delay, self.base_delay * 2 ** (retry - 1))
+        return delay - random.uniform(0, delay * self.jitter)
+
+
+# retry policies per endpoint; refreshes back off quicker as the coordinator polls again soon anyway
+REFRESH_RETRY_POLICY = ACInfinityRetryPolicy("refresh from data update coordinator", base_delay=0.5, max_delay=4.0)
+DEVICE_CONTROLS_RETRY_POLICY = ACInfinityRetryPolicy("update device controls")
+ADVANCED_SETTINGS_RETRY_POLICY = ACInfinityRetryPolicy("update advanced controller settings")
+AI_CONTROL_AND_SETTINGS_RETRY_POLICY = ACInfinityRetryPolicy("update ai device controls and settings")
+
+
+class ACInfinityCircuitBreaker:
+    """Stops calls to the AC Infinity API after repeated failures, letting a single trial call through
+    once the reset timeout has passed to find out if the API has recovered"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_CIRCUIT_RESET_TIMEOUT,
+    ) -> None:
+        """
+        Args:
+            failure_threshold: the number of consecutive failed calls that opens the circuit
+            reset_timeout: how long, in seconds, the circuit stays open before a trial call is let through
+        """
+        self._failure_threshold = max(1, failure_threshold)
+        self._reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """The state of the circuit; closed, open, or half_open while a trial call is allowed"""
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self._reset_timeout:
+            return self.HALF_OPEN
+        return self._state
+
+    @property
+    def consecutive_failures(self) -> int:
+        """The number of failed calls since the last successful one"""
+        return self._consecutive_failures
+
+    def allow_request(self) -> bool:
+        """Returns true if a call may be made. Callers that are allowed must call release when done."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.OPEN or self._trial_in_flight:
+            return False
+
+        self._state = self.HALF_OPEN
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        """Closes the circuit after a successful call"""
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        """Counts a failed call, opening the circuit at the threshold or when a trial call fails"""
+        self._consecutive_failures += 1
+        if self._state == self.HALF_OPEN or self._consecutive_failures >= self._failure_threshold:
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def release(self, trial: bool) -> None:
+        """Marks an allowed call as finished, letting the next trial call through if this was an inconclusive trial
+
+        Args:
+            trial: true if the call was let through as the trial call of a half open circuit
+        """
+        if trial:
+            self._trial_in_flight = False
+
+
+class ACInfinityRequestExecutor:
+    """Runs calls to the AC Infinity API under a retry policy, behind a circuit breaker shared by all endpoints"""
+
+    def __init__(
+        self,
+        circuit_breaker: ACInfinityCircuitBreaker | None = None,
+        retry_budget: float = DEFAULT_RETRY_BUDGET,
+        retry_budget_ratio: float = DEFAULT_RETRY_BUDGET_RATIO,
+    ) -> None:
+        """
+        Args:
+            circuit_breaker: the circuit breaker guarding the API
+            retry_budget: the maximum number of retries that may be banked
+            retry_budget_ratio: the number of retries earned back by each successful call
+        """
+        self._circuit_breaker = circuit_breaker or ACInfinityCircuitBreaker()
+        self._retry_budget = retry_budget
+        self._retry_budget_ratio = retry_budget_ratio
+        self._retry_tokens = retry_budget
+        self._calls = 0
+        self._attempts = 0
+        self._retries = 0
+        self._failures = 0
+        self._rejected = 0
+
+    @property
+    def circuit_breaker(self) -> ACInfinityCircuitBreaker:
+        return self._circuit_breaker
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Counters for the calls made through this executor, along with the state of the circuit breaker"""
+        return {
+            "circuit_state": self._circuit_breaker.state,
+            "consecutive_failures": self._circuit_breaker.consecutive_failures,
+            "calls": self._calls,
+            "attempts": self._attempts,
+            "retries": self._retries,
+            "failures": self._failures,
+            "rejected": self._rejected,
+            "retry_budget": self._retry_tokens,
+        }
+
+    async def execute[T](self, policy: ACInfinityRetryPolicy, request: Callable[[int], Awaitable[T]]) -> T:
+        """Makes a call, retrying it per the policy while the retry budget and the current deadline allow.
+        Raises ACInfinityCircuitOpen without calling the API while the circuit breaker is open.
+
+        Args:
+            policy: the retry policy of the endpoint being called
+            request: makes a single attempt of the call, given the number of retries made so far
+        """
+        self._calls += 1
+        # a call allowed through a half open circuit is its trial call
+        trial = self._circuit_breaker.state == ACInfinityCircuitBreaker.HALF_OPEN
+        if not self._circuit_breaker.allow_request():
+            self._rejected += 1
+            raise ACInfinityCircuitOpen(f"Unable to {policy.description}: the AC Infinity API is failing, skipping calls")
+
+        try:
+            retry = 0
+            while True:
+                self._attempts += 1
+                try:
+                    result = await request(retry)
+                except ACInfinityClientDeadlineExceeded:
+                    # the deadline or the request budget ran out before the call was sent; not a failure of the API
+                    raise
+                except (
+                    ACInfinityClientCannotConnect,
+                    ACInfinityClientRequestFailed,
+                    aiohttp.ClientError,
+                    asyncio.TimeoutError
+                ) as ex:
+                    delay = policy.get_delay(retry + 1)
+                    deadline = ACInfinityDeadline.current()
+                    if (
+                        retry < policy.max_retries
+                        and self._retry_tokens >= 1
+                        and (deadline is None or deadline.remaining > delay)
+                    ):
+                        retry += 1
+                        self._retries += 1
+                        self._retry_tokens -= 1
+                        _LOGGER.warning("Unable to %s. Retry attempt %s/%s", policy.description, retry, policy.max_retries)
+                        await asyncio.sleep(delay)
+                    else:
+                        self._failures += 1
+                        self._circuit_breaker.record_failure()
+                        _LOGGER.error(ACINFINITY_API_ERROR, exc_info=ex)
+                        raise
+                except ACInfinityClientInvalidAuth as ex:
+                    _LOGGER.error("Unable to %s: Authentication failed", policy.description, exc_info=ex)
+                    raise
+                except Exception as ex:
+                    _LOGGER.error("Unable to %s: Unexpected error", policy.description, exc_info=ex)
+                    raise
+                else:
+                    self._retry_tokens = min(self._retry_budget, self._retry_tokens + self._retry_budget_ratio)
+                    self._circuit_breaker.record_success()
+                    return result
+        finally:
+            self._circuit_breaker.release(trial)
+
+
+class ACInfinityDescription(Protocol):
+    """An entity description of any platform; an EntityDescription that is also an ACInfinityBaseMixin"""
+
+    @property
+    def key(self) -> str: ...
+
+    @property
+    def data_keys(self) -> tuple[str, ...]: ...
+
+
+class ACInfinityPropertyProjection:
+    """The fields of the controller, port and sensor properties from /api/user/devInfoListAll that are kept as each
+    payload is ingested; the rest are dropped so they take no memory and are not copied or compared by later passes.
+    Controls and settings are kept whole, as writes send them back to the API."""
+
+    def __init__(self, keys: Iterable[str]) -> None:
+        """
+        Args:
+            keys: the json field names read by entities, in addition to those read by the integration itself
+        """
+        self._keys = PROPERTY_KEYS | frozenset(keys)
+
+    @classmethod
+    def from_descriptions(cls, descriptions: Iterable[ACInfinityDescription]) -> "ACInfinityPropertyProjection":
+        """creates the projection keeping the key and data keys of each of the given entity descriptions
+
+        Args:
+            descriptions: the entity descriptions of every platform
+        """
+        return cls(key for description in descriptions for key in (description.key, *description.data_keys))
+
+    @property
+    def keys(self) -> frozenset[str]:
+        """The json field names kept"""
+        return self._keys
+
+    def is_covered_by(self, keys: Iterable[str] | None) -> bool:
+        """returns true if values projected down to the given keys hold every field this projection keeps
+
+        Args:
+            keys: the keys of the other projection, or None if the values were not projected
+        """
+        return keys is None or self._keys <= frozenset(keys)
+
+    def project(self, payload: Mapping[str, Any]) -> dict[str, Any]:
+        """returns the kept fields of a controller, port or sensor, along with the kept fields of the ports and sensors
+        nested within a controller
+
+        Args:
+            payload: the controller, port or sensor properties, as returned by the API
+        """
+        projected = {key: value for key, value in payload.items() if key in self._keys}
+        device_info = projected.get(ControllerPropertyKey.DEVICE_INFO)
+        if device_info is not None:
+            projected[ControllerPropertyKey.DEVICE_INFO] = device_info = self.project(device_info)
+            for key in (ControllerPropertyKey.PORTS, ControllerPropertyKey.SENSORS):
+                if device_info.get(key) is not None:
+                    device_info[key] = [self.project(item) for item in device_info[key]]
+
+        return projected
+
+
+class ACInfinityPortRecord:
+    """The values of a controller (port 0) or port, flattened when published so that getters find any field with a
+    single lookup. Fields nested in deviceInfo and devSetting are merged in, with the outer field winning if both exist."""
+
+    __slots__ = ("properties", "controls", "settings")
+
+    def __init__(
+        self, properties: Mapping[str, Any] | None, controls: Mapping[str, Any] | None, settings: Mapping[str, Any] | None
+    ) -> None:
+        """
+        Args:
+            properties: the controller properties merged with their deviceInfo, or the port properties
+            controls: the port controls merged with their devSetting, or None for the controller
+            settings: the controller or port settings
+        """
+        self.properties = properties
+        self.controls = controls
+        self.settings = settings
+
+    @staticmethod
+    def merge(outer: Mapping[str, Any] | None, nested_key: str) -> dict[str, Any] | None:
+        """returns the fields of a json object merged with those of the object nested under nested_key
+
+        Args:
+            outer: the json object, if any
+            nested_key: the field holding the nested object
+        """
+        if outer is None:
+            return None
+
+        return {**(outer.get(nested_key) or {}), **outer}
+
+
+@dataclass(frozen=True)
+class ACInfinitySnapshot:
+    """The values read from the AC Infinity API as of a single refresh or write. Snapshots are never modified; each
+    change publishes a new one with the next generation, so values read from one snapshot are always consistent
+    with each other."""
+
+    generation: int = 0
 
     # api/user/devInfoListAll json organized by controller device id
-    _controller_properties: dict[str, Any] = {}
+    controller_properties: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
 
     # api/user/devInfoListAll json organized by controller device id, sensor access port index, and sensor type.
-    _sensor_properties: dict[tuple[str, int, int], Any] = {}
+    sensor_properties: Mapping[tuple[str, int, int], Any] = field(default_factory=lambda: MappingProxyType({}))
 
     # api/user/devInfoListAll json organized by controller device id and port index
-    _device_properties: dict[tuple[str, int], Any] = {}
+    device_properties: Mapping[tuple[str, int], Any] = field(default_factory=lambda: MappingProxyType({}))
 
     # api/dev/getDevModeSettingList json organized by controller device id and port index
-    _device_controls: dict[tuple[str, int], Any] = {}
+    device_controls: Mapping[tuple[str, int], Any] = field(default_factory=lambda: MappingProxyType({}))
 
     # api/dev/getDevSetting json organized by controller device id and port (index 0 represents controller settings)
-    _device_settings: dict[tuple[str, int], Any] = {}
+    device_settings: Mapping[tuple[str, int], Any] = field(default_factory=lambda: MappingProxyType({}))
+
+    # the stores above flattened into a record per controller device id, then port index (0 represents the controller).
+    # Indexed by controller first, as two lookups on the ids as given are cheaper than building and hashing a tuple key
+    records: Mapping[str, Mapping[int, ACInfinityPortRecord]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        records: dict[str, dict[int, ACInfinityPortRecord]] = {}
+        for key in {
+            *((controller_id, 0) for controller_id in self.controller_properties),
+            *self.device_properties,
+            *self.device_controls,
+            *self.device_settings,
+        }:
+            controller_id, device_port = key
+            records.setdefault(controller_id, {})[device_port] = ACInfinityPortRecord(
+                ACInfinityPortRecord.merge(self.controller_properties.get(controller_id), ControllerPropertyKey.DEVICE_INFO)
+                if device_port == 0 else self.device_properties.get(key),
+                ACInfinityPortRecord.merge(self.device_controls.get(key), DeviceControlKey.DEV_SETTING),
+                self.device_settings.get(key),
+            )
+
+        object.__setattr__(self, "records", records)
+
+
+class ACInfinityService:
+    """Service layer object responsible for initializing and updating values from the AC Infinity API"""
+
+    MIN_TIME_BETWEEN_UPDATES = timedelta(seconds=5)
 
     def __init__(
-        self, client: ACInfinityClient
+        self,
+        client: ACInfinityClient,
+        *,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        max_requests_per_refresh: int | None = DEFAULT_MAX_REQUESTS_PER_REFRESH,
+        write_snapshot_max_age: float = DEFAULT_WRITE_SNAPSHOT_MAX_AGE,
+        write_coalesce_window: float = DEFAULT_WRITE_COALESCE_WINDOW,
+        request_executor: ACInfinityRequestExecutor | None = None,
+        property_projection: ACInfinityPropertyProjection | None = None,
+        keep_raw_payload: bool = False,
     ) -> None:
         """
         Args:
             client: The http client to use to make requests to the AC Infinity API
+            max_concurrent_requests: The maximum number of requests allowed in flight at once for each controller during
+                a refresh
+            max_requests_per_refresh: The maximum number of controls and settings requests sent by a single refresh. Due
+                requests past it are sent by the next refreshes, those never read first, then the longest overdue. None
+                sends every due request.
+            write_snapshot_max_age: How old, in seconds, the refreshed values of a port may be and still be
+                used to build a write payload. Older snapshots fall back to reading the port from the API first.
+            write_coalesce_window: How long, in seconds, to wait for further writes to the same port so
+                they can be merged into a single API call.
+            request_executor: Retries calls to the AC Infinity API and stops them while the API is failing
+            property_projection: The fields of the controller, port and sensor properties to keep. None keeps the
+                payloads whole.
+            keep_raw_payload: Keeps the last devInfoListAll payload as returned by the API, for diagnostics
         """
         self._client = client
+        self._executor = request_executor or ACInfinityRequestExecutor()
+
+        # the values below belong to this instance and so to a single account. Controllers and ports that disappear
+        # from the account are evicted from them by the next refresh, and close() empties them
+        self._snapshot = ACInfinitySnapshot()
+        self._topology = ACInfinityTopology()
+        self._topology_generation = self._snapshot.generation
+        self._property_projection = property_projection
+        self._keep_raw_payload = keep_raw_payload
+        self._raw_payload: list[dict[str, Any]] | None = None
+
+        self._max_concurrent_requests = max(1, max_concurrent_requests)
+        self._max_requests_per_refresh = max_requests_per_refresh
+        self._write_snapshot_max_age = write_snapshot_max_age
+        self._write_coalesce_window = write_coalesce_window
+        self._last_refresh_duration: float | None = None
+        self._last_refresh_skipped = 0
+        self._last_refresh_changes = 0
+        self._is_stale = False
+
+        # controllers whose controls and settings could not be read by the last refresh, by controller device id
+        self._stale_controllers: frozenset[str] = frozenset()
+
+        # ports, with 0 for the controller, whose controls and settings are wanted but were never read, by controller device id and port index
+        self._awaiting_first_read: frozenset[tuple[str, int]] = frozenset()
+
+        # wall-clock time at which each controller (port 0) and port was last read from the API, by controller device id and port index
+        self._last_updated_from_api: dict[tuple[str, int], datetime] = {}
+
+        # monotonic time at which each port's controls and settings were last read from the API, by controller device id and port index
+        self._snapshot_fetched_at: dict[tuple[str, int], float] = {}
+
+        # summary of each port's configuration from devInfoListAll when its controls and settings were last read
+        self._port_fingerprints: dict[tuple[str, int], tuple] = {}
+
+        # writes waiting out the coalesce window, by write kind, controller device id and port index
+        self._pending_writes: dict[tuple[str, str, int], _QueuedWrite] = {}
+        self._write_locks: dict[tuple[str, str, int], asyncio.Lock] = {}
+
+        # values applied optimistically by writes that have landed, checked against the next read of the port
+        self._optimistic_values: dict[tuple[str, int], dict[str, Any]] = {}
+        self._optimistic_rollbacks = 0
+        self._listeners: list[Callable[[str, int], None]] = []
+
+    @property
+    def snapshot(self) -> ACInfinitySnapshot:
+        """The values currently served, as published by the last refresh or write"""
+        return self._snapshot
+
+    @property
+    def topology(self) -> ACInfinityTopology:
+        """The controller, port and sensor models of the current values. Compare with an earlier topology via
+        changes_since to find what was added or removed."""
+        if self._topology_generation != self._snapshot.generation:
+            self._topology = self._topology.rebuilt(self._snapshot.controller_properties)
+            self._topology_generation = self._snapshot.generation
+        return self._topology
+
+    @property
+    def raw_payload(self) -> list[dict[str, Any]] | None:
+        """The last devInfoListAll payload as returned by the API, before any fields were dropped. Only kept for
+        diagnostics, when the service was created with keep_raw_payload."""
+        return self._raw_payload
+
+    @property
+    def generation(self) -> int:
+        """Incremented each time values are published; refreshes that read the same values publish nothing. Consumers
+        holding on to the generation they last read values at can skip their work while it is unchanged."""
+        return self._snapshot.generation
+
+    @property
+    def _controller_properties(self) -> Mapping[str, Any]:
+        return self._snapshot.controller_properties
+
+    @property
+    def _sensor_properties(self) -> Mapping[tuple[str, int, int], Any]:
+        return self._snapshot.sensor_properties
+
+    @property
+    def _device_properties(self) -> Mapping[tuple[str, int], Any]:
+        return self._snapshot.device_properties
+
+    @property
+    def _device_controls(self) -> Mapping[tuple[str, int], Any]:
+        return self._snapshot.device_controls
+
+    @property
+    def _device_settings(self) -> Mapping[tuple[str, int], Any]:
+        return self._snapshot.device_settings
+
+    def _publish(self, **stores: Mapping) -> None:
+        """Atomically replaces the current snapshot with one holding the given stores in place of its own
+
+        Args:
+            stores: the replacement stores, by ACInfinitySnapshot field name
+        """
+        self._snapshot = replace(
+            self._snapshot,
+            generation=self._snapshot.generation + 1,
+            **{name: MappingProxyType(dict(value or {})) for name, value in stores.items()}
+        )
+
+    @property
+    def last_refresh_duration(self) -> float | None:
+        """The wall-clock duration, in seconds, of the last successful refresh"""
+        return self._last_refresh_duration
+
+    @property
+    def last_refresh_complete(self) -> bool:
+        """False if the deadline of the last successful refresh passed before every port was read. Ports that
+        were not read keep serving the values of the refresh before it"""
+        return self._last_refresh_skipped == 0
+
+    @property
+    def last_refresh_changes(self) -> int:
+        """The number of ports whose speed, state, mode or online status changed in the last successful refresh"""
+        return self._last_refresh_changes
+
+    @property
+    def request_stats(self) -> dict[str, Any]:
+        """Counters for the calls made to the AC Infinity API, along with the state of the circuit breaker and the
+        number of requests sent in the last minute by endpoint"""
+        return {**self._executor.stats, "requests_per_minute": self._client.rate_limiter.requests_per_minute}
+
+    @property
+    def request_budget_remaining(self) -> float:
+        """The part of the request budget of the client left to send requests with, from 0 to 1"""
+        return self._client.rate_limiter.remaining
+
+    @property
+    def is_stale(self) -> bool:
+        """True while the values being served were not confirmed by the last refresh; either because they were
+        loaded from a persisted snapshot, or because the last refresh failed"""
+        return self._is_stale
+
+    @property
+    def stale_controllers(self) -> frozenset[str]:
+        """The device ids of the controllers whose controls and settings could not be read by the last refresh. They
+        keep serving their previous values while the other controllers refresh as usual"""
+        return self._stale_controllers
+
+    def get_is_stale(self, controller_id: str | int) -> bool:
+        """returns if the values served for a controller were not all confirmed by the last refresh
+
+        Args:
+            controller_id: the device id of the controller
+        """
+        return self._is_stale or str(controller_id) in self._stale_controllers
+
+    @property
+    def awaiting_first_read(self) -> frozenset[tuple[str, int]]:
+        """The (controller id, port) pairs, with port 0 for the controller, whose controls and settings are wanted but
+        were not read yet; on large accounts their first read is spread across refreshes"""
+        return self._awaiting_first_read
+
+    def get_is_awaiting_first_read(self, controller_id: str | int, device_port: int) -> bool:
+        """returns if the controls and settings of a port are wanted but were not read yet
+
+        Args:
+            controller_id: the device id of the controller
+            device_port: the index of the port on the controller, or 0 for the controller
+        """
+        return (str(controller_id), device_port) in self._awaiting_first_read
+
+    @property
+    def last_updated_from_api(self) -> datetime | None:
+        """When any values were last read from the AC Infinity API, if known"""
+        return max(self._last_updated_from_api.values(), default=None)
+
+    def get_last_updated_from_api(self, controller_id: str | int, device_port: int) -> datetime | None:
+        """gets when the values of a controller or port were last read from the AC Infinity API, if known.
+
+        Args:
+            controller_id: the device id of the controller
+            device_port: the index of the port on the controller, or 0 for the controller and its sensors
+        """
+        return self._last_updated_from_api.get((str(controller_id), device_port))
+
+    def export_snapshot(self) -> dict[str, Any]:
+        """Returns the current properties, controls and settings in a json serializable form, to be persisted and
+        loaded on the next startup via load_snapshot"""
+        return {
+            "version": SNAPSHOT_STORAGE_VERSION,
+            "controller_properties": [[controller_id, value] for controller_id, value in self._controller_properties.items()],
+            "sensor_properties": [[*key, value] for key, value in self._sensor_properties.items()],
+            "device_properties": [[*key, value] for key, value in self._device_properties.items()],
+            "device_controls": [[*key, value] for key, value in self._device_controls.items()],
+            "device_settings": [[*key, value] for key, value in self._device_settings.items()],
+            "last_updated_from_api": [[*key, value.isoformat()] for key, value in self._last_updated_from_api.items()],
+            "property_keys": sorted(self._property_projection.keys) if self._property_projection is not None else None,
+        }
+
+    def load_snapshot(self, snapshot: dict[str, Any]) -> bool:
+        """Serves the values of a snapshot created by export_snapshot until the next successful refresh.
+        Returns false, leaving the current values untouched, if the snapshot is empty or not understood.
+
+        Args:
+            snapshot: the snapshot to load
+        """
+        try:
+            if snapshot.get("version") != SNAPSHOT_STORAGE_VERSION or not snapshot["controller_properties"]:
+                return False
+
+            # a snapshot saved before entities started reading a field would leave them without it until a refresh
+            if self._property_projection is not None and not self._property_projection.is_covered_by(snapshot.get("property_keys")):
+                _LOGGER.debug("Ignoring AC Infinity snapshot saved without fields that are read now")
+                return False
+
+            project = self._property_projection.project if self._property_projection is not None else dict
+
+            controller_properties = {str(controller_id): project(value) for controller_id, value in snapshot["controller_properties"]}
+            sensor_properties = {(controller_id, port, sensor_type): project(value) for controller_id, port, sensor_type, value in snapshot["sensor_properties"]}
+            device_properties = {(controller_id, port): project(value) for controller_id, port, value in snapshot["device_properties"]}
+            device_controls = {(controller_id, port): value for controller_id, port, value in snapshot["device_controls"]}
+            device_settings = {(controller_id, port): value for controller_id, port, value in snapshot["device_settings"]}
+            last_updated_from_api = {
+                (str(controller_id), port): dt_util.parse_datetime(value, raise_on_error=True)
+                for controller_id, port, value in snapshot.get("last_updated_from_api", [])
+            }
+        except (AttributeError, KeyError, TypeError, ValueError) as ex:
+            _LOGGER.warning("Ignoring unreadable AC Infinity snapshot", exc_info=ex)
+            return False
+
+        self._publish(
+            controller_properties=controller_properties,
+            sensor_properties=sensor_properties,
+            device_properties=device_properties,
+            device_controls=device_controls,
+            device_settings=device_settings,
+        )
+        self._last_updated_from_api = last_updated_from_api
+        self._is_stale = True
+        return True
+
+    @property
+    def optimistic_rollbacks(self) -> int:
+        """The number of times optimistically applied values had to be corrected, either because the write
+        failed or because the API reported different values afterward"""
+        return self._optimistic_rollbacks
+
+    def add_listener(self, listener: Callable[[str, int], None]) -> Callable[[], None]:
+        """Registers a callback invoked with (controller id, port) when values of a port change outside a refresh,
+        such as when a write is applied optimistically. Returns a callable that removes the listener.
+
+        Args:
+            listener: the callback to invoke
+        """
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
 
     def get_device_ids(self) -> list[str]:
         """
@@ -262,14 +1046,9 @@ class ACInfinityService:
             controller_id: the device id of the controller
             property_key: the json field name for the data being retrieved
         """
-        normalized_id = str(controller_id)
-        if normalized_id in self._controller_properties:
-            result = self._controller_properties[normalized_id]
-            if property_key in result:
-                return True
-            return property_key in result[ControllerPropertyKey.DEVICE_INFO]
-
-        return False
+        ports = self._snapshot.records.get(str(controller_id))
+        record = ports.get(0) if ports is not None else None
+        return record is not None and record.properties is not None and property_key in record.properties
 
     def get_controller_property(
         self, controller_id: str | int, property_key: str, default_value=None
@@ -281,17 +1060,13 @@ class ACInfinityService:
             property_key: the json field name for the data being retrieved
             default_value: the value to return if the controller or property doesn't exist
         """
-        normalized_id = str(controller_id)
-        if normalized_id in self._controller_properties:
-            result = self._controller_properties[normalized_id]
-            if property_key in result:
-                value = result[property_key]
-                return value if value is not None else default_value
-            elif property_key in result[ControllerPropertyKey.DEVICE_INFO]:
-                value = result[ControllerPropertyKey.DEVICE_INFO][property_key]
-                return value if value is not None else default_value
+        ports = self._snapshot.records.get(str(controller_id))
+        record = ports.get(0) if ports is not None else None
+        if record is None or record.properties is None:
+            return default_value
 
-        return default_value
+        value = record.properties.get(property_key)
+        return value if value is not None else default_value
 
     def get_sensor_property_exists(
         self,
@@ -308,11 +1083,8 @@ class ACInfinityService:
             sensor_type: the type of sensor plugged into the port
             property_key: the json field name for the data being retrieved
         """
-        normalized_id = (str(controller_id), sensor_port, sensor_type)
-        return (
-            normalized_id in self._sensor_properties
-            and property_key in self._sensor_properties[normalized_id]
-        )
+        found = self._snapshot.sensor_properties.get((str(controller_id), sensor_port, sensor_type))
+        return found is not None and property_key in found
 
     def get_sensor_property(
         self,
@@ -331,14 +1103,12 @@ class ACInfinityService:
             property_key: the json filed name for the data being retrieved
             default_value: the default value to return if the controller, port, or property doesn't exist
         """
-        normalized_id = (str(controller_id), sensor_port, sensor_type)
-        if normalized_id in self._sensor_properties:
-            found = self._sensor_properties[normalized_id]
-            if property_key in found:
-                value = found[property_key]
-                return value if value is not None else default_value
+        found = self._snapshot.sensor_properties.get((str(controller_id), sensor_port, sensor_type))
+        if found is None:
+            return default_value
 
-        return default_value
+        value = found.get(property_key)
+        return value if value is not None else default_value
 
     def get_device_property_exists(
         self,
@@ -353,11 +1123,9 @@ class ACInfinityService:
             device_port: the index of the port on the controller
             property_key: the setting to pull the value of
         """
-        normalized_id = (str(controller_id), device_port)
-        return (
-            normalized_id in self._device_properties
-            and property_key in self._device_properties[normalized_id]
-        )
+        ports = self._snapshot.records.get(str(controller_id))
+        record = ports.get(device_port) if ports is not None else None
+        return record is not None and record.properties is not None and property_key in record.properties
 
     def get_device_property(
         self,
@@ -374,14 +1142,33 @@ class ACInfinityService:
             property_key: the json filed name for the data being retrieved
             default_value: the default value to return if the controller, port, or property doesn't exist
         """
-        normalized_id = (str(controller_id), device_port)
-        if normalized_id in self._device_properties:
-            found = self._device_properties[normalized_id]
-            if property_key in found:
-                value = found[property_key]
-                return value if value is not None else default_value
+        ports = self._snapshot.records.get(str(controller_id))
+        record = ports.get(device_port) if ports is not None else None
+        if record is None or record.properties is None:
+            return default_value
+
+        value = record.properties.get(property_key)
+        return value if value is not None else default_value
+
+    def get_next_transition(self) -> int | None:
+        """returns the number of seconds until the soonest timer or cycle of any port switches modes, or None if no
+        port is counting down to a switch"""
+        remaining = [
+            properties.get(DevicePropertyKey.REMAINING_TIME) or 0
+            for properties in self._device_properties.values()
+        ]
+        return min((seconds for seconds in remaining if seconds > 0), default=None)
+
+    def get_any_port_in_mode(self, *modes: int) -> bool:
+        """returns if any port is currently running one of the given modes
 
-        return default_value
+        Args:
+            modes: the AtType values of the modes to look for
+        """
+        return any(
+            properties.get(DevicePropertyKey.CURRENT_MODE) in modes
+            for properties in self._device_properties.values()
+        )
 
     def get_controller_setting_exists(
         self, controller_id: str | int, setting_key: str
@@ -416,8 +1203,9 @@ class ACInfinityService:
             device_port: the port index of the device.
             setting_key: the json field name for the data being retrieved
         """
-        normalized_id = (str(controller_id), device_port)
-        return normalized_id in self._device_settings and setting_key in self._device_settings[normalized_id]
+        ports = self._snapshot.records.get(str(controller_id))
+        record = ports.get(device_port) if ports is not None else None
+        return record is not None and record.settings is not None and setting_key in record.settings
 
     def get_device_setting(
         self,
@@ -434,14 +1222,13 @@ class ACInfinityService:
             setting_key: the json field name for the data being retrieved
             default_value: the value to return if the controller or property doesn't exist
         """
-        normalized_id = str(controller_id)
-        if (normalized_id, device_port) in self._device_settings:
-            result = self._device_settings[(normalized_id, device_port)]
-            if setting_key in result:
-                value = result[setting_key]
-                return value if value is not None else default_value
+        ports = self._snapshot.records.get(str(controller_id))
+        record = ports.get(device_port) if ports is not None else None
+        if record is None or record.settings is None:
+            return default_value
 
-        return default_value
+        value = record.settings.get(setting_key)
+        return value if value is not None else default_value
 
     def get_device_control_exists(
         self,
@@ -456,14 +1243,9 @@ class ACInfinityService:
             device_port: the index of the port on the controller
             setting_key: the setting to pull the value of
         """
-        normalized_id = (str(controller_id), device_port)
-        if normalized_id in self._device_controls:
-            found = self._device_controls[normalized_id]
-            if setting_key in found:
-                return True
-            return setting_key in found[DeviceControlKey.DEV_SETTING]
-
-        return False
+        ports = self._snapshot.records.get(str(controller_id))
+        record = ports.get(device_port) if ports is not None else None
+        return record is not None and record.controls is not None and setting_key in record.controls
 
     def get_device_control(
         self,
@@ -480,89 +1262,456 @@ class ACInfinityService:
             setting_key: the setting to pull the value of
             default_value: the default value to return if the controller, port, or setting doesn't exist
         """
-        normalized_id = (str(controller_id), device_port)
-        if normalized_id in self._device_controls:
-            result = self._device_controls[normalized_id]
-            if setting_key in result:
-                value = result[setting_key]
-                return value if value is not None else default_value
-            elif setting_key in result[DeviceControlKey.DEV_SETTING]:
-                value = result[DeviceControlKey.DEV_SETTING][setting_key]
-                return value if value is not None else default_value
-
-        return default_value
-
-    async def refresh(self) -> None:
-        """refreshes the values of properties and settings from the AC infinity API"""
-        try_count = 0
-        while True:
+        ports = self._snapshot.records.get(str(controller_id))
+        record = ports.get(device_port) if ports is not None else None
+        if record is None or record.controls is None:
+            return default_value
+
+        value = record.controls.get(setting_key)
+        return value if value is not None else default_value
+
+    async def refresh(
+        self,
+        deadline: ACInfinityDeadline | None = None,
+        settings_max_age: float | None = None,
+        settings_filter: Callable[[str, int], bool] | None = None,
+    ) -> None:
+        """refreshes the values of properties and settings from the AC infinity API
+
+        Args:
+            deadline: when the refresh, including its retries, must be done by. Requests only wait for the time
+                that is left, and ports not read by the deadline keep their previous values.
+            settings_max_age: how old, in seconds, the controls and settings of a port may get before they are read
+                again. Ports whose summary in the controller properties shows a change are read regardless. Controller and
+                port properties, which carry the sensor readings, are always read. None reads everything.
+            settings_filter: given a controller device id and port (0 for the controller), returns false if no entity
+                reads the controls and settings of the port, so they are never read. None reads every port.
+        """
+        with deadline or contextlib.nullcontext():
             try:
-                if not self._client.is_logged_in():
-                    await self._client.login()
-
-                all_devices_json = await self._client.get_account_controllers()
-                for controller_properties_json in all_devices_json:
-                    controller_id = controller_properties_json[ControllerPropertyKey.DEVICE_ID]
-
-                    # set controller properties; readings for temp, vpd, humidity, etc...
-                    self._controller_properties[str(controller_id)] = controller_properties_json
-
-                    # retrieve and set controller settings; temperature, humidity, and vpd offsets
-                    controller_settings_json = await self._client.get_device_mode_settings(controller_id, 0)
-                    self._device_settings[(controller_id, 0)] = controller_settings_json[DeviceControlKey.DEV_SETTING]
-
-                    # controller AI will have a sensor array.
-                    if ControllerPropertyKey.SENSORS in controller_properties_json[ControllerPropertyKey.DEVICE_INFO]:
-                        sensors = controller_properties_json[ControllerPropertyKey.DEVICE_INFO][ControllerPropertyKey.SENSORS] or []
-                        for sensor_properties_json in sensors:
-                            access_port_index = sensor_properties_json[SensorPropertyKey.ACCESS_PORT]
-                            sensor_type = sensor_properties_json[SensorPropertyKey.SENSOR_TYPE]
-
-                            # set sensor properties; sensor value, unit, and display precision
-                            self._sensor_properties[(controller_id, access_port_index, sensor_type)] = sensor_properties_json
-
-                    for device_properties_json in controller_properties_json[ControllerPropertyKey.DEVICE_INFO][ControllerPropertyKey.PORTS]:
-                        device_port = device_properties_json[DevicePropertyKey.PORT]
-
-                        # set port properties; current power and remaining time until a mode switch
-                        self._device_properties[(controller_id, device_port)] = device_properties_json
-
-                        # retrieve and set port controls; current mode, temperature triggers, on/off speed, etc...
-                        device_controls_json = await self._client.get_device_mode_settings(controller_id, device_port)
-                        self._device_controls[(controller_id, device_port)] = device_controls_json
-
-                        # retrieve and set port settings; Dynamic Response, Transition values, Buffer values, etc..
-                        device_settings_json = await self._client.get_device_mode_settings(controller_id, device_port)
-                        self._device_settings[(controller_id, device_port)] = device_settings_json[DeviceControlKey.DEV_SETTING]
-
-                return  # update successful.  eject from the infinite while loop.
-
-            except (
-                ACInfinityClientCannotConnect,
-                ACInfinityClientRequestFailed,
-                aiohttp.ClientError,
-                asyncio.TimeoutError
-            ) as ex:
-                if try_count < 4:
-                    try_count += 1
-                    _LOGGER.warning("Unable to refresh from data update coordinator. Retry attempt %s/4", str(try_count))
-                    await asyncio.sleep(1)
-                else:
-                    _LOGGER.error(ACINFINITY_API_ERROR, exc_info=ex)
-                    raise
-            except ACInfinityClientInvalidAuth as ex:
-                _LOGGER.error("Unable to refresh from data update coordinator: Authentication failed", exc_info=ex)
-                raise
-            except Exception as ex:
-                _LOGGER.error("Unable to refresh from data update coordinator: Unexpected error", exc_info=ex)
+                await self._executor.execute(REFRESH_RETRY_POLICY, partial(self.__refresh_once, settings_max_age, settings_filter))
+            except Exception:
+                self._is_stale = True
                 raise
 
-    def get_all_controller_properties(self) -> list[ACInfinityController]:
-        """gets device metadata, such as ids, labels, macaddr, etc... that are not expected to change"""
-        if self._controller_properties is None:
-            return []
+    async def __refresh_once(
+        self, settings_max_age: float | None, settings_filter: Callable[[str, int], bool] | None, retry: int
+    ) -> None:
+        started = time.monotonic()
+        if not self._client.is_logged_in():
+            await self._client.login()
+
+        # each attempt reads fresh values; within it, duplicate reads of the same port are coalesced by the client
+        self._client.begin_refresh_generation()
+
+        # values are read into new stores and published together once the refresh is done, so that nothing reading the
+        # current snapshot in between sees some ports refreshed and others not
+        controller_properties: dict[str, Any] = {}
+        sensor_properties: dict[tuple[str, int, int], Any] = {}
+        device_properties: dict[tuple[str, int], Any] = {}
+        reads: dict[tuple[str, int], _PortRead] = {}
+
+        # settings requests by their priority; see __get_refresh_priority
+        candidates: list[tuple[tuple[int, float], str, int, Callable[[], Awaitable[None]]]] = []
+        changes = 0
+        seen_ports: set[tuple[str, int]] = set()
+        all_devices_json = await self._client.get_account_controllers()
+        if self._keep_raw_payload:
+            self._raw_payload = all_devices_json
+        if self._property_projection is not None:
+            all_devices_json = [self._property_projection.project(controller_json) for controller_json in all_devices_json]
+        read_at = dt_util.utcnow()
+        for controller_properties_json in all_devices_json:
+            controller_id = str(controller_properties_json[ControllerPropertyKey.DEVICE_ID])
+            seen_ports.add((controller_id, 0))
+
+            # set controller properties; readings for temp, vpd, humidity, etc...
+            controller_properties[controller_id] = controller_properties_json
+
+            # retrieve and set controller settings; temperature, humidity, and vpd offsets
+            if self.__is_settings_read_due(controller_id, 0, False, settings_max_age, settings_filter):
+                candidates.append((
+                    self.__get_refresh_priority(controller_id, 0, False),
+                    controller_id,
+                    0,
+                    partial(self.__read_controller_settings, reads, controller_id)
+                ))
+
+            # controller AI will have a sensor array.
+            self.__ingest_sensor_properties(sensor_properties, controller_id, controller_properties_json)
+
+            for device_properties_json in controller_properties_json[ControllerPropertyKey.DEVICE_INFO][ControllerPropertyKey.PORTS]:
+                device_port = device_properties_json[DevicePropertyKey.PORT]
+                seen_ports.add((controller_id, device_port))
+
+                # set port properties; current power and remaining time until a mode switch
+                if self.__is_port_activity_changed(self._device_properties.get((controller_id, device_port)), device_properties_json):
+                    changes += 1
+
+                device_properties[(controller_id, device_port)] = device_properties_json
+
+                # retrieve and set port controls and settings, when their summary above shows they changed or they are due
+                fingerprint = tuple(device_properties_json.get(key) for key in PORT_FINGERPRINT_KEYS)
+                changed = self._port_fingerprints.get((controller_id, device_port)) != fingerprint
+                if self.__is_settings_read_due(controller_id, device_port, changed, settings_max_age, settings_filter):
+                    candidates.append((
+                        self.__get_refresh_priority(controller_id, device_port, changed),
+                        controller_id,
+                        device_port,
+                        partial(self.__read_device_controls_and_settings, reads, controller_id, device_port, fingerprint)
+                    ))
+
+        partitions = self.__partition_due_requests(
+            candidates, [str(controller_properties_json[ControllerPropertyKey.DEVICE_ID]) for controller_properties_json in all_devices_json]
+        )
+
+        # per-controller and per-port requests are independent of each other, so fan them out
+        # concurrently. The refresh then takes roughly as long as the slowest request instead of their sum.
+        # each controller is its own partition; one that fails or stalls, such as a controller that went offline,
+        # keeps its previous values without failing or holding up the others
+        results = await asyncio.gather(
+            *(self.__gather_bounded(requests) for requests in partitions.values()), return_exceptions=True
+        )
+
+        skipped, stale_controllers = self.__collect_partition_results(list(partitions), results)
+
+        # publish everything read at once; controllers and ports no longer on the account are dropped along the way.
+        # the ports of stale controllers keep the time they were last read at, so they still expire past the max staleness
+        self.__evict(seen_ports)
+        self._last_updated_from_api.update((key, read_at) for key in seen_ports if key[0] not in stale_controllers)
+        self.__publish_reads(
+            reads,
+            controller_properties=controller_properties,
+            sensor_properties=sensor_properties,
+            device_properties=device_properties,
+            device_controls={key: value for key, value in self._device_controls.items() if key in seen_ports},
+            device_settings={key: value for key, value in self._device_settings.items() if key in seen_ports},
+        )
+
+        self._awaiting_first_read = frozenset(
+            (controller_id, device_port) for priority, controller_id, device_port, _ in candidates
+            if priority[0] == 0 and (controller_id, device_port) not in reads
+        )
+        self._last_refresh_skipped = skipped
+        if self._last_refresh_skipped:
+            _LOGGER.warning(
+                "Refresh deadline or request budget did not allow %s of %s port requests; keeping their previous values",
+                self._last_refresh_skipped,
+                sum(len(requests) for requests in partitions.values())
+            )
+
+        self._last_refresh_duration = time.monotonic() - started
+        self._last_refresh_changes = changes
+        self._stale_controllers = frozenset(stale_controllers)
+        self._is_stale = False
+        _LOGGER.debug(
+            "Refreshed %s controllers (%s requests) in %.2f seconds",
+            len(all_devices_json),
+            sum(len(requests) for requests in partitions.values()) + 1,
+            self._last_refresh_duration
+        )
+
+    def __partition_due_requests(
+        self, candidates: list[tuple[tuple[int, float], str, int, Callable[[], Awaitable[None]]]], controller_ids: list[str]
+    ) -> dict[str, list[Callable[[], Awaitable[None]]]]:
+        """picks the due settings requests sent by this refresh, and splits them into one partition per controller
+
+        Args:
+            candidates: the due settings requests, with their priority, controller device id and port
+            controller_ids: the device ids of every controller on the account
+        """
+        # large accounts read a bounded slice of the due settings per refresh, round-robin from the longest overdue,
+        # so a due port waits at most one refresh per max_requests_per_refresh ports due ahead of it.
+        # settings never read before go first, so the first read of a large account is spread across refreshes the
+        # same way; the entities of each port are set up as its first read lands
+        selected = sorted(candidates, key=lambda candidate: candidate[0])
+        if self._max_requests_per_refresh is not None and len(selected) > self._max_requests_per_refresh:
+            _LOGGER.debug(
+                "Deferring %s of %s due settings requests to the next refresh",
+                len(selected) - self._max_requests_per_refresh,
+                len(selected)
+            )
+            selected = selected[:self._max_requests_per_refresh]
+
+        partitions: dict[str, list[Callable[[], Awaitable[None]]]] = {controller_id: [] for controller_id in controller_ids}
+        for _, controller_id, _, request in selected:
+            partitions[controller_id].append(request)
+
+        return partitions
+
+    @staticmethod
+    def __collect_partition_results(controller_ids: list[str], results: list[int | BaseException]) -> tuple[int, set[str]]:
+        """returns the number of requests skipped past the deadline, and the device ids of the controllers whose
+        partition failed. Raises the failure instead if it is account wide.
+
+        Args:
+            controller_ids: the device ids of the controllers, in the order of their partitions
+            results: the number of skipped requests, or the failure, of each partition
+        """
+        # a failure shared by every controller, or an expired login, is account wide and fails the refresh as before
+        failures = [result for result in results if isinstance(result, BaseException)]
+        account_wide = [
+            failure for failure in failures
+            if isinstance(failure, ACInfinityClientInvalidAuth) or not isinstance(failure, Exception)
+        ]
+        if account_wide or failures and len(failures) == len(results):
+            raise (account_wide or failures)[0]
+
+        skipped = 0
+        stale_controllers: set[str] = set()
+        for controller_id, result in zip(controller_ids, results):
+            if isinstance(result, BaseException):
+                _LOGGER.warning(
+                    "Unable to refresh the controls and settings of controller %s; keeping its previous values",
+                    controller_id,
+                    exc_info=result
+                )
+                stale_controllers.add(controller_id)
+            else:
+                skipped += result
+
+        return skipped, stale_controllers
+
+    async def refresh_device(self, controller_id: str | int, device_port: int) -> None:
+        """refreshes the controls and settings of a single port, such as after writing to it, without
+        re-downloading the rest of the account.
+
+        Args:
+            controller_id: the device id of the controller
+            device_port: the index of the port on the controller, or 0 for the controller settings
+        """
+        reads: dict[tuple[str, int], _PortRead] = {}
+        if device_port == 0:
+            await self.__read_controller_settings(reads, str(controller_id))
+        else:
+            await self.__read_device_controls_and_settings(reads, str(controller_id), device_port)
+
+        self.__publish_reads(reads)
+
+    async def __read_controller_settings(self, reads: dict[tuple[str, int], _PortRead], controller_id: str) -> None:
+        """retrieves controller settings; temperature, humidity, and vpd offsets
+
+        Args:
+            reads: where to record the settings until they are published
+            controller_id: the device id of the controller
+        """
+        controller_settings_json = await self._client.get_device_mode_settings(controller_id, 0)
+        reads[(controller_id, 0)] = _PortRead(None, controller_settings_json[DeviceControlKey.DEV_SETTING])
+
+    async def __read_device_controls_and_settings(
+        self, reads: dict[tuple[str, int], _PortRead], controller_id: str, device_port: int, fingerprint: tuple | None = None
+    ) -> None:
+        """retrieves the controls and settings of a single port
+
+        Args:
+            reads: where to record the controls and settings until they are published
+            controller_id: the device id of the controller
+            device_port: the index of the port on the controller
+            fingerprint: the summary of the port the values are read for, to compare the next summaries against
+        """
+        # retrieve port controls; current mode, temperature triggers, on/off speed, etc...
+        device_controls_json = await self._client.get_device_mode_settings(controller_id, device_port)
+
+        # retrieve port settings; Dynamic Response, Transition values, Buffer values, etc..
+        device_settings_json = await self._client.get_device_mode_settings(controller_id, device_port)
+        reads[(controller_id, device_port)] = _PortRead(
+            device_controls_json, device_settings_json[DeviceControlKey.DEV_SETTING], fingerprint
+        )
+
+    def __publish_reads(self, reads: dict[tuple[str, int], _PortRead], **stores: Mapping) -> None:
+        """publishes the given stores along with the controls and settings read for each port, then checks the read
+        values against those optimistically applied by writes
+
+        Args:
+            reads: the controls and settings read, by controller device id and port index
+            stores: the replacement stores, by ACInfinitySnapshot field name
+        """
+        device_controls = dict(stores.get("device_controls", self._device_controls))
+        device_settings = dict(stores.get("device_settings", self._device_settings))
+        for key, read in reads.items():
+            if read.controls is not None:
+                device_controls[key] = read.controls
+            device_settings[key] = read.settings
+            self._snapshot_fetched_at[key] = read.fetched_at
+            if key[1] != 0:
+                self._last_updated_from_api[key] = read.read_at
+            if read.fingerprint is not None:
+                self._port_fingerprints[key] = read.fingerprint
+
+        # reads that return the same values keep the current snapshot, and with it the generation
+        stores = {**stores, "device_controls": device_controls, "device_settings": device_settings}
+        if any(getattr(self._snapshot, name) != value for name, value in stores.items()):
+            self._publish(**stores)
+
+        for controller_id, device_port in reads:
+            self.__reconcile_optimistic_values(controller_id, device_port)
+
+    def __evict(self, seen_ports: set[tuple[str, int]]) -> None:
+        """drops everything held for controllers and ports no longer on the account, other than their values, which
+        the next published snapshot leaves out
+
+        Args:
+            seen_ports: the controller device ids and port indexes in the account, with port 0 for each controller
+        """
+        def seen(key: tuple) -> bool:
+            return (str(key[0]), key[1]) in seen_ports
+
+        evicted = sum(1 for key in self._device_properties if not seen(key)) + sum(
+            1 for key in self._controller_properties if (key, 0) not in seen_ports
+        )
+        if not evicted:
+            return
+
+        self._last_updated_from_api = {key: value for key, value in self._last_updated_from_api.items() if seen(key)}
+        self._snapshot_fetched_at = {key: value for key, value in self._snapshot_fetched_at.items() if seen(key)}
+        self._port_fingerprints = {key: value for key, value in self._port_fingerprints.items() if seen(key)}
+        self._optimistic_values = {key: value for key, value in self._optimistic_values.items() if seen(key)}
+        self._write_locks = {
+            key: lock for key, lock in self._write_locks.items() if seen(key[1:]) or lock.locked()
+        }
+        _LOGGER.debug("Dropped %s controllers and ports no longer on the account", evicted)
+
+    @staticmethod
+    def __is_settings_wanted(controller_id: str | int, device_port: int, settings_filter: Callable[[str, int], bool] | None) -> bool:
+        return settings_filter is None or settings_filter(str(controller_id), device_port)
+
+    @staticmethod
+    def __ingest_sensor_properties(
+        sensor_properties: dict[tuple[str, int, int], Any], controller_id: str, controller_properties_json: Mapping[str, Any]
+    ) -> None:
+        """sets the properties of the sensors of a controller, if it has any; sensor value, unit, and display precision
 
-        return [ACInfinityController(device) for device in self._controller_properties.values()]
+        Args:
+            sensor_properties: the store being refreshed, by controller device id, access port and sensor type
+            controller_id: the device id of the controller
+            controller_properties_json: the controller properties, as returned by the API
+        """
+        sensors = controller_properties_json[ControllerPropertyKey.DEVICE_INFO].get(ControllerPropertyKey.SENSORS) or []
+        for sensor_properties_json in sensors:
+            access_port_index = sensor_properties_json[SensorPropertyKey.ACCESS_PORT]
+            sensor_type = sensor_properties_json[SensorPropertyKey.SENSOR_TYPE]
+            sensor_properties[(controller_id, access_port_index, sensor_type)] = sensor_properties_json
+
+    @staticmethod
+    def __is_port_activity_changed(previous_json: Mapping[str, Any] | None, device_properties_json: Mapping[str, Any]) -> bool:
+        """returns true if the live readings of a port, such as its power or remaining time, changed since the last refresh
+
+        Args:
+            previous_json: the port properties of the last refresh, or None if the port is new
+            device_properties_json: the port properties, as returned by the API
+        """
+        return previous_json is not None and any(
+            previous_json.get(key) != device_properties_json.get(key) for key in PORT_ACTIVITY_KEYS
+        )
+
+    def __is_settings_read_due(
+        self,
+        controller_id: str,
+        device_port: int,
+        changed: bool,
+        settings_max_age: float | None,
+        settings_filter: Callable[[str, int], bool] | None,
+    ) -> bool:
+        """returns true if the controls and settings of a port are a candidate for this refresh; they are wanted, and
+        either changed or due
+
+        Args:
+            controller_id: the device id of the controller
+            device_port: the index of the port on the controller, or 0 for the controller settings
+            changed: if the summary of the port shows its controls or settings changed since they were read
+            settings_max_age: how old, in seconds, the controls and settings may get before they are read again
+            settings_filter: returns false for ports whose controls and settings no entity reads
+        """
+        return self.__is_settings_wanted(controller_id, device_port, settings_filter) and (
+            changed or self.__is_settings_refresh_due(controller_id, device_port, settings_max_age)
+        )
+
+    def __get_refresh_priority(self, controller_id: str | int, device_port: int, changed: bool) -> tuple[int, float]:
+        """returns the order due settings are read in when they can't all be read in one refresh; first those never read,
+        then those written to or whose port summary changed since, then the rest from the longest overdue
+
+        Args:
+            controller_id: the device id of the controller
+            device_port: the index of the port on the controller, or 0 for the controller settings
+            changed: if the summary of the port shows its controls or settings changed since they were read
+        """
+        normalized_id = (str(controller_id), device_port)
+        store = self._device_settings if device_port == 0 else self._device_controls
+        if normalized_id not in store:
+            return 0, 0.0
+
+        fetched_at = self._snapshot_fetched_at.get(normalized_id)
+        if changed or fetched_at is None:
+            return 1, 0.0
+
+        return 2, fetched_at
+
+    def __is_settings_refresh_due(self, controller_id: str | int, device_port: int, settings_max_age: float | None) -> bool:
+        """returns true if the controls and settings of a port have to be read again; because they were never read,
+        were written to since, or are older than settings_max_age"""
+        if settings_max_age is None:
+            return True
+
+        fetched_at = self._snapshot_fetched_at.get((str(controller_id), device_port))
+        return fetched_at is None or time.monotonic() - fetched_at >= settings_max_age
+
+    def __get_write_snapshot(self, store: Mapping[tuple[str, int], Any], controller_id: str | int, device_port: int):
+        """returns the refreshed values of a port to build a write payload from, or None if they are too old to trust
+
+        Args:
+            store: the store holding the values the write endpoint expects
+            controller_id: the device id of the controller
+            device_port: the index of the port on the controller
+        """
+        normalized_id = (str(controller_id), device_port)
+        fetched_at = self._snapshot_fetched_at.get(normalized_id)
+        if fetched_at is None or time.monotonic() - fetched_at > self._write_snapshot_max_age:
+            return None
+
+        return store.get(normalized_id)
+
+    async def __gather_bounded(self, requests: list[Callable[[], Awaitable[None]]]) -> int:
+        """Runs the given requests concurrently, with at most max_concurrent_requests in flight at once.
+        Requests cut short by the current deadline, or that the request budget would not allow before it, are
+        skipped, keeping what the others fetched, and their number is returned. If any request fails otherwise,
+        the remaining requests are cancelled and the failure is raised.
+
+        Args:
+            requests: factories that create the request awaitables to run
+        """
+        semaphore = asyncio.Semaphore(self._max_concurrent_requests)
+        deadline = ACInfinityDeadline.current()
+        skipped = 0
+
+        async def run_bounded(request: Callable[[], Awaitable[None]]) -> None:
+            nonlocal skipped
+            async with semaphore:
+                try:
+                    await request()
+                except ACInfinityClientDeadlineExceeded:
+                    if deadline is None:
+                        raise
+                    skipped += 1
+                except asyncio.TimeoutError:
+                    if deadline is None or not deadline.expired:
+                        raise
+                    skipped += 1
+
+        tasks = [asyncio.ensure_future(run_bounded(request)) for request in requests]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        return skipped
+
+    def get_all_controller_properties(self) -> list[ACInfinityController]:
+        """gets device metadata, such as ids, labels, macaddr, etc... that are not expected to change. The models are
+        cached and shared between calls until the topology changes."""
+        return list(self.topology.controllers)
 
     async def update_controller_setting(
         self,
@@ -591,7 +1740,7 @@ class ACInfinityService:
         if controller.is_ai_controller:
             raise NotImplementedError("AI controllers do not support updating controller settings: %s", key_values)
         else:
-            await self.__update_advanced_settings(controller.controller_id, 0, controller.controller_name, key_values)
+            await self.__queue_write(_WRITE_KIND_SETTINGS, controller.controller_id, 0, controller.controller_name, key_values)
 
     async def update_device_setting(
         self,
@@ -620,9 +1769,9 @@ class ACInfinityService:
             key_values: a list of key/value pairs to update, as a tuple of (setting_key, new_value)
         """
         if device.controller.is_ai_controller:
-            await self.__update_ai_control_and_settings(device.controller.controller_id, device.device_port, key_values)
+            await self.__queue_write(_WRITE_KIND_AI, device.controller.controller_id, device.device_port, device.device_name, key_values)
         else:
-            await self.__update_advanced_settings(device.controller.controller_id, device.device_port, device.device_name, key_values)
+            await self.__queue_write(_WRITE_KIND_SETTINGS, device.controller.controller_id, device.device_port, device.device_name, key_values)
 
     async def update_device_control(
         self,
@@ -645,9 +1794,155 @@ class ACInfinityService:
         key_values: dict[str, int],
     ):
         if device.controller.is_ai_controller:
-            await self.__update_ai_control_and_settings(device.controller.controller_id, device.device_port, key_values)
+            await self.__queue_write(_WRITE_KIND_AI, device.controller.controller_id, device.device_port, device.device_name, key_values)
+        else:
+            await self.__queue_write(_WRITE_KIND_CONTROLS, device.controller.controller_id, device.device_port, device.device_name, key_values)
+
+    async def __queue_write(
+        self,
+        kind: str,
+        controller_id: str | int,
+        device_port: int,
+        device_name: str,
+        key_values: dict[str, int],
+    ):
+        """Queues key/values to be written to a port. Writes of the same kind to the same port that arrive within the
+        coalesce window are merged, later values winning, and sent as a single API call. Returns once that call lands.
+
+        Args:
+            kind: which write endpoint the key/values are destined for
+            controller_id: the device id of the controller
+            device_port: the index of the port on the controller
+            device_name: the name of the device, sent along with advanced settings
+            key_values: a list of key/value pairs to update, as a tuple of (setting_key, new_value)
+        """
+        queue_key = (kind, str(controller_id), device_port)
+        queued = self._pending_writes.get(queue_key)
+        if queued is None:
+            queued = _QueuedWrite(device_name, asyncio.get_running_loop().create_future())
+            queued.task = asyncio.ensure_future(self.__flush_write(queue_key, controller_id, device_port, queued))
+            self._pending_writes[queue_key] = queued
+
+        queued.key_values.update(key_values)
+        queued.device_name = device_name
+
+        # show the new values right away; they are rolled back if the write fails
+        previous_values = self.__apply_values(controller_id, device_port, key_values)
+        for key, value in previous_values.items():
+            queued.previous_values.setdefault(key, value)
+
+        # shielded so a caller giving up doesn't cancel a write other callers are waiting on
+        await asyncio.shield(queued.future)
+
+    async def __flush_write(
+        self, queue_key: tuple[str, str, int], controller_id: str | int, device_port: int, queued: _QueuedWrite
+    ):
+        """waits out the coalesce window, then sends the merged key/values queued for a port"""
+        try:
+            await asyncio.sleep(self._write_coalesce_window)
+
+            # writes to a port are sent one at a time, in order, so a later write always lands last
+            lock = self._write_locks.setdefault(queue_key, asyncio.Lock())
+            async with lock:
+                # anything queued from here on waits for the next flush
+                self._pending_writes.pop(queue_key)
+                kind = queue_key[0]
+                if kind == _WRITE_KIND_AI:
+                    await self.__update_ai_control_and_settings(controller_id, device_port, queued.key_values)
+                elif kind == _WRITE_KIND_SETTINGS:
+                    await self.__update_advanced_settings(controller_id, device_port, queued.device_name, queued.key_values)
+                else:
+                    await self.__update_device_controls(controller_id, device_port, queued.key_values)
+        except asyncio.CancelledError:
+            if self._pending_writes.get(queue_key) is queued:
+                self._pending_writes.pop(queue_key)
+            queued.future.cancel()
+            raise
+        except Exception as ex:
+            self.__roll_back_values(controller_id, device_port, queued)
+            queued.future.set_exception(ex)
+            queued.future.exception()  # mark as retrieved; each waiting caller re-raises it
         else:
-            await self.__update_device_controls(device.controller.controller_id, device.device_port, key_values)
+            self._optimistic_values.setdefault((str(controller_id), device_port), {}).update(queued.key_values)
+            queued.future.set_result(None)
+
+    def __apply_values(self, controller_id: str | int, device_port: int, key_values: dict[str, Any]) -> dict[str, Any]:
+        """Writes key/values into the stored controls and settings of a port wherever those keys are present, and
+        notifies listeners. The json of the port is replaced in a newly published snapshot rather than modified, so references
+        held elsewhere are unaffected.
+        Returns the values that were replaced.
+
+        Args:
+            controller_id: the device id of the controller
+            device_port: the index of the port on the controller
+            key_values: a list of key/value pairs to apply, as a tuple of (setting_key, new_value)
+        """
+        normalized_id = (str(controller_id), device_port)
+        controls = self._device_controls.get(normalized_id)
+        settings = self._device_settings.get(normalized_id)
+        new_controls = dict(controls) if controls is not None else None
+        new_settings = dict(settings) if settings is not None else None
+
+        previous_values: dict[str, Any] = {}
+        for key, value in key_values.items():
+            if new_settings is not None and key in new_settings:
+                previous_values[key] = new_settings[key]
+                new_settings[key] = value
+            if new_controls is not None and key in new_controls:
+                previous_values[key] = new_controls[key]
+                new_controls[key] = value
+
+        if not previous_values:
+            return previous_values
+
+        stores: dict[str, Mapping] = {}
+        if new_controls is not None:
+            if new_settings is not None and DeviceControlKey.DEV_SETTING in new_controls:
+                new_controls[DeviceControlKey.DEV_SETTING] = new_settings
+            stores["device_controls"] = {**self._device_controls, normalized_id: new_controls}
+        if new_settings is not None:
+            stores["device_settings"] = {**self._device_settings, normalized_id: new_settings}
+        self._publish(**stores)
+
+        self.__notify_listeners(controller_id, device_port)
+        return previous_values
+
+    def __roll_back_values(self, controller_id: str | int, device_port: int, queued: _QueuedWrite) -> None:
+        """restores the values a failed write replaced, unless a later write has already replaced them again"""
+        normalized_id = (str(controller_id), device_port)
+        controls = self._device_controls.get(normalized_id) or {}
+        settings = self._device_settings.get(normalized_id) or {}
+        restore = {
+            key: value
+            for key, value in queued.previous_values.items()
+            if controls.get(key, settings.get(key)) == queued.key_values.get(key)
+        }
+        if restore:
+            self._optimistic_rollbacks += 1
+            _LOGGER.debug("Rolling back %s on port %s of controller %s after a failed write", restore, device_port, controller_id)
+            self.__apply_values(controller_id, device_port, restore)
+
+    def __reconcile_optimistic_values(self, controller_id: str | int, device_port: int) -> None:
+        """compares freshly read values of a port against the values optimistically applied by landed writes"""
+        expected = self._optimistic_values.pop((str(controller_id), device_port), None)
+        if not expected:
+            return
+
+        if device_port == 0:
+            actual = {key: self.get_device_setting(controller_id, 0, key) for key in expected}
+        else:
+            actual = {key: self.get_device_control(controller_id, device_port, key) for key in expected}
+
+        if actual != expected:
+            self._optimistic_rollbacks += 1
+            _LOGGER.debug(
+                "Port %s of controller %s reported %s after writing %s; optimistic values corrected",
+                device_port, controller_id, actual, expected
+            )
+
+    def __notify_listeners(self, controller_id: str | int, device_port: int) -> None:
+        for listener in list(self._listeners):
+            listener(str(controller_id), device_port)
 
     async def __update_device_controls(
         self,
@@ -662,32 +1957,18 @@ class ACInfinityService:
             device_port: the index of the port on the controller
             key_values: a list of key/value pairs to update, as a tuple of (setting_key, new_value)
         """
-        try_count = 0
-        while True:
-            try:
-                await self._client.update_device_controls(controller_id, device_port, key_values)
-                return
+        async def send(retry: int) -> None:
+            # build the payload from the last refresh when it is recent enough; retries always read the port live
+            snapshot = self.__get_write_snapshot(self._device_controls, controller_id, device_port) if retry == 0 else None
+            if snapshot is None:
+                # the read the client memoized for the current refresh generation is as old as that refresh
+                self._client.invalidate_device(controller_id, device_port)
+            await self._client.update_device_controls(controller_id, device_port, key_values, existing_values=snapshot)
 
-            except (
-                ACInfinityClientCannotConnect,
-                ACInfinityClientRequestFailed,
-                aiohttp.ClientError,
-                asyncio.TimeoutError
-            ) as ex:
-
-                if try_count < 4:
-                    try_count += 1
-                    _LOGGER.warning("Unable to update device controls. Retry attempt %s/4", str(try_count))
-                    await asyncio.sleep(1)
-                else:
-                    _LOGGER.error(ACINFINITY_API_ERROR, exc_info=ex)
-                    raise
-            except ACInfinityClientInvalidAuth as ex:
-                _LOGGER.error("Unable to update device controls: Authentication failed", exc_info=ex)
-                raise
-            except Exception as ex:
-                _LOGGER.error("Unable to update device controls: Unexpected error", exc_info=ex)
-                raise
+            # the snapshot no longer reflects the port, so subsequent writes must read it live until the next refresh
+            self._snapshot_fetched_at.pop((str(controller_id), device_port), None)
+
+        await self._executor.execute(DEVICE_CONTROLS_RETRY_POLICY, send)
 
     async def __update_advanced_settings(
         self,
@@ -703,31 +1984,18 @@ class ACInfinityService:
             device_port: 0 for controller settings, or the port number for port settings
             key_values: a list of key/value pairs to update, as a tuple of (setting_key, new_value)
         """
-        try_count = 0
-        while True:
-            try:
-                await self._client.update_device_settings(controller_id, device_port, device_name, key_values)
-                return
+        async def send(retry: int) -> None:
+            # build the payload from the last refresh when it is recent enough; retries always read the port live
+            snapshot = self.__get_write_snapshot(self._device_settings, controller_id, device_port) if retry == 0 else None
+            if snapshot is None:
+                # the read the client memoized for the current refresh generation is as old as that refresh
+                self._client.invalidate_device(controller_id, device_port)
+            await self._client.update_device_settings(controller_id, device_port, device_name, key_values, existing_values=snapshot)
 
-            except (
-                ACInfinityClientCannotConnect,
-                ACInfinityClientRequestFailed,
-                aiohttp.ClientError,
-                asyncio.TimeoutError
-            ) as ex:
-                if try_count < 4:
-                    try_count += 1
-                    _LOGGER.warning("Unable to update advanced controller settings. Retry attempt %s/4", str(try_count))
-                    await asyncio.sleep(1)
-                else:
-                    _LOGGER.error(ACINFINITY_API_ERROR, exc_info=ex)
-                    raise
-            except ACInfinityClientInvalidAuth as ex:
-                _LOGGER.error("Unable to update advanced controller settings: Authentication failed", exc_info=ex)
-                raise
-            except Exception as ex:
-                _LOGGER.error("Unable to update advanced controller settings: Unexpected error", exc_info=ex)
-                raise
+            # the snapshot no longer reflects the port, so subsequent writes must read it live until the next refresh
+            self._snapshot_fetched_at.pop((str(controller_id), device_port), None)
+
+        await self._executor.execute(ADVANCED_SETTINGS_RETRY_POLICY, send)
 
     async def __update_ai_control_and_settings(
         self,
@@ -742,38 +2010,39 @@ class ACInfinityService:
             device_port: the index of the port on the controller
             key_values: a list of key/value pairs to update, as a tuple of (setting_key, new_value)
         """
-        try_count = 0
-        while True:
-            try:
-                await self._client.update_ai_device_control_and_settings(controller_id, device_port, key_values)
-                return
+        async def send(retry: int) -> None:
+            # build the payload from the last refresh when it is recent enough; retries always read the port live
+            snapshot = self.__get_write_snapshot(self._device_controls, controller_id, device_port) if retry == 0 else None
+            if snapshot is None:
+                # the read the client memoized for the current refresh generation is as old as that refresh
+                self._client.invalidate_device(controller_id, device_port)
+            await self._client.update_ai_device_control_and_settings(controller_id, device_port, key_values, existing_values=snapshot)
 
-            except (
-                ACInfinityClientCannotConnect,
-                ACInfinityClientRequestFailed,
-                aiohttp.ClientError,
-                asyncio.TimeoutError
-            ) as ex:
-
-                if try_count < 4:
-                    try_count += 1
-                    _LOGGER.warning("Unable to update ai device controls and settings. Retry attempt %s/4", str(try_count))
-                    await asyncio.sleep(1)
-                else:
-                    _LOGGER.error(ACINFINITY_API_ERROR, exc_info=ex)
-                    raise
-            except ACInfinityClientInvalidAuth as ex:
-                _LOGGER.error("Unable to update ai device controls and settings: Authentication failed", exc_info=ex)
-                raise
-            except Exception as ex:
-                _LOGGER.error("Unable to update ai device controls and settings: Unexpected error", exc_info=ex)
-                raise
+            # the snapshot no longer reflects the port, so subsequent writes must read it live until the next refresh
+            self._snapshot_fetched_at.pop((str(controller_id), device_port), None)
+
+        await self._executor.execute(AI_CONTROL_AND_SETTINGS_RETRY_POLICY, send)
 
     async def close(self) -> None:
         """Close the client session when done"""
+        for queued in list(self._pending_writes.values()):
+            if queued.task is not None:
+                queued.task.cancel()
+
         if self._client:
             await self._client.close()
 
+        self._snapshot = ACInfinitySnapshot(self._snapshot.generation + 1)
+        self._stale_controllers = frozenset()
+        self._awaiting_first_read = frozenset()
+        self._last_updated_from_api = {}
+        self._snapshot_fetched_at = {}
+        self._port_fingerprints = {}
+        self._pending_writes = {}
+        self._write_locks = {}
+        self._optimistic_values = {}
+        self._listeners.clear()
+
 
 class ACInfinityDataUpdateCoordinator(DataUpdateCoordinator):
     """Handles updating data for the integration"""
@@ -784,8 +2053,29 @@ class ACInfinityDataUpdateCoordinator(DataUpdateCoordinator):
         entry: ConfigEntry,
         service: ACInfinityService,
         polling_interval: int,
+        *,
+        snapshot_store: Store[dict[str, Any]] | None = None,
+        max_staleness: int = DEFAULT_MAX_STALENESS,
+        settings_polling_interval: int = DEFAULT_SETTINGS_POLLING_INTERVAL,
+        min_polling_interval: int = DEFAULT_MIN_POLLING_INTERVAL,
+        max_polling_interval: int = DEFAULT_MAX_POLLING_INTERVAL,
     ):
-        """Constructor"""
+        """Constructor
+
+        Args:
+            hass: the home assistant instance
+            entry: the config entry the coordinator refreshes data for
+            service: the service holding the data
+            polling_interval: the number of seconds between refreshes while ports are in auto or vpd mode, and the
+                interval polling starts at
+            snapshot_store: where to persist the last good data so the next startup doesn't wait on the API
+            max_staleness: how long, in seconds, the last good values keep being served while refreshes fail before
+                their entities go unavailable. 0 makes entities unavailable as soon as a refresh fails.
+            settings_polling_interval: the number of seconds between reads of the mode settings of each port and the
+                controller settings. Ports written to are read again on the next refresh regardless.
+            min_polling_interval: the fewest number of seconds between refreshes while ports are changing
+            max_polling_interval: the most number of seconds between refreshes while nothing is changing
+        """
         super().__init__(
             hass,
             _LOGGER,
@@ -795,16 +2085,187 @@ class ACInfinityDataUpdateCoordinator(DataUpdateCoordinator):
         )
 
         self._ac_infinity = service
+        self._ac_infinity.add_listener(self.async_update_device_listeners)
+        self._snapshot_store = snapshot_store
+        self._max_staleness = max_staleness
+        self._settings_polling_interval = settings_polling_interval
+        self._min_polling_interval = min(min_polling_interval, polling_interval)
+        self._max_polling_interval = max(max_polling_interval, polling_interval)
+        self._polling_interval = polling_interval
+
+        # outcome of each of the last refreshes, true if it succeeded
+        self._refresh_outcomes: deque[bool] = deque(maxlen=ERROR_RATE_WINDOW)
+        self._consecutive_failures = 0
+
+        # generation of the values last persisted to the snapshot store
+        self._saved_generation: int | None = None
+
+    async def async_load_snapshot(self) -> bool:
+        """Serve the data persisted by a previous run until the first refresh completes.
+        Returns true if a snapshot was loaded, otherwise a first refresh is still required before entities can be set up.
+        """
+        if self._snapshot_store is None:
+            return False
+
+        try:
+            snapshot = await self._snapshot_store.async_load()
+        except Exception as ex:
+            _LOGGER.warning("Unable to load the persisted AC Infinity snapshot", exc_info=ex)
+            return False
+
+        if not snapshot or not self._ac_infinity.load_snapshot(snapshot):
+            return False
+
+        _LOGGER.debug("Loaded persisted snapshot; serving stale data until the first refresh completes")
+        self.async_set_updated_data(self._ac_infinity)
+        return True
+
+    async def async_flush_snapshot(self) -> None:
+        """Write a snapshot waiting out the save delay right away. Called on unload, before the service is closed and
+        its values are gone, so the delayed save neither persists an empty snapshot nor outlives the config entry."""
+        if self._snapshot_store is None or self._saved_generation is None:
+            return
+
+        try:
+            await self._snapshot_store.async_save(self._ac_infinity.export_snapshot())
+        except Exception as ex:
+            _LOGGER.warning("Unable to persist the AC Infinity snapshot", exc_info=ex)
 
     async def _async_update_data(self):
         """Fetch data from the AC Infinity API"""
         _LOGGER.debug("Refreshing data from data update coordinator")
         try:
-            async with async_timeout.timeout(10):
-                await self._ac_infinity.refresh()
-                return self._ac_infinity
+            # sensor readings come with the controller properties on every refresh; mode settings rarely change,
+            # so they are only read again once they are older than the settings polling interval
+            # ports no enabled entity reads the settings of are left out altogether
+            await self._ac_infinity.refresh(
+                ACInfinityDeadline(DEFAULT_REFRESH_DEADLINE),
+                self._settings_polling_interval,
+                partial(settings_needed_fn, self.config_entry),
+            )
         except Exception as e:
-            raise UpdateFailed from e
+            # back off while the API keeps failing, rather than adding to an outage with requests bound to fail
+            self._refresh_outcomes.append(False)
+            self._consecutive_failures += 1
+            self.update_interval = timedelta(seconds=min(
+                self._polling_interval * ERROR_BACKOFF_FACTOR ** self._consecutive_failures,
+                max(MAX_ERROR_BACKOFF_INTERVAL, self._polling_interval)
+            ))
+
+            # keep serving the last good values through short outages; entities expire individually via is_expired
+            last_updated = self._ac_infinity.last_updated_from_api
+            if last_updated is None or self.__get_age(last_updated) > self._max_staleness:
+                raise UpdateFailed from e
+
+            _LOGGER.log(
+                logging.WARNING if self._consecutive_failures == 1 else logging.DEBUG,
+                "Unable to refresh from the AC Infinity API; serving values last read at %s and retrying in %s seconds",
+                last_updated,
+                self.polling_interval,
+            )
+            return self._ac_infinity
+
+        self._refresh_outcomes.append(True)
+        if self._consecutive_failures:
+            # start over from the polling interval as soon as the API answers again
+            _LOGGER.info("Refreshed from the AC Infinity API again after %s failed attempts", self._consecutive_failures)
+            self._consecutive_failures = 0
+            self.update_interval = timedelta(seconds=self._polling_interval)
+
+        self.update_interval = timedelta(seconds=self.__get_next_polling_interval())
+        if self._snapshot_store is not None and self._ac_infinity.generation != self._saved_generation:
+            self._saved_generation = self._ac_infinity.generation
+            self._snapshot_store.async_delay_save(self._ac_infinity.export_snapshot, SNAPSHOT_SAVE_DELAY)
+
+        return self._ac_infinity
+
+    async def async_refresh_device(self, controller_id: str | int, device_port: int) -> None:
+        """Refresh a single port after writing to it, and update only the entities of that port.
+        Falls back to requesting a full refresh if the port could not be refreshed.
+
+        Args:
+            controller_id: the device id of the controller
+            device_port: the index of the port on the controller, or 0 for the controller
+        """
+        _LOGGER.debug("Refreshing port %s of controller %s from data update coordinator", device_port, controller_id)
+        try:
+            with ACInfinityDeadline(DEFAULT_REFRESH_DEADLINE):
+                await self._ac_infinity.refresh_device(controller_id, device_port)
+        except Exception as ex:
+            _LOGGER.warning("Unable to refresh port %s of controller %s; requesting a full refresh", device_port, controller_id, exc_info=ex)
+            await self.async_request_refresh()
+            return
+
+        self.async_update_device_listeners(controller_id, device_port)
+
+    def is_expired(self, controller_id: str | int, device_port: int) -> bool:
+        """Returns true if the values of a controller or port are stale, and were last read from the API longer than the
+        max staleness ago
+
+        Args:
+            controller_id: the device id of the controller
+            device_port: the index of the port on the controller, or 0 for the controller and its sensors
+        """
+        if not self._ac_infinity.get_is_stale(controller_id):
+            return False
+
+        last_updated = self._ac_infinity.get_last_updated_from_api(controller_id, device_port)
+        return last_updated is not None and self.__get_age(last_updated) > self._max_staleness
+
+    def __get_next_polling_interval(self) -> float:
+        """Picks the number of seconds until the next refresh from what the last one saw. The interval is halved while
+        ports are changing, and otherwise backs off towards the max polling interval. Ports in auto or vpd mode can
+        switch at any moment, so they hold it at the polling interval, as do ports still waiting on their first read; a
+        timer or cycle about to switch modes brings the next refresh forward to just after it does. While the request
+        budget runs low, it backs off regardless."""
+        interval = self.update_interval.total_seconds()
+        if self._ac_infinity.request_budget_remaining < LOW_REQUEST_BUDGET:
+            # the request budget is nearly used up; back off regardless, leaving what is left to writes
+            return min(max(interval, self._polling_interval) * ADAPTIVE_POLLING_BACKOFF, self._max_polling_interval)
+
+        if self._ac_infinity.last_refresh_changes:
+            interval /= 2
+        else:
+            interval *= ADAPTIVE_POLLING_BACKOFF
+
+        if self._ac_infinity.awaiting_first_read or self._ac_infinity.get_any_port_in_mode(AtType.AUTO, AtType.VPD):
+            interval = min(interval, self._polling_interval)
+
+        next_transition = self._ac_infinity.get_next_transition()
+        if next_transition is not None:
+            interval = min(interval, next_transition + 1)
+
+        return max(self._min_polling_interval, min(interval, self._max_polling_interval))
+
+    @property
+    def polling_interval(self) -> float:
+        """The number of seconds until the next refresh, as last picked by the adaptive schedule or the error backoff"""
+        return self.update_interval.total_seconds()
+
+    @property
+    def error_rate(self) -> float:
+        """The part of the last refreshes that failed, from 0 to 1"""
+        if not self._refresh_outcomes:
+            return 0.0
+
+        return self._refresh_outcomes.count(False) / len(self._refresh_outcomes)
+
+    @staticmethod
+    def __get_age(last_updated: datetime) -> float:
+        return (dt_util.utcnow() - last_updated).total_seconds()
+
+    @callback
+    def async_update_device_listeners(self, controller_id: str | int, device_port: int) -> None:
+        """Update the listeners whose context is the given port
+
+        Args:
+            controller_id: the device id of the controller
+            device_port: the index of the port on the controller, or 0 for the controller
+        """
+        context = (str(controller_id), device_port)
+        for update_callback, listener_context in list(self._listeners.values()):
+            if listener_context == context:
+                update_callback()
 
     @property
     def ac_infinity(self) -> ACInfinityService:
@@ -818,13 +2279,27 @@ class ACInfinityEntity(CoordinatorEntity[ACInfinityDataUpdateCoordinator], ABC):
     translation_key: str
 
     def __init__(
-        self, coordinator: ACInfinityDataUpdateCoordinator, platform: str, data_key: str
+        self,
+        coordinator: ACInfinityDataUpdateCoordinator,
+        platform: str,
+        data_key: str,
+        context: tuple[str, int] | None = None,
     ):
-        super().__init__(coordinator)
+        """
+        Args:
+            coordinator: the data update coordinator for the config entry
+            platform: the platform the entity belongs to
+            data_key: the json field name of the data the entity tracks
+            context: the (controller id, port) the entity belongs to, used to update only its port after a write
+        """
+        super().__init__(coordinator, context)
         self._platform_name = platform
         self._data_key = data_key
         self._attr_device_info = None  # Will be set by subclasses
 
+        # generation, availability and stale attributes the state of the entity was last written with
+        self._written_state: tuple | None = None
+
     def __repr__(self):
         return f"<ACInfinityEntity unique_id={self.unique_id}>"
 
@@ -861,6 +2336,50 @@ class ACInfinityEntity(CoordinatorEntity[ACInfinityDataUpdateCoordinator], ABC):
     def platform_name(self) -> str:
         return self._platform_name
 
+    @property
+    def api_source(self) -> tuple[str, int] | None:
+        """The (controller id, port) the values of the entity are read from the API with; port 0 for the controller"""
+        return self.coordinator_context
+
+    @property
+    def awaiting_first_read(self) -> bool:
+        """Returns true while the controls and settings the entity may be read from were not read yet"""
+        source = self.api_source
+        return source is not None and self.ac_infinity.get_is_awaiting_first_read(*source)
+
+    @property
+    def last_updated_from_api(self) -> datetime | None:
+        """When the values of the entity were last read from the AC Infinity API, if known"""
+        source = self.api_source
+        return self.ac_infinity.get_last_updated_from_api(*source) if source is not None else None
+
+    @property
+    def available(self) -> bool:
+        """Returns true unless the last good values of the entity are stale past the max staleness"""
+        source = self.api_source
+        return super().available and (source is None or not self.coordinator.is_expired(*source))
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Writes the state of the entity, unless neither the values it is read from nor their staleness changed since
+        it was last written. Diagnostic entities report on the refreshes themselves and are always written."""
+        written_state = (self.ac_infinity.generation, self.available, self.extra_state_attributes)
+        if self.entity_category != EntityCategory.DIAGNOSTIC and written_state == self._written_state:
+            return
+
+        self._written_state = written_state
+        super()._handle_coordinator_update()
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """While stale values are served, flags them as stale along with when they were last read from the API.
+        Both are left out otherwise, so that successful refreshes don't change the attributes of every entity."""
+        source = self.api_source
+        if not (self.ac_infinity.get_is_stale(source[0]) if source is not None else self.ac_infinity.is_stale):
+            return None
+
+        return {"stale": True, "last_updated_from_api": self.last_updated_from_api}
+
 
 class ACInfinityControllerEntity(ACInfinityEntity):
     def __init__(
@@ -872,7 +2391,7 @@ class ACInfinityControllerEntity(ACInfinityEntity):
         data_key: str,
         platform: str,
     ):
-        super().__init__(coordinator, platform, data_key)
+        super().__init__(coordinator, platform, data_key, (str(controller.controller_id), 0))
         self._controller = controller
         self._enabled_fn = enabled_fn
         self._suitable_fn = suitable_fn
@@ -930,6 +2449,10 @@ class ACInfinitySensorEntity(ACInfinityEntity):
     def sensor(self) -> ACInfinitySensor:
         return self._sensor
 
+    @property
+    def api_source(self) -> tuple[str, int] | None:
+        return str(self._sensor.controller.controller_id), 0
+
     def is_enabled(self, entry: ConfigEntry) -> bool:
         return self._enabled_fn(entry, str(self._sensor.controller.controller_id), "sensors")
 
@@ -961,7 +2484,7 @@ class ACInfinityDeviceEntity(ACInfinityEntity):
         data_key: str,
         platform: str,
     ):
-        super().__init__(coordinator, platform, data_key)
+        super().__init__(coordinator, platform, data_key, (str(device.controller.controller_id), device.device_port))
         self._device = device
         self._enabled_fn = enabled_fn
         self._suitable_fn = suitable_fn
@@ -1020,6 +2543,8 @@ class ACInfinityDeviceEntity(ACInfinityEntity):
 class ACInfinityBaseMixin:
     enabled_fn: Callable[[ConfigEntry, str, str], bool]
     """ output if the entity is enabled via option flow"""
+    data_keys: tuple[str, ...] = field(default=(), kw_only=True)
+    """json field names of the controller, port or sensor properties read besides the key of the description"""
 
 
 @dataclass(frozen=True)
@@ -1071,6 +2596,7 @@ class ACInfinityEntities(list[ACInfinityEntity]):
     def __init__(self, config: ConfigEntry):
         super().__init__()
         self._config_entry = config
+        self._awaiting_first_read: list[ACInfinityEntity] = []
 
     def append_if_suitable(self, entity: ACInfinityEntity):
 
@@ -1083,6 +2609,14 @@ class ACInfinityEntities(list[ACInfinityEntity]):
                     entity.translation_key,
                     entity.platform_name,
                 )
+            elif entity.awaiting_first_read:
+                self._awaiting_first_read.append(entity)
+                _LOGGER.debug(
+                    'Deferring entity "%s" (%s) for platform "%s". (Waiting on the first read of its port)',
+                    entity.unique_id,
+                    entity.translation_key,
+                    entity.platform_name,
+                )
             else:
                 _LOGGER.debug(
                     'Ignoring unsuitable entity "%s" (%s) for platform "%s". (Not applicable for device)',
@@ -1098,6 +2632,33 @@ class ACInfinityEntities(list[ACInfinityEntity]):
                 entity.platform_name,
             )
 
+    @callback
+    def async_add(self, coordinator: ACInfinityDataUpdateCoordinator, add_entities_callback: AddEntitiesCallback) -> None:
+        """Adds the suitable entities, then those deferred until the first read of their port as each read lands
+
+        Args:
+            coordinator: the coordinator whose refreshes read the ports
+            add_entities_callback: the callback of the platform the entities belong to
+        """
+        add_entities_callback(self)
+        if not self._awaiting_first_read:
+            return
+
+        @callback
+        def add_read_entities() -> None:
+            read = [entity for entity in self._awaiting_first_read if not entity.awaiting_first_read]
+            if not read:
+                return
+
+            self._awaiting_first_read = [entity for entity in self._awaiting_first_read if entity.awaiting_first_read]
+            entities = ACInfinityEntities(self._config_entry)
+            for entity in read:
+                entities.append_if_suitable(entity)
+            if entities:
+                add_entities_callback(entities)
+
+        self._config_entry.async_on_unload(coordinator.async_add_listener(add_read_entities))
+
 
 def _get_entity_config_setting(entry: ConfigEntry, device_id: str, entity_config_key: str) -> str | None:
     """Safely get the entity config setting, returning None if not found."""
@@ -1136,3 +2697,15 @@ def enabled_fn_setting(entry: ConfigEntry, device_id: str, entity_config_key: st
         return False  # Default to disabled if config is missing
     return setting == EntityConfigValue.All or setting == EntityConfigValue.SensorsAndSettings
 
+
+def settings_needed_fn(entry: ConfigEntry, device_id: str, device_port: int) -> bool:
+    """Check if any enabled entity reads the settings of the given device/port (0 for the controller). Sensor entities of
+    a port read its mode settings, while only setting entities read those of the controller. Devices missing from the
+    entity configuration are read, as they are configured from what the refresh finds."""
+    entity_config_key = f"port_{device_port}" if device_port else "controller"
+    setting = _get_entity_config_setting(entry, device_id, entity_config_key)
+    if setting is None:
+        return True
+    if device_port == 0:
+        return enabled_fn_setting(entry, device_id, entity_config_key)
+    return enabled_fn_sensor(entry, device_id, entity_config_key)
@@ -0,0 +1,44 @@
+"""Diagnostics support for AC Infinity."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, ControllerPropertyKey
+from .core import ACInfinityDataUpdateCoordinator
+
+TO_REDACT = {CONF_EMAIL, CONF_PASSWORD, ControllerPropertyKey.MAC_ADDR, "appEmail", "wifiName"}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry, including the counters of the calls made to the AC Infinity API."""
+    coordinator: ACInfinityDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    ac_infinity = coordinator.ac_infinity
+    last_updated_from_api = ac_infinity.last_updated_from_api
+
+    diagnostics = {
+        "entry": async_redact_data(entry.data, TO_REDACT),
+        "requests": {
+            **ac_infinity.request_stats,
+            "request_budget_remaining": ac_infinity.request_budget_remaining,
+        },
+        "refresh": {
+            "polling_interval": coordinator.polling_interval,
+            "error_rate": coordinator.error_rate,
+            "last_refresh_duration": ac_infinity.last_refresh_duration,
+            "last_refresh_complete": ac_infinity.last_refresh_complete,
+            "last_updated_from_api": last_updated_from_api.isoformat() if last_updated_from_api else None,
+            "is_stale": ac_infinity.is_stale,
+            "stale_controllers": sorted(ac_infinity.stale_controllers),
+        },
+    }
+
+    if ac_infinity.raw_payload is not None:
+        diagnostics["raw_payload"] = async_redact_data(ac_infinity.raw_payload, TO_REDACT)
+
+    return diagnostics
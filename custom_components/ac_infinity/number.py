@@ -968,7 +968,7 @@ class ACInfinityControllerNumberEntity(ACInfinityControllerEntity, NumberEntity)
             'User requesting value update of entity "%s" to "%s"', self.unique_id, value
         )
         await self.entity_description.set_value_fn(self, self.controller, value)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_refresh_device(self.controller.controller_id, 0)
 
 
 class ACInfinityDeviceNumberEntity(ACInfinityDeviceEntity, NumberEntity):
@@ -995,7 +995,7 @@ class ACInfinityDeviceNumberEntity(ACInfinityDeviceEntity, NumberEntity):
             'User requesting value update of entity "%s" to "%s"', self.unique_id, value
         )
         await self.entity_description.set_value_fn(self, self.device_port, value)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_refresh_device(self.device_port.controller.controller_id, self.device_port.device_port)
 
 
 async def async_setup_entry(
@@ -1024,4 +1024,4 @@ async def async_setup_entry(
 
                 entities.append_if_suitable(device_entity)
 
-    add_entities_callback(entities)
+    entities.async_add(coordinator, add_entities_callback)
@@ -346,7 +346,7 @@ class ACInfinityControllerSelectEntity(ACInfinityControllerEntity, SelectEntity)
             option,
         )
         await self.entity_description.set_value_fn(self, self.controller, option)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_refresh_device(self.controller.controller_id, 0)
 
 
 class ACInfinityDeviceSelectEntity(ACInfinityDeviceEntity, SelectEntity):
@@ -373,7 +373,7 @@ class ACInfinityDeviceSelectEntity(ACInfinityDeviceEntity, SelectEntity):
             option,
         )
         await self.entity_description.set_value_fn(self, self.device_port, option)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_refresh_device(self.device_port.controller.controller_id, self.device_port.device_port)
 
 
 async def async_setup_entry(
@@ -401,4 +401,4 @@ async def async_setup_entry(
                 )
                 entities.append_if_suitable(device_entity)
 
-    add_entities_callback(entities)
+    entities.async_add(coordinator, add_entities_callback)
@@ -17,6 +17,7 @@ from homeassistant.const import (
     Platform,
     UnitOfPressure,
     UnitOfTemperature,
+    EntityCategory,
     UnitOfTime,
 )
 from homeassistant.core import HomeAssistant
@@ -40,7 +41,10 @@ from custom_components.ac_infinity.core import (
 from .const import (
     DOMAIN,
     ISSUE_URL,
+    SENSOR_TEMPERATURE_KEYS,
+    SENSOR_VALUE_KEYS,
     ControllerPropertyKey,
+    CustomControllerPropertyKey,
     CustomDevicePropertyKey,
     DevicePropertyKey,
     DeviceControlKey,
@@ -234,6 +238,20 @@ def __get_next_mode_change_timestamp(
     return datetime.now(ZoneInfo(timezone)) + timedelta(seconds=remaining_seconds)
 
 
+def __get_value_fn_polling_interval(entity: ACInfinityEntity, controller: ACInfinityController):
+    return entity.coordinator.polling_interval
+
+
+def __suitable_fn_first_controller(entity: ACInfinityEntity, controller: ACInfinityController):
+    # account-wide values are reported once, on the first controller of the account
+    controllers = entity.ac_infinity.get_all_controller_properties()
+    return bool(controllers) and controllers[0].controller_id == controller.controller_id
+
+
+def __get_value_fn_refresh_error_rate(entity: ACInfinityEntity, controller: ACInfinityController):
+    return round(entity.coordinator.error_rate * 100)
+
+
 CONTROLLER_DESCRIPTIONS: list[ACInfinityControllerSensorEntityDescription] = [
     ACInfinityControllerSensorEntityDescription(
         key=ControllerPropertyKey.TEMPERATURE,
@@ -271,6 +289,32 @@ CONTROLLER_DESCRIPTIONS: list[ACInfinityControllerSensorEntityDescription] = [
         suitable_fn=__suitable_fn_controller_property_default,
         get_value_fn=__get_value_fn_floating_point_as_int,
     ),
+    ACInfinityControllerSensorEntityDescription(
+        key=CustomControllerPropertyKey.POLLING_INTERVAL,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_unit_of_measurement=None,
+        icon="mdi:timer-sync-outline",
+        translation_key="polling_interval",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        enabled_fn=enabled_fn_sensor,
+        suitable_fn=__suitable_fn_first_controller,
+        get_value_fn=__get_value_fn_polling_interval,
+    ),
+    ACInfinityControllerSensorEntityDescription(
+        key=CustomControllerPropertyKey.REFRESH_ERROR_RATE,
+        device_class=None,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_unit_of_measurement=None,
+        icon="mdi:cloud-alert-outline",
+        translation_key="refresh_error_rate",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        enabled_fn=enabled_fn_sensor,
+        suitable_fn=__suitable_fn_first_controller,
+        get_value_fn=__get_value_fn_refresh_error_rate,
+    ),
 ]
 
 SENSOR_DESCRIPTIONS: dict[int, ACInfinitySensorSensorEntityDescription] = {
@@ -285,6 +329,7 @@ SENSOR_DESCRIPTIONS: dict[int, ACInfinitySensorSensorEntityDescription] = {
         enabled_fn=enabled_fn_sensor,
         suitable_fn=__suitable_fn_sensor_temperature,
         get_value_fn=__get_value_fn_sensor_value_temperature,
+        data_keys=SENSOR_TEMPERATURE_KEYS,
     ),
     SensorType.PROBE_TEMPERATURE_C: ACInfinitySensorSensorEntityDescription(
         key=SensorReferenceKey.PROBE_TEMPERATURE,
@@ -297,6 +342,7 @@ SENSOR_DESCRIPTIONS: dict[int, ACInfinitySensorSensorEntityDescription] = {
         enabled_fn=enabled_fn_sensor,
         suitable_fn=__suitable_fn_sensor_temperature,
         get_value_fn=__get_value_fn_sensor_value_temperature,
+        data_keys=SENSOR_TEMPERATURE_KEYS,
     ),
     SensorType.PROBE_HUMIDITY: ACInfinitySensorSensorEntityDescription(
         key=SensorReferenceKey.PROBE_HUMIDITY,
@@ -309,6 +355,7 @@ SENSOR_DESCRIPTIONS: dict[int, ACInfinitySensorSensorEntityDescription] = {
         enabled_fn=enabled_fn_sensor,
         suitable_fn=__suitable_fn_sensor_default,
         get_value_fn=__get_value_fn_sensor_value_default,
+        data_keys=SENSOR_VALUE_KEYS,
     ),
     SensorType.PROBE_VPD: ACInfinitySensorSensorEntityDescription(
         key=SensorReferenceKey.PROBE_VPD,
@@ -321,6 +368,7 @@ SENSOR_DESCRIPTIONS: dict[int, ACInfinitySensorSensorEntityDescription] = {
         enabled_fn=enabled_fn_sensor,
         suitable_fn=__suitable_fn_sensor_default,
         get_value_fn=__get_value_fn_sensor_value_default,
+        data_keys=SENSOR_VALUE_KEYS,
     ),
     SensorType.CONTROLLER_TEMPERATURE_F: ACInfinitySensorSensorEntityDescription(
         key=SensorReferenceKey.CONTROLLER_TEMPERATURE,
@@ -333,6 +381,7 @@ SENSOR_DESCRIPTIONS: dict[int, ACInfinitySensorSensorEntityDescription] = {
         enabled_fn=enabled_fn_sensor,
         suitable_fn=__suitable_fn_sensor_temperature,
         get_value_fn=__get_value_fn_sensor_value_temperature,
+        data_keys=SENSOR_TEMPERATURE_KEYS,
     ),
     SensorType.CONTROLLER_TEMPERATURE_C: ACInfinitySensorSensorEntityDescription(
         key=SensorReferenceKey.CONTROLLER_TEMPERATURE,
@@ -345,6 +394,7 @@ SENSOR_DESCRIPTIONS: dict[int, ACInfinitySensorSensorEntityDescription] = {
         enabled_fn=enabled_fn_sensor,
         suitable_fn=__suitable_fn_sensor_temperature,
         get_value_fn=__get_value_fn_sensor_value_temperature,
+        data_keys=SENSOR_TEMPERATURE_KEYS,
     ),
     SensorType.CONTROLLER_HUMIDITY: ACInfinitySensorSensorEntityDescription(
         key=SensorReferenceKey.CONTROLLER_HUMIDITY,
@@ -357,6 +407,7 @@ SENSOR_DESCRIPTIONS: dict[int, ACInfinitySensorSensorEntityDescription] = {
         enabled_fn=enabled_fn_sensor,
         suitable_fn=__suitable_fn_sensor_default,
         get_value_fn=__get_value_fn_sensor_value_default,
+        data_keys=SENSOR_VALUE_KEYS,
     ),
     SensorType.CONTROLLER_VPD: ACInfinitySensorSensorEntityDescription(
         key=SensorReferenceKey.CONTROLLER_VPD,
@@ -369,6 +420,7 @@ SENSOR_DESCRIPTIONS: dict[int, ACInfinitySensorSensorEntityDescription] = {
         enabled_fn=enabled_fn_sensor,
         suitable_fn=__suitable_fn_sensor_default,
         get_value_fn=__get_value_fn_sensor_value_default,
+        data_keys=SENSOR_VALUE_KEYS,
     ),
     SensorType.CO2: ACInfinitySensorSensorEntityDescription(
         key=SensorReferenceKey.CO2_SENSOR,
@@ -381,6 +433,7 @@ SENSOR_DESCRIPTIONS: dict[int, ACInfinitySensorSensorEntityDescription] = {
         enabled_fn=enabled_fn_sensor,
         suitable_fn=__suitable_fn_sensor_default,
         get_value_fn=__get_value_fn_sensor_value_default,
+        data_keys=SENSOR_VALUE_KEYS,
     ),
     SensorType.LIGHT: ACInfinitySensorSensorEntityDescription(
         key=SensorReferenceKey.LIGHT_SENSOR,
@@ -393,6 +446,7 @@ SENSOR_DESCRIPTIONS: dict[int, ACInfinitySensorSensorEntityDescription] = {
         enabled_fn=enabled_fn_sensor,
         suitable_fn=__suitable_fn_sensor_default,
         get_value_fn=__get_value_fn_sensor_value_default,
+        data_keys=SENSOR_VALUE_KEYS,
     ),
     SensorType.SOIL: ACInfinitySensorSensorEntityDescription(
         key=SensorReferenceKey.SOIL,
@@ -405,6 +459,7 @@ SENSOR_DESCRIPTIONS: dict[int, ACInfinitySensorSensorEntityDescription] = {
         enabled_fn=enabled_fn_sensor,
         suitable_fn=__suitable_fn_sensor_default,
         get_value_fn=__get_value_fn_sensor_value_default,
+        data_keys=SENSOR_VALUE_KEYS,
     ),
     SensorType.WATER_TEMP_F: ACInfinitySensorSensorEntityDescription(
         key=SensorReferenceKey.WATER_TEMP,
@@ -417,6 +472,7 @@ SENSOR_DESCRIPTIONS: dict[int, ACInfinitySensorSensorEntityDescription] = {
         enabled_fn=enabled_fn_sensor,
         suitable_fn=__suitable_fn_sensor_temperature,
         get_value_fn=__get_value_fn_sensor_value_temperature,
+        data_keys=SENSOR_TEMPERATURE_KEYS,
     ),
     SensorType.WATER_TEMP_C: ACInfinitySensorSensorEntityDescription(
         key=SensorReferenceKey.WATER_TEMP,
@@ -429,6 +485,7 @@ SENSOR_DESCRIPTIONS: dict[int, ACInfinitySensorSensorEntityDescription] = {
         enabled_fn=enabled_fn_sensor,
         suitable_fn=__suitable_fn_sensor_temperature,
         get_value_fn=__get_value_fn_sensor_value_temperature,
+        data_keys=SENSOR_TEMPERATURE_KEYS,
     ),
     SensorType.PH: ACInfinitySensorSensorEntityDescription(
         key=SensorReferenceKey.PH_SENSOR,
@@ -441,6 +498,7 @@ SENSOR_DESCRIPTIONS: dict[int, ACInfinitySensorSensorEntityDescription] = {
         enabled_fn=enabled_fn_sensor,
         suitable_fn=__suitable_fn_sensor_default,
         get_value_fn=__get_value_fn_sensor_value_default,
+        data_keys=SENSOR_VALUE_KEYS,
     ),
     SensorType.EC: ACInfinitySensorSensorEntityDescription(
         key=SensorReferenceKey.EC_SENSOR,
@@ -453,6 +511,7 @@ SENSOR_DESCRIPTIONS: dict[int, ACInfinitySensorSensorEntityDescription] = {
         enabled_fn=enabled_fn_sensor,
         suitable_fn=__suitable_fn_sensor_default,
         get_value_fn=__get_value_fn_sensor_value_default,
+        data_keys=SENSOR_VALUE_KEYS,
     ),
     SensorType.TDS: ACInfinitySensorSensorEntityDescription(
         key=SensorReferenceKey.TDS_SENSOR,
@@ -465,6 +524,7 @@ SENSOR_DESCRIPTIONS: dict[int, ACInfinitySensorSensorEntityDescription] = {
         enabled_fn=enabled_fn_sensor,
         suitable_fn=__suitable_fn_sensor_default,
         get_value_fn=__get_value_fn_sensor_value_default,
+        data_keys=SENSOR_VALUE_KEYS,
     ),
 }
 
@@ -580,6 +640,7 @@ DEVICE_DESCRIPTIONS: list[ACInfinityDeviceSensorEntityDescription] = [
         enabled_fn=enabled_fn_sensor,
         suitable_fn=lambda x, y: True,
         get_value_fn=__get_value_fn_port_is_active,
+        data_keys=(DevicePropertyKey.ONLINE,),
     ),
     ACInfinityDeviceSensorEntityDescription(
         key=CustomDevicePropertyKey.CONNECTED_DEVICE_TYPE,
@@ -653,6 +714,7 @@ DEVICE_DESCRIPTIONS: list[ACInfinityDeviceSensorEntityDescription] = [
         enabled_fn=enabled_fn_sensor,
         suitable_fn=lambda x, y: True,
         get_value_fn=__get_next_mode_change_timestamp,
+        data_keys=(DevicePropertyKey.REMAINING_TIME, ControllerPropertyKey.TIME_ZONE),
     ),
     # Temperature Automation Sensors
     ACInfinityDeviceSensorEntityDescription(
@@ -949,6 +1011,11 @@ class ACInfinityControllerSensorEntity(ACInfinityControllerEntity, SensorEntity)
         )
         self.entity_description = description
 
+    @property
+    def available(self) -> bool:
+        # diagnostics of the refreshes themselves stay available while the refreshes fail
+        return self.entity_description.entity_category == EntityCategory.DIAGNOSTIC or super().available
+
     @property
     def native_value(self) -> StateType | date | datetime | Decimal:
         return self.entity_description.get_value_fn(self, self.controller)
@@ -1037,4 +1104,4 @@ async def async_setup_entry(
                 )
                 entities.append_if_suitable(device_entity)
 
-    add_entities_callback(entities)
+    entities.async_add(coordinator, add_entities_callback)
@@ -299,7 +299,7 @@ class ACInfinityDeviceSwitchEntity(ACInfinityDeviceEntity, SwitchEntity):
         await self.entity_description.set_value_fn(
             self, self.device_port, self.entity_description.on_value
         )
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_refresh_device(self.device_port.controller.controller_id, self.device_port.device_port)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         _LOGGER.info(
@@ -308,7 +308,7 @@ class ACInfinityDeviceSwitchEntity(ACInfinityDeviceEntity, SwitchEntity):
         await self.entity_description.set_value_fn(
             self, self.device_port, self.entity_description.off_value
         )
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_refresh_device(self.device_port.controller.controller_id, self.device_port.device_port)
 
 
 async def async_setup_entry(
@@ -327,4 +327,4 @@ async def async_setup_entry(
                 entity = ACInfinityDeviceSwitchEntity(coordinator, description, device)
                 entities.append_if_suitable(entity)
 
-    add_entities_callback(entities)
+    entities.async_add(coordinator, add_entities_callback)
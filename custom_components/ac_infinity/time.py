@@ -133,7 +133,7 @@ class ACInfinityDeviceTimeEntity(ACInfinityDeviceEntity, TimeEntity):
             'User requesting value update of entity "%s" to "%s"', self.unique_id, value
         )
         await self.entity_description.set_value_fn(self, self.device_port, value)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_refresh_device(self.device_port.controller.controller_id, self.device_port.device_port)
 
 
 async def async_setup_entry(
@@ -154,4 +154,4 @@ async def async_setup_entry(
                     ACInfinityDeviceTimeEntity(coordinator, description, device)
                 )
 
-    add_entities_callback(entities)
+    entities.async_add(coordinator, add_entities_callback)
@@ -140,6 +140,25 @@ async def execute_and_get_sensor_entity(
     return entity
 
 
+def publish(ac_infinity: ACInfinityService, **stores) -> None:
+    """Replaces the given stores of the service at once, in a single generation, as a refresh publishes them"""
+    ac_infinity._publish(**stores)
+
+
+def republish(ac_infinity: ACInfinityService) -> None:
+    """Publishes the values of the service again after a test changed their json in place, so that the records its
+    getters read are rebuilt from them"""
+    snapshot = ac_infinity.snapshot
+    publish(
+        ac_infinity,
+        controller_properties=snapshot.controller_properties,
+        sensor_properties=snapshot.sensor_properties,
+        device_properties=snapshot.device_properties,
+        device_controls=snapshot.device_controls,
+        device_settings=snapshot.device_settings,
+    )
+
+
 def setup_entity_mocks(mocker: MockFixture):
     future: Future = asyncio.Future()
     future.set_result(None)
@@ -153,11 +172,14 @@ def setup_entity_mocks(mocker: MockFixture):
     client = ACInfinityClient(HOST, EMAIL, PASSWORD)
     ac_infinity = ACInfinityService(client)
 
-    ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-    ac_infinity._device_settings = DEVICE_SETTINGS_DATA
-    ac_infinity._sensor_properties = SENSOR_PROPERTIES_DATA
-    ac_infinity._device_properties = DEVICE_PROPERTIES_DATA
-    ac_infinity._device_controls = DEVICE_CONTROLS_DATA
+    publish(
+        ac_infinity,
+        controller_properties=CONTROLLER_PROPERTIES_DATA,
+        device_settings=DEVICE_SETTINGS_DATA,
+        sensor_properties=SENSOR_PROPERTIES_DATA,
+        device_properties=DEVICE_PROPERTIES_DATA,
+        device_controls=DEVICE_CONTROLS_DATA,
+    )
 
     config_entry = ConfigEntry(
         entry_id=ENTRY_ID,
@@ -194,7 +216,7 @@ def setup_entity_mocks(mocker: MockFixture):
         ac_infinity, "update_device_settings", return_value=future
     )
     refresh_mock = mocker.patch.object(
-        coordinator, "async_request_refresh", return_value=future
+        coordinator, "async_refresh_device", return_value=future
     )
 
     hass.data = HassDict({DOMAIN: {ENTRY_ID: coordinator}})
@@ -0,0 +1,93 @@
+"""Measures the throughput of the ACInfinityService getters that entities read on every update, against the nested
+lookups they replaced. Not collected by pytest; run with `python -m tests.benchmark_getters`."""
+
+import timeit
+from unittest.mock import MagicMock
+
+from custom_components.ac_infinity.client import ACInfinityClient
+from custom_components.ac_infinity.const import (
+    AdvancedSettingsKey,
+    ControllerPropertyKey,
+    DeviceControlKey,
+)
+from custom_components.ac_infinity.core import ACInfinityService
+from tests import publish
+from tests.data_models import (
+    CONTROLLER_PROPERTIES_DATA,
+    DEVICE_CONTROLS_DATA,
+    DEVICE_ID,
+    DEVICE_PROPERTIES_DATA,
+    DEVICE_SETTINGS_DATA,
+)
+
+NUMBER = 200_000
+
+
+def nested_get_controller_property(service: ACInfinityService, controller_id, property_key, default_value=None):
+    """the lookups get_controller_property made before values were flattened into records"""
+    normalized_id = str(controller_id)
+    if normalized_id in service.snapshot.controller_properties:
+        result = service.snapshot.controller_properties[normalized_id]
+        if property_key in result:
+            value = result[property_key]
+            return value if value is not None else default_value
+        elif property_key in result[ControllerPropertyKey.DEVICE_INFO]:
+            value = result[ControllerPropertyKey.DEVICE_INFO][property_key]
+            return value if value is not None else default_value
+
+    return default_value
+
+
+def nested_get_device_control(service: ACInfinityService, controller_id, device_port, setting_key, default_value=None):
+    """the lookups get_device_control made before values were flattened into records"""
+    normalized_id = (str(controller_id), device_port)
+    if normalized_id in service.snapshot.device_controls:
+        result = service.snapshot.device_controls[normalized_id]
+        if setting_key in result:
+            value = result[setting_key]
+            return value if value is not None else default_value
+        elif setting_key in result[DeviceControlKey.DEV_SETTING]:
+            value = result[DeviceControlKey.DEV_SETTING][setting_key]
+            return value if value is not None else default_value
+
+    return default_value
+
+
+def main() -> None:
+    service = ACInfinityService(MagicMock(spec=ACInfinityClient))
+    publish(
+        service,
+        controller_properties=CONTROLLER_PROPERTIES_DATA,
+        device_properties=DEVICE_PROPERTIES_DATA,
+        device_controls=DEVICE_CONTROLS_DATA,
+        device_settings=DEVICE_SETTINGS_DATA,
+    )
+    controller_id = str(DEVICE_ID)
+
+    cases = [
+        (
+            "controller property (deviceInfo)",
+            lambda: nested_get_controller_property(service, controller_id, ControllerPropertyKey.TEMPERATURE),
+            lambda: service.get_controller_property(controller_id, ControllerPropertyKey.TEMPERATURE),
+        ),
+        (
+            "device control (top level)",
+            lambda: nested_get_device_control(service, controller_id, 1, DeviceControlKey.AT_TYPE),
+            lambda: service.get_device_control(controller_id, 1, DeviceControlKey.AT_TYPE),
+        ),
+        (
+            "device control (devSetting)",
+            lambda: nested_get_device_control(service, controller_id, 1, AdvancedSettingsKey.DEV_LIGHT),
+            lambda: service.get_device_control(controller_id, 1, AdvancedSettingsKey.DEV_LIGHT),
+        ),
+    ]
+
+    for name, before, after in cases:
+        assert before() == after()
+        before_rate = NUMBER / min(timeit.repeat(before, number=NUMBER, repeat=5))
+        after_rate = NUMBER / min(timeit.repeat(after, number=NUMBER, repeat=5))
+        print(f"{name:<34} nested {before_rate / 1e6:5.2f}M/s  records {after_rate / 1e6:5.2f}M/s  ({after_rate / before_rate:.2f}x)")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
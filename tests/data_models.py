@@ -272,7 +272,7 @@ SENSOR_PROPERTY_UNKNOWN = {
 }
 
 # noinspection SpellCheckingInspection
-CONTROLLER_PROPERTIES = {
+CONTROLLER_PROPERTIES: dict[str, Any] = {
     "devId": str(DEVICE_ID),
     "devCode": "ABCDEFG",
     "devName": DEVICE_NAME,
@@ -342,7 +342,7 @@ CONTROLLER_PROPERTIES = {
     "wifiName": None,
 }
 
-AI_CONTROLLER_PROPERTIES = {
+AI_CONTROLLER_PROPERTIES: dict[str, Any] = {
     "devId": str(AI_DEVICE_ID),
     "devCode": "ABCDEFG",
     "devName": DEVICE_NAME_AI,
@@ -433,7 +433,7 @@ AI_CONTROLLER_PROPERTIES = {
 }
 
 # noinspection SpellCheckingInspection
-DEVICE_CONTROLS = {
+DEVICE_CONTROLS: dict[str, Any] = {
     "modeSetid": str(MODE_SET_ID),
     "devId": str(DEVICE_ID),
     "externalPort": 4,
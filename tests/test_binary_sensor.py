@@ -28,6 +28,7 @@ from tests import (
     execute_and_get_controller_entity,
     execute_and_get_device_entity,
     execute_and_get_sensor_entity,
+    republish,
     setup_entity_mocks,
 )
 from tests.data_models import (
@@ -117,6 +118,7 @@ class TestBinarySensors:
         test_objects.ac_infinity._controller_properties[str(device_id)][
             ControllerPropertyKey.ONLINE
         ] = value
+        republish(test_objects.ac_infinity)
 
         sensor._handle_coordinator_update()
 
@@ -148,6 +150,7 @@ class TestBinarySensors:
         test_objects.ac_infinity._device_properties[(str(DEVICE_ID), port)][
             setting
         ] = value
+        republish(test_objects.ac_infinity)
 
         sensor._handle_coordinator_update()
 
@@ -1,13 +1,15 @@
 import asyncio
 import re
 import sys
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, call
 from urllib.parse import parse_qsl, unquote, urlparse
 
 import pytest
 from aioresponses import aioresponses
+from yarl import URL
 
 from custom_components.ac_infinity.client import (
+    API_AUTH_FAILURE_CODES,
     API_URL_ADD_DEV_MODE,
     API_URL_GET_DEV_MODE_SETTING,
     API_URL_GET_DEV_SETTING,
@@ -17,8 +19,11 @@ from custom_components.ac_infinity.client import (
     API_URL_UPDATE_ADV_SETTING,
     ACInfinityClient,
     ACInfinityClientCannotConnect,
+    ACInfinityClientDeadlineExceeded,
     ACInfinityClientInvalidAuth,
     ACInfinityClientRequestFailed,
+    ACInfinityDeadline,
+    ACInfinityRateLimiter,
 )
 from custom_components.ac_infinity.const import AdvancedSettingsKey, AtType, DeviceControlKey, ModeAndSettingKeys
 from tests.data_models import (
@@ -169,6 +174,157 @@ class TestACInfinityClient:
             with pytest.raises(ACInfinityClientRequestFailed):
                 await client.get_account_controllers()
 
+    @pytest.mark.parametrize("code", [400, 500])
+    async def test_post_request_failed_keeps_token_on_non_auth_failure(self, code):
+        """A request failing for reasons other than auth should not discard the token"""
+        listener = MagicMock()
+        client = ACInfinityClient(HOST, EMAIL, PASSWORD, token=USER_ID, token_listener=listener)
+        try:
+            with aioresponses() as mocked:
+                mocked.post(
+                    f"{HOST}{API_URL_GET_DEVICE_INFO_LIST_ALL}",
+                    status=200,
+                    payload={"msg": "error", "code": code},
+                )
+
+                with pytest.raises(ACInfinityClientRequestFailed):
+                    await client.get_account_controllers()
+
+            assert client.is_logged_in()
+            listener.assert_not_called()
+        finally:
+            await client.close()
+
+    @pytest.mark.parametrize("code", sorted(API_AUTH_FAILURE_CODES))
+    async def test_rejected_token_replaced_and_request_replayed(self, code):
+        """A request rejected for its token should log in again and be replayed once with the new token"""
+        listener = MagicMock()
+        client = ACInfinityClient(HOST, EMAIL, PASSWORD, token="expired-token", token_listener=listener)
+        try:
+            with aioresponses() as mocked:
+                mocked.post(
+                    f"{HOST}{API_URL_GET_DEVICE_INFO_LIST_ALL}",
+                    status=200,
+                    payload={"msg": "token expired", "code": code},
+                )
+                mocked.post(f"{HOST}{API_URL_LOGIN}", status=200, payload=LOGIN_PAYLOAD)
+                mocked.post(
+                    f"{HOST}{API_URL_GET_DEVICE_INFO_LIST_ALL}",
+                    status=200,
+                    payload=DEVICE_INFO_LIST_ALL_PAYLOAD,
+                )
+
+                result = await client.get_account_controllers()
+
+                assert result == DEVICE_INFO_LIST_ALL_PAYLOAD["data"]
+                sent = mocked.requests[("POST", URL(f"{HOST}{API_URL_GET_DEVICE_INFO_LIST_ALL}"))]
+                assert [request.kwargs["headers"]["token"] for request in sent] == ["expired-token", USER_ID]
+                listener.assert_called_once_with(USER_ID)
+        finally:
+            await client.close()
+
+    async def test_rejected_token_concurrent_requests_share_one_login(self):
+        """Concurrent requests rejected for the same token should wait on a single log in"""
+        client = ACInfinityClient(HOST, EMAIL, PASSWORD, token="expired-token")
+
+        async def slow_login(*args, **kwargs):
+            await asyncio.sleep(0.01)
+
+        try:
+            with aioresponses() as mocked:
+                for _ in range(3):
+                    mocked.post(
+                        f"{HOST}{API_URL_GET_DEVICE_INFO_LIST_ALL}",
+                        status=200,
+                        payload={"msg": "token expired", "code": 10001},
+                    )
+                mocked.post(f"{HOST}{API_URL_LOGIN}", status=200, payload=LOGIN_PAYLOAD, callback=slow_login, repeat=True)
+                mocked.post(
+                    f"{HOST}{API_URL_GET_DEVICE_INFO_LIST_ALL}",
+                    status=200,
+                    payload=DEVICE_INFO_LIST_ALL_PAYLOAD,
+                    repeat=True,
+                )
+
+                await asyncio.gather(*(client.get_account_controllers() for _ in range(3)))
+
+                assert len(mocked.requests[("POST", URL(f"{HOST}{API_URL_LOGIN}"))]) == 1
+        finally:
+            await client.close()
+
+    async def test_rejected_token_after_replay_discarded(self):
+        """A request rejected again after logging in should fail and discard the token so the next attempt starts fresh"""
+        listener = MagicMock()
+        client = ACInfinityClient(HOST, EMAIL, PASSWORD, token="expired-token", token_listener=listener)
+        try:
+            with aioresponses() as mocked:
+                mocked.post(
+                    f"{HOST}{API_URL_GET_DEVICE_INFO_LIST_ALL}",
+                    status=200,
+                    payload={"msg": "token expired", "code": 10001},
+                    repeat=True,
+                )
+                mocked.post(f"{HOST}{API_URL_LOGIN}", status=200, payload=LOGIN_PAYLOAD)
+
+                with pytest.raises(ACInfinityClientRequestFailed):
+                    await client.get_account_controllers()
+
+            assert not client.is_logged_in()
+            assert listener.call_args_list == [call(USER_ID), call(None)]
+        finally:
+            await client.close()
+
+    async def test_rejected_token_login_failure_raises_invalid_auth(self):
+        """If logging in again fails, the request should fail with an auth error"""
+        client = ACInfinityClient(HOST, EMAIL, PASSWORD, token="expired-token")
+        try:
+            with aioresponses() as mocked:
+                mocked.post(
+                    f"{HOST}{API_URL_GET_DEVICE_INFO_LIST_ALL}",
+                    status=200,
+                    payload={"msg": "token expired", "code": 10001},
+                )
+                mocked.post(f"{HOST}{API_URL_LOGIN}", status=200, payload={"msg": "bad password", "code": 500})
+
+                with pytest.raises(ACInfinityClientInvalidAuth):
+                    await client.get_account_controllers()
+        finally:
+            await client.close()
+
+    async def test_restored_token_used_without_logging_in(self):
+        """A token from a previous log in should be sent with requests without logging in again"""
+        client = ACInfinityClient(HOST, EMAIL, PASSWORD, token=USER_ID)
+        try:
+            with aioresponses() as mocked:
+                mocked.post(
+                    f"{HOST}{API_URL_GET_DEVICE_INFO_LIST_ALL}",
+                    status=200,
+                    payload=DEVICE_INFO_LIST_ALL_PAYLOAD,
+                )
+
+                assert client.is_logged_in()
+                await client.get_account_controllers()
+
+                (method, url), = mocked.requests.keys()
+                assert API_URL_LOGIN not in str(url)
+                assert mocked.requests[(method, url)][0].kwargs["headers"]["token"] == USER_ID
+        finally:
+            await client.close()
+
+    async def test_login_token_reported_to_listener(self):
+        """A token obtained by logging in should be reported so it can be persisted"""
+        listener = MagicMock()
+        client = ACInfinityClient(HOST, EMAIL, PASSWORD, token_listener=listener)
+        try:
+            with aioresponses() as mocked:
+                mocked.post(f"{HOST}{API_URL_LOGIN}", status=200, payload=LOGIN_PAYLOAD)
+                await client.login()
+
+            assert client.token == USER_ID
+            listener.assert_called_once_with(USER_ID)
+        finally:
+            await client.close()
+
     async def test_get_devices_list_all_returns_user_devices(self):
         """When logged in, user devices should return a list of user devices"""
         client = ACInfinityClient(HOST, EMAIL, PASSWORD)
@@ -296,6 +452,150 @@ class TestACInfinityClient:
         with pytest.raises(ACInfinityClientCannotConnect):
             await client.get_device_mode_settings(DEVICE_ID, 0)
 
+    @staticmethod
+    def __count_requests(mocked, path: str) -> int:
+        return sum(len(calls) for (_, url), calls in mocked.requests.items() if path in str(url))
+
+    async def test_get_device_mode_settings_concurrent_calls_share_one_request(self):
+        """Identical requests made while one is in flight should join it rather than send another"""
+        client = ACInfinityClient(HOST, EMAIL, PASSWORD)
+        client._user_id = USER_ID
+
+        async def slow_response(*args, **kwargs):
+            await asyncio.sleep(0.01)
+
+        try:
+            with aioresponses() as mocked:
+                mocked.post(
+                    re.compile(rf"{HOST}{API_URL_GET_DEV_MODE_SETTING}.*"),
+                    status=200,
+                    payload=GET_DEV_MODE_SETTING_LIST_PAYLOAD,
+                    callback=slow_response,
+                    repeat=True,
+                )
+
+                results = await asyncio.gather(
+                    *(client.get_device_mode_settings(DEVICE_ID, 4) for _ in range(5))
+                )
+
+                assert all(result == GET_DEV_MODE_SETTING_LIST_PAYLOAD["data"] for result in results)
+                assert self.__count_requests(mocked, API_URL_GET_DEV_MODE_SETTING) == 1
+        finally:
+            await client.close()
+
+    async def test_get_device_mode_settings_memoized_within_generation(self):
+        """Sequential identical requests should be answered from memo until a new refresh generation begins"""
+        client = ACInfinityClient(HOST, EMAIL, PASSWORD)
+        client._user_id = USER_ID
+        try:
+            with aioresponses() as mocked:
+                mocked.post(
+                    re.compile(rf"{HOST}{API_URL_GET_DEV_MODE_SETTING}.*"),
+                    status=200,
+                    payload=GET_DEV_MODE_SETTING_LIST_PAYLOAD,
+                    repeat=True,
+                )
+
+                await client.get_device_mode_settings(DEVICE_ID, 4)
+                await client.get_device_mode_settings(DEVICE_ID, 4)
+                assert self.__count_requests(mocked, API_URL_GET_DEV_MODE_SETTING) == 1
+
+                await client.get_device_mode_settings(DEVICE_ID, 3)
+                assert self.__count_requests(mocked, API_URL_GET_DEV_MODE_SETTING) == 2
+
+                client.begin_refresh_generation()
+                await client.get_device_mode_settings(DEVICE_ID, 4)
+                assert self.__count_requests(mocked, API_URL_GET_DEV_MODE_SETTING) == 3
+        finally:
+            await client.close()
+
+    async def test_get_device_mode_settings_failure_shared_and_not_memoized(self):
+        """A failed request should be raised to every caller that joined it, and not be memoized"""
+        client = ACInfinityClient(HOST, EMAIL, PASSWORD)
+        client._user_id = USER_ID
+
+        async def slow_response(*args, **kwargs):
+            await asyncio.sleep(0.01)
+
+        try:
+            with aioresponses() as mocked:
+                mocked.post(
+                    re.compile(rf"{HOST}{API_URL_GET_DEV_MODE_SETTING}.*"),
+                    status=200,
+                    payload={"msg": "error", "code": 500},
+                    callback=slow_response,
+                )
+                mocked.post(
+                    re.compile(rf"{HOST}{API_URL_GET_DEV_MODE_SETTING}.*"),
+                    status=200,
+                    payload=GET_DEV_MODE_SETTING_LIST_PAYLOAD,
+                )
+
+                results = await asyncio.gather(
+                    client.get_device_mode_settings(DEVICE_ID, 4),
+                    client.get_device_mode_settings(DEVICE_ID, 4),
+                    return_exceptions=True,
+                )
+                assert all(isinstance(result, ACInfinityClientRequestFailed) for result in results)
+                assert self.__count_requests(mocked, API_URL_GET_DEV_MODE_SETTING) == 1
+
+                result = await client.get_device_mode_settings(DEVICE_ID, 4)
+                assert result == GET_DEV_MODE_SETTING_LIST_PAYLOAD["data"]
+                assert self.__count_requests(mocked, API_URL_GET_DEV_MODE_SETTING) == 2
+        finally:
+            await client.close()
+
+    async def test_update_device_controls_reuses_memoized_read_and_invalidates_it(self):
+        """A write should reuse a read made moments ago, and the next read after the write should be fresh"""
+        client = ACInfinityClient(HOST, EMAIL, PASSWORD)
+        client._user_id = USER_ID
+        try:
+            with aioresponses() as mocked:
+                mocked.post(
+                    re.compile(rf"{HOST}{API_URL_GET_DEV_MODE_SETTING}.*"),
+                    status=200,
+                    payload=GET_DEV_MODE_SETTING_LIST_PAYLOAD,
+                    repeat=True,
+                )
+                mocked.post(
+                    re.compile(f"{HOST}{API_URL_ADD_DEV_MODE}.*"),
+                    status=200,
+                    payload=UPDATE_SUCCESS_PAYLOAD,
+                )
+
+                await client.get_device_mode_settings(DEVICE_ID, 4)
+                await client.update_device_controls(DEVICE_ID, 4, {DeviceControlKey.ON_SPEED: 2})
+                assert self.__count_requests(mocked, API_URL_GET_DEV_MODE_SETTING) == 1
+
+                await client.get_device_mode_settings(DEVICE_ID, 4)
+                assert self.__count_requests(mocked, API_URL_GET_DEV_MODE_SETTING) == 2
+        finally:
+            await client.close()
+
+    async def test_update_ai_device_control_and_settings_reuses_memoized_read(self):
+        """An AI write should reuse a read made moments ago rather than fetch the port again"""
+        client = ACInfinityClient(HOST, EMAIL, PASSWORD)
+        client._user_id = USER_ID
+        try:
+            with aioresponses() as mocked:
+                mocked.post(
+                    re.compile(rf"{HOST}{API_URL_GET_DEV_MODE_SETTING}.*"),
+                    status=200,
+                    payload=GET_DEV_MODE_SETTING_LIST_PAYLOAD,
+                    repeat=True,
+                )
+                mocked.put(
+                    re.compile(f"{HOST}{API_URL_MODE_AND_SETTINGS}.*"),
+                    status=200,
+                    payload=UPDATE_SUCCESS_PAYLOAD,
+                )
+
+                await client.get_device_mode_settings(DEVICE_ID, 4)
+                await client.update_ai_device_control_and_settings(DEVICE_ID, 4, {DeviceControlKey.ON_SPEED: 2})
+                assert self.__count_requests(mocked, API_URL_GET_DEV_MODE_SETTING) == 1
+        finally:
+            await client.close()
+
     @staticmethod
     async def __make_generic_update_advanced_settings_call_and_get_sent_payload(
         dev_settings_payload=GET_DEV_SETTINGS_PAYLOAD,
@@ -466,6 +766,51 @@ class TestACInfinityClient:
 
         assert payload[DeviceControlKey.ON_SPEED] == '3'
 
+    async def test_update_ai_device_control_and_settings_skips_read_when_given_existing_values(self):
+        """When a snapshot of the existing values is provided, the payload is built from it without a read"""
+        client = ACInfinityClient(HOST, EMAIL, PASSWORD)
+        client._user_id = USER_ID
+        try:
+            with aioresponses() as mocked:
+                mocked.put(
+                    re.compile(f"{HOST}{API_URL_MODE_AND_SETTINGS}.*"),
+                    status=200,
+                    payload=UPDATE_SUCCESS_PAYLOAD,
+                )
+
+                await client.update_ai_device_control_and_settings(
+                    DEVICE_ID, 4, {DeviceControlKey.ON_SPEED: 2}, existing_values=DEVICE_CONTROLS
+                )
+
+                assert len(mocked.requests) == 1
+                (method, url), = mocked.requests.keys()
+                payload = dict(parse_qsl(url.raw_query_string, keep_blank_values=True))
+                assert method == "PUT"
+                assert payload[DeviceControlKey.ON_SPEED] == "2"
+                assert payload[DeviceControlKey.OFF_SPEED] == str(DEVICE_CONTROLS[DeviceControlKey.OFF_SPEED])
+        finally:
+            await client.close()
+
+    async def test_update_device_settings_skips_read_when_given_existing_values(self):
+        """When a snapshot of the existing settings is provided, the payload is built from it without a read"""
+        client = ACInfinityClient(HOST, EMAIL, PASSWORD)
+        client._user_id = USER_ID
+        try:
+            with aioresponses() as mocked:
+                mocked.post(
+                    re.compile(f"{HOST}{API_URL_UPDATE_ADV_SETTING}.*"),
+                    status=200,
+                    payload=UPDATE_SUCCESS_PAYLOAD,
+                )
+
+                await client.update_device_settings(
+                    DEVICE_ID, 4, DEVICE_NAME, {AdvancedSettingsKey.CALIBRATE_HUMIDITY: 3}, existing_values=DEVICE_SETTINGS
+                )
+
+                assert len(mocked.requests) == 1
+        finally:
+            await client.close()
+
     async def test_update_ai_device_control_and_settings_connect_error_on_not_logged_in(self):
         """When not logged in, update AI device control and settings should throw a connect error"""
         client = ACInfinityClient(HOST, EMAIL, PASSWORD)
@@ -614,3 +959,116 @@ class TestACInfinityClient:
                     )
         finally:
             await client.close()
+
+    async def test_get_account_controllers_not_sent_once_deadline_passed(self):
+        """Requests made after the current deadline has passed should fail without being sent"""
+        client = ACInfinityClient(HOST, EMAIL, PASSWORD)
+        client._user_id = USER_ID
+        try:
+            with aioresponses() as mocked:
+                mocked.post(f"{HOST}{API_URL_GET_DEVICE_INFO_LIST_ALL}", status=200, payload=DEVICE_INFO_LIST_ALL_PAYLOAD)
+
+                with ACInfinityDeadline(0), pytest.raises(ACInfinityClientDeadlineExceeded):
+                    await client.get_account_controllers()
+
+                assert self.__count_requests(mocked, API_URL_GET_DEVICE_INFO_LIST_ALL) == 0
+        finally:
+            await client.close()
+
+    async def test_get_account_controllers_timeout_capped_by_deadline(self):
+        """A request should only wait for the time left until the current deadline, not the full request timeout"""
+        client = ACInfinityClient(HOST, EMAIL, PASSWORD)
+        client._user_id = USER_ID
+
+        async def slow_response(*args, **kwargs):
+            await asyncio.sleep(1)
+
+        try:
+            with aioresponses() as mocked:
+                mocked.post(
+                    f"{HOST}{API_URL_GET_DEVICE_INFO_LIST_ALL}",
+                    status=200,
+                    payload=DEVICE_INFO_LIST_ALL_PAYLOAD,
+                    callback=slow_response,
+                )
+
+                started = asyncio.get_running_loop().time()
+                with ACInfinityDeadline(0.05), pytest.raises(asyncio.TimeoutError):
+                    await client.get_account_controllers()
+
+                assert asyncio.get_running_loop().time() - started < 0.5
+        finally:
+            await client.close()
+
+    async def test_deadline_current_only_while_entered(self):
+        """A deadline should be the current deadline only while entered, restoring any outer deadline on exit"""
+        outer = ACInfinityDeadline(10)
+        inner = ACInfinityDeadline(1)
+
+        assert ACInfinityDeadline.current() is None
+        with outer:
+            with inner:
+                assert ACInfinityDeadline.current() is inner
+            assert ACInfinityDeadline.current() is outer
+        assert ACInfinityDeadline.current() is None
+        assert 0 < inner.remaining <= 1
+        assert not inner.expired
+
+    async def test_rate_limiter_waits_once_burst_used_up(self):
+        """Requests past the burst should wait for tokens to come back at the configured rate"""
+        limiter = ACInfinityRateLimiter(rate=20, burst=2, write_reserve=0)
+
+        started = asyncio.get_running_loop().time()
+        for _ in range(3):
+            await limiter.acquire(API_URL_GET_DEVICE_INFO_LIST_ALL)
+
+        assert asyncio.get_running_loop().time() - started >= 0.04
+        assert limiter.requests_per_minute == {API_URL_GET_DEVICE_INFO_LIST_ALL: 3}
+
+    async def test_rate_limiter_reads_leave_reserve_to_writes(self):
+        """Reads should not use the tokens reserved for writes, giving up if the deadline would pass first"""
+        limiter = ACInfinityRateLimiter(rate=0.1, burst=3, write_reserve=2)
+
+        await limiter.acquire(API_URL_GET_DEV_MODE_SETTING)
+        with ACInfinityDeadline(1), pytest.raises(ACInfinityClientDeadlineExceeded):
+            await limiter.acquire(API_URL_GET_DEV_MODE_SETTING)
+
+        await limiter.acquire(API_URL_ADD_DEV_MODE)
+        await limiter.acquire(API_URL_UPDATE_ADV_SETTING)
+        assert limiter.remaining < 0.1
+
+    async def test_rate_limiter_sends_waiting_writes_first(self):
+        """A write waiting for the budget should be sent ahead of reads that were waiting before it"""
+        limiter = ACInfinityRateLimiter(rate=20, burst=1, write_reserve=0)
+        await limiter.acquire(API_URL_GET_DEV_MODE_SETTING)
+        sent: list[str] = []
+
+        async def send(endpoint: str):
+            await limiter.acquire(endpoint)
+            sent.append(endpoint)
+
+        read = asyncio.ensure_future(send(API_URL_GET_DEV_MODE_SETTING))
+        await asyncio.sleep(0)
+        write = asyncio.ensure_future(send(API_URL_ADD_DEV_MODE))
+        await asyncio.gather(read, write)
+
+        assert sent == [API_URL_ADD_DEV_MODE, API_URL_GET_DEV_MODE_SETTING]
+
+    async def test_requests_counted_per_endpoint(self):
+        """Each request sent should be counted against its endpoint, without its query string"""
+        client = ACInfinityClient(HOST, EMAIL, PASSWORD)
+        client._user_id = USER_ID
+        try:
+            with aioresponses() as mocked:
+                mocked.post(f"{HOST}{API_URL_GET_DEVICE_INFO_LIST_ALL}", status=200, payload=DEVICE_INFO_LIST_ALL_PAYLOAD)
+                mocked.post(re.compile(rf"{re.escape(HOST + API_URL_ADD_DEV_MODE)}\?.*"), status=200, payload=UPDATE_SUCCESS_PAYLOAD)
+
+                await client.get_account_controllers()
+                await client.update_device_controls(DEVICE_ID, 1, {DeviceControlKey.ON_SPEED: 5}, DEVICE_CONTROLS)
+
+            assert client.rate_limiter.requests_per_minute == {
+                API_URL_GET_DEVICE_INFO_LIST_ALL: 1,
+                API_URL_ADD_DEV_MODE: 1,
+            }
+        finally:
+            await client.close()
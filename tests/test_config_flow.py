@@ -24,11 +24,15 @@ from custom_components.ac_infinity.config_flow import (
 )
 from custom_components.ac_infinity.const import (
     ConfigurationKey,
+    DEFAULT_MAX_POLLING_INTERVAL,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_MIN_POLLING_INTERVAL,
     DEFAULT_POLLING_INTERVAL,
+    DEFAULT_SETTINGS_POLLING_INTERVAL,
     DOMAIN,
 )
 from custom_components.ac_infinity.core import ACInfinityService
-from tests import ACTestObjects, setup_entity_mocks
+from tests import ACTestObjects, publish, setup_entity_mocks
 
 from .data_models import (
     EMAIL, ENTRY_ID, PASSWORD, POLLING_INTERVAL, DEVICE_ID, AI_DEVICE_ID, DEVICE_NAME, DEVICE_NAME_AI,
@@ -222,8 +226,11 @@ class TestConfigFlow:
         mock_client = mocker.MagicMock()
         mock_service = ACInfinityService(mock_client)
         # Set up the service's internal data structures like the real service
-        mock_service._controller_properties = CONTROLLER_PROPERTIES_DATA
-        mock_service._device_properties = DEVICE_PROPERTIES_DATA
+        publish(
+            mock_service,
+            controller_properties=CONTROLLER_PROPERTIES_DATA,
+            device_properties=DEVICE_PROPERTIES_DATA,
+        )
 
         flow.ac_infinity = mock_service
         flow.device_ids = [str(DEVICE_ID)]
@@ -252,8 +259,11 @@ class TestConfigFlow:
         mock_client = mocker.MagicMock()
         mock_service = ACInfinityService(mock_client)
         # Set up the service's internal data structures like the real service
-        mock_service._controller_properties = CONTROLLER_PROPERTIES_DATA
-        mock_service._device_properties = DEVICE_PROPERTIES_DATA
+        publish(
+            mock_service,
+            controller_properties=CONTROLLER_PROPERTIES_DATA,
+            device_properties=DEVICE_PROPERTIES_DATA,
+        )
 
         flow.ac_infinity = mock_service
         flow.device_ids = [str(DEVICE_ID), str(AI_DEVICE_ID)]
@@ -384,6 +394,10 @@ class TestConfigFlow:
             data_schema=vol.Schema(
                 {
                     vol.Required(ConfigurationKey.POLLING_INTERVAL, default=expected_value): int,
+                    vol.Required(ConfigurationKey.MIN_POLLING_INTERVAL, default=DEFAULT_MIN_POLLING_INTERVAL): int,
+                    vol.Required(ConfigurationKey.MAX_POLLING_INTERVAL, default=DEFAULT_MAX_POLLING_INTERVAL): int,
+                    vol.Required(ConfigurationKey.SETTINGS_POLLING_INTERVAL, default=DEFAULT_SETTINGS_POLLING_INTERVAL): int,
+                    vol.Required(ConfigurationKey.MAX_STALENESS, default=DEFAULT_MAX_STALENESS): int,
                     vol.Optional(ConfigurationKey.UPDATE_PASSWORD): str,
                 }
             ),
@@ -423,6 +437,10 @@ class TestConfigFlow:
                     vol.Required(
                         ConfigurationKey.POLLING_INTERVAL, default=DEFAULT_POLLING_INTERVAL
                     ): int,
+                    vol.Required(ConfigurationKey.MIN_POLLING_INTERVAL, default=DEFAULT_MIN_POLLING_INTERVAL): int,
+                    vol.Required(ConfigurationKey.MAX_POLLING_INTERVAL, default=DEFAULT_MAX_POLLING_INTERVAL): int,
+                    vol.Required(ConfigurationKey.SETTINGS_POLLING_INTERVAL, default=DEFAULT_SETTINGS_POLLING_INTERVAL): int,
+                    vol.Required(ConfigurationKey.MAX_STALENESS, default=DEFAULT_MAX_STALENESS): int,
                     vol.Optional(ConfigurationKey.UPDATE_PASSWORD): str,
                 }
             ),
@@ -463,6 +481,10 @@ class TestConfigFlow:
                     vol.Required(
                         ConfigurationKey.POLLING_INTERVAL, default=DEFAULT_POLLING_INTERVAL
                     ): int,
+                    vol.Required(ConfigurationKey.MIN_POLLING_INTERVAL, default=DEFAULT_MIN_POLLING_INTERVAL): int,
+                    vol.Required(ConfigurationKey.MAX_POLLING_INTERVAL, default=DEFAULT_MAX_POLLING_INTERVAL): int,
+                    vol.Required(ConfigurationKey.SETTINGS_POLLING_INTERVAL, default=DEFAULT_SETTINGS_POLLING_INTERVAL): int,
+                    vol.Required(ConfigurationKey.MAX_STALENESS, default=DEFAULT_MAX_STALENESS): int,
                     vol.Optional(ConfigurationKey.UPDATE_PASSWORD): str,
                 }
             ),
@@ -470,6 +492,143 @@ class TestConfigFlow:
         )
         flow.async_create_entry.assert_not_called()
 
+    async def test_options_flow_handler_show_form_with_error_max_staleness(self, setup_options_flow):
+        """If provided max staleness is negative, show form with error"""
+        mocker, test_objects = setup_options_flow
+        flow = test_objects.options_flow
+
+        entry = ConfigEntry(
+            entry_id=ENTRY_ID,
+            data={},
+            domain=DOMAIN,
+            minor_version=0,
+            source="",
+            title="",
+            version=0,
+            options=None,
+            unique_id=None,
+            discovery_keys=MappingProxyType({}),
+            subentries_data=None,
+        )
+
+        mocker.patch.object(OptionsFlow, "config_entry", return_value=entry)
+
+        await flow.async_step_general_config(
+            {ConfigurationKey.POLLING_INTERVAL: DEFAULT_POLLING_INTERVAL, ConfigurationKey.MAX_STALENESS: -1}
+        )
+
+        flow.async_show_form.assert_called_with(
+            step_id="general_config",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        ConfigurationKey.POLLING_INTERVAL, default=DEFAULT_POLLING_INTERVAL
+                    ): int,
+                    vol.Required(ConfigurationKey.MIN_POLLING_INTERVAL, default=DEFAULT_MIN_POLLING_INTERVAL): int,
+                    vol.Required(ConfigurationKey.MAX_POLLING_INTERVAL, default=DEFAULT_MAX_POLLING_INTERVAL): int,
+                    vol.Required(ConfigurationKey.SETTINGS_POLLING_INTERVAL, default=DEFAULT_SETTINGS_POLLING_INTERVAL): int,
+                    vol.Required(ConfigurationKey.MAX_STALENESS, default=DEFAULT_MAX_STALENESS): int,
+                    vol.Optional(ConfigurationKey.UPDATE_PASSWORD): str,
+                }
+            ),
+            errors={ConfigurationKey.MAX_STALENESS: "invalid_max_staleness"},
+        )
+        flow.async_create_entry.assert_not_called()
+
+    async def test_options_flow_handler_show_form_with_error_settings_polling_interval(self, setup_options_flow):
+        """If provided mode settings polling interval is not valid, show form with error"""
+        mocker, test_objects = setup_options_flow
+        flow = test_objects.options_flow
+
+        entry = ConfigEntry(
+            entry_id=ENTRY_ID,
+            data={},
+            domain=DOMAIN,
+            minor_version=0,
+            source="",
+            title="",
+            version=0,
+            options=None,
+            unique_id=None,
+            discovery_keys=MappingProxyType({}),
+            subentries_data=None,
+        )
+
+        mocker.patch.object(OptionsFlow, "config_entry", return_value=entry)
+
+        await flow.async_step_general_config(
+            {ConfigurationKey.POLLING_INTERVAL: DEFAULT_POLLING_INTERVAL, ConfigurationKey.SETTINGS_POLLING_INTERVAL: 4}
+        )
+
+        flow.async_show_form.assert_called_with(
+            step_id="general_config",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        ConfigurationKey.POLLING_INTERVAL, default=DEFAULT_POLLING_INTERVAL
+                    ): int,
+                    vol.Required(ConfigurationKey.MIN_POLLING_INTERVAL, default=DEFAULT_MIN_POLLING_INTERVAL): int,
+                    vol.Required(ConfigurationKey.MAX_POLLING_INTERVAL, default=DEFAULT_MAX_POLLING_INTERVAL): int,
+                    vol.Required(ConfigurationKey.SETTINGS_POLLING_INTERVAL, default=DEFAULT_SETTINGS_POLLING_INTERVAL): int,
+                    vol.Required(ConfigurationKey.MAX_STALENESS, default=DEFAULT_MAX_STALENESS): int,
+                    vol.Optional(ConfigurationKey.UPDATE_PASSWORD): str,
+                }
+            ),
+            errors={ConfigurationKey.SETTINGS_POLLING_INTERVAL: "invalid_settings_polling_interval"},
+        )
+        flow.async_create_entry.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "key,value,error",
+        [
+            (ConfigurationKey.MIN_POLLING_INTERVAL, 4, "invalid_min_polling_interval"),
+            (ConfigurationKey.MIN_POLLING_INTERVAL, DEFAULT_POLLING_INTERVAL + 1, "invalid_min_polling_interval"),
+            (ConfigurationKey.MAX_POLLING_INTERVAL, DEFAULT_POLLING_INTERVAL - 1, "invalid_max_polling_interval"),
+        ],
+    )
+    async def test_options_flow_handler_show_form_with_error_adaptive_polling_interval(
+        self, setup_options_flow, key, value, error
+    ):
+        """If provided min or max polling interval does not bound the polling interval, show form with error"""
+        mocker, test_objects = setup_options_flow
+        flow = test_objects.options_flow
+
+        entry = ConfigEntry(
+            entry_id=ENTRY_ID,
+            data={},
+            domain=DOMAIN,
+            minor_version=0,
+            source="",
+            title="",
+            version=0,
+            options=None,
+            unique_id=None,
+            discovery_keys=MappingProxyType({}),
+            subentries_data=None,
+        )
+
+        mocker.patch.object(OptionsFlow, "config_entry", return_value=entry)
+
+        await flow.async_step_general_config({ConfigurationKey.POLLING_INTERVAL: DEFAULT_POLLING_INTERVAL, key: value})
+
+        flow.async_show_form.assert_called_with(
+            step_id="general_config",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        ConfigurationKey.POLLING_INTERVAL, default=DEFAULT_POLLING_INTERVAL
+                    ): int,
+                    vol.Required(ConfigurationKey.MIN_POLLING_INTERVAL, default=DEFAULT_MIN_POLLING_INTERVAL): int,
+                    vol.Required(ConfigurationKey.MAX_POLLING_INTERVAL, default=DEFAULT_MAX_POLLING_INTERVAL): int,
+                    vol.Required(ConfigurationKey.SETTINGS_POLLING_INTERVAL, default=DEFAULT_SETTINGS_POLLING_INTERVAL): int,
+                    vol.Required(ConfigurationKey.MAX_STALENESS, default=DEFAULT_MAX_STALENESS): int,
+                    vol.Optional(ConfigurationKey.UPDATE_PASSWORD): str,
+                }
+            ),
+            errors={key: error},
+        )
+        flow.async_create_entry.assert_not_called()
+
     @pytest.mark.parametrize("user_input", [5, 600, DEFAULT_POLLING_INTERVAL])
     async def test_options_flow_handler_update_config_and_data_coordinator(
         self, setup_options_flow, user_input
@@ -488,6 +647,10 @@ class TestConfigFlow:
         assert call_args is not None
         assert call_args[1]['data'][CONF_EMAIL] == EMAIL
         assert call_args[1]['data'][ConfigurationKey.POLLING_INTERVAL] == user_input
+        assert call_args[1]["data"][ConfigurationKey.MIN_POLLING_INTERVAL] == DEFAULT_MIN_POLLING_INTERVAL
+        assert call_args[1]["data"][ConfigurationKey.MAX_POLLING_INTERVAL] == max(DEFAULT_MAX_POLLING_INTERVAL, user_input)
+        assert call_args[1]["data"][ConfigurationKey.SETTINGS_POLLING_INTERVAL] == DEFAULT_SETTINGS_POLLING_INTERVAL
+        assert call_args[1]["data"][ConfigurationKey.MAX_STALENESS] == DEFAULT_MAX_STALENESS
         assert call_args[1]['data'][CONF_PASSWORD] == "hunter2"
         assert ConfigurationKey.MODIFIED_AT in call_args[1]['data']
         # Verify modified_at is a valid ISO timestamp
@@ -594,7 +757,7 @@ class TestConfigFlow:
         flow = test_objects.options_flow
 
         # Set up the service's internal data structures like the real service
-        test_objects.coordinator.ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
+        publish(test_objects.coordinator.ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA)
 
         await flow.async_step_controller_select()
 
@@ -645,8 +808,11 @@ class TestConfigFlow:
         flow.current_device_id = str(DEVICE_ID)
 
         # Set up the service's internal data structures like the real service
-        test_objects.coordinator.ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        test_objects.coordinator.ac_infinity._device_properties = DEVICE_PROPERTIES_DATA
+        publish(
+            test_objects.coordinator.ac_infinity,
+            controller_properties=CONTROLLER_PROPERTIES_DATA,
+            device_properties=DEVICE_PROPERTIES_DATA,
+        )
 
         await flow.async_step_enable_entities()
 
@@ -741,6 +907,10 @@ class TestConfigFlow:
                     vol.Required(
                         ConfigurationKey.POLLING_INTERVAL, default=DEFAULT_POLLING_INTERVAL
                     ): int,
+                    vol.Required(ConfigurationKey.MIN_POLLING_INTERVAL, default=DEFAULT_MIN_POLLING_INTERVAL): int,
+                    vol.Required(ConfigurationKey.MAX_POLLING_INTERVAL, default=DEFAULT_MAX_POLLING_INTERVAL): int,
+                    vol.Required(ConfigurationKey.SETTINGS_POLLING_INTERVAL, default=DEFAULT_SETTINGS_POLLING_INTERVAL): int,
+                    vol.Required(ConfigurationKey.MAX_STALENESS, default=DEFAULT_MAX_STALENESS): int,
                     vol.Optional(ConfigurationKey.UPDATE_PASSWORD): str,
                 }
             ),
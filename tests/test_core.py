@@ -1,21 +1,40 @@
 import asyncio
+import copy
+import dataclasses
+import gc
+import json
+import re
+import weakref
 from asyncio import Future
+from datetime import timedelta
 
 import aiohttp
 import pytest
+from aioresponses import aioresponses
 from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
 from homeassistant.const import UnitOfTemperature
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
 from pytest_mock import MockFixture
 
 from custom_components.ac_infinity.client import (
+    API_URL_ADD_DEV_MODE,
+    API_URL_GET_DEV_MODE_SETTING,
+    API_URL_GET_DEVICE_INFO_LIST_ALL,
     ACInfinityClient,
     ACInfinityClientCannotConnect,
+    ACInfinityClientDeadlineExceeded,
     ACInfinityClientInvalidAuth,
     ACInfinityClientRequestFailed,
+    ACInfinityDeadline,
 )
 from custom_components.ac_infinity.const import (
+    AtType,
+    DEFAULT_WRITE_SNAPSHOT_MAX_AGE,
+    ConfigurationKey,
     ControllerType,
     DOMAIN,
+    EntityConfigValue,
     MANUFACTURER,
     AdvancedSettingsKey,
     ControllerPropertyKey,
@@ -25,16 +44,27 @@ from custom_components.ac_infinity.const import (
     SensorType,
 )
 from custom_components.ac_infinity.core import (
+    ACInfinityCircuitBreaker,
+    ACInfinityCircuitOpen,
     ACInfinityController,
+    ACInfinityControllerEntity,
+    ACInfinityDataUpdateCoordinator,
+    ACInfinityDeviceEntity,
     ACInfinityEntities,
+    ACInfinityPropertyProjection,
+    ACInfinityRequestExecutor,
+    ACInfinityRetryPolicy,
     ACInfinityService,
+    enabled_fn_sensor,
+    settings_needed_fn,
 )
 from custom_components.ac_infinity.sensor import (
     ACInfinityControllerSensorEntity,
     ACInfinityControllerSensorEntityDescription,
+    SENSOR_DESCRIPTIONS,
 )
 
-from . import ACTestObjects, setup_entity_mocks
+from . import ACTestObjects, publish, republish, setup_entity_mocks
 from .data_models import (
     AI_CONTROLLER_PROPERTIES,
     AI_DEVICE_ID,
@@ -43,10 +73,16 @@ from .data_models import (
     CONTROLLER_PROPERTIES_DATA, DEVICE_CONTROLS,
     DEVICE_ID,
     DEVICE_INFO_LIST_ALL,
+    DEVICE_INFO_LIST_ALL_PAYLOAD,
     DEVICE_NAME,
     DEVICE_SETTINGS_DATA,
+    EMAIL,
     GET_DEV_MODE_SETTING_LIST_PAYLOAD,
+    HOST,
     MAC_ADDR,
+    PASSWORD,
+    UPDATE_SUCCESS_PAYLOAD,
+    USER_ID,
     DEVICE_CONTROLS_DATA,
     DEVICE_PROPERTIES_DATA,
     SENSOR_PROPERTIES_DATA,
@@ -124,89 +160,1137 @@ class TestACInfinity:
             == "Grow Tent AI"
         )
 
+    async def test_refresh_device_reads_only_that_port(self, mock_client):
+        """refreshing a single port reads only that port's mode settings"""
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_device_mode_settings.return_value = DEVICE_CONTROLS
+
+        ac_infinity = ACInfinityService(mock_client)
+        await ac_infinity.refresh_device(str(DEVICE_ID), 2)
+
+        mock_client.get_account_controllers.assert_not_called()
+        mock_client.get_device_mode_settings.assert_called_with(str(DEVICE_ID), 2)
+        assert ac_infinity._device_controls[(str(DEVICE_ID), 2)] == DEVICE_CONTROLS
+        assert ac_infinity._device_settings[(str(DEVICE_ID), 2)] == DEVICE_CONTROLS[DeviceControlKey.DEV_SETTING]
+
+    async def test_refresh_device_port_zero_reads_controller_settings(self, mock_client):
+        """refreshing port 0 reads the controller settings"""
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_device_mode_settings.return_value = DEVICE_CONTROLS
+
+        ac_infinity = ACInfinityService(mock_client)
+        await ac_infinity.refresh_device(str(DEVICE_ID), 0)
+
+        mock_client.get_device_mode_settings.assert_called_once_with(str(DEVICE_ID), 0)
+        assert ac_infinity._device_settings[(str(DEVICE_ID), 0)] == DEVICE_CONTROLS[DeviceControlKey.DEV_SETTING]
+
+    async def test_coordinator_refresh_device_updates_only_that_ports_listeners(self, mocker: MockFixture, setup):
+        """after refreshing a port, only listeners registered for that port are updated"""
+        test_objects: ACTestObjects = setup
+        coordinator = ACInfinityDataUpdateCoordinator(test_objects.hass, test_objects.config_entry, test_objects.ac_infinity, 10)
+        mocker.patch.object(coordinator, "_schedule_refresh")
+        refresh_device = mocker.patch.object(test_objects.ac_infinity, "refresh_device", return_value=None)
+        request_refresh = mocker.patch.object(coordinator, "async_request_refresh", return_value=None)
+
+        port_listener = mocker.MagicMock()
+        other_port_listener = mocker.MagicMock()
+        controller_listener = mocker.MagicMock()
+        coordinator.async_add_listener(port_listener, (str(DEVICE_ID), 1))
+        coordinator.async_add_listener(other_port_listener, (str(DEVICE_ID), 2))
+        coordinator.async_add_listener(controller_listener, (str(DEVICE_ID), 0))
+
+        await coordinator.async_refresh_device(DEVICE_ID, 1)
+
+        refresh_device.assert_called_once_with(DEVICE_ID, 1)
+        request_refresh.assert_not_called()
+        port_listener.assert_called_once()
+        other_port_listener.assert_not_called()
+        controller_listener.assert_not_called()
+
+    async def test_coordinator_refresh_device_falls_back_to_full_refresh_on_failure(self, mocker: MockFixture, setup):
+        """if the port can not be refreshed, a full refresh is requested instead"""
+        test_objects: ACTestObjects = setup
+        coordinator = ACInfinityDataUpdateCoordinator(test_objects.hass, test_objects.config_entry, test_objects.ac_infinity, 10)
+        mocker.patch.object(coordinator, "_schedule_refresh")
+        mocker.patch.object(test_objects.ac_infinity, "refresh_device", side_effect=ACInfinityClientCannotConnect("unit-test"))
+        request_refresh = mocker.patch.object(coordinator, "async_request_refresh", return_value=None)
+
+        port_listener = mocker.MagicMock()
+        coordinator.async_add_listener(port_listener, (str(DEVICE_ID), 1))
+
+        await coordinator.async_refresh_device(DEVICE_ID, 1)
+
+        request_refresh.assert_called_once()
+        port_listener.assert_not_called()
+
+    async def test_entity_context_is_its_port(self, setup):
+        """controller entities belong to port 0 and device entities to their own port, so port refreshes can target them"""
+        test_objects: ACTestObjects = setup
+        controller = ACInfinityController(CONTROLLER_PROPERTIES)
+
+        controller_entity = ACInfinityControllerEntity(
+            test_objects.coordinator, controller, enabled_fn_sensor, lambda entity, c: True, "unit-test", "sensor"
+        )
+        device_entity = ACInfinityDeviceEntity(
+            test_objects.coordinator, controller.devices[1], enabled_fn_sensor, lambda entity, d: True, None, "unit-test", "sensor"
+        )
+
+        assert controller_entity.coordinator_context == (str(DEVICE_ID), 0)
+        assert device_entity.coordinator_context == (str(DEVICE_ID), 2)
+
+    async def test_coordinator_refresh_plan_from_settings_polling_interval_and_entity_config(self, mocker: MockFixture, setup):
+        """the coordinator refreshes with the settings polling interval as the max age of mode settings, and only reads
+        the settings the entity configuration has entities for"""
+        test_objects: ACTestObjects = setup
+        coordinator = ACInfinityDataUpdateCoordinator(
+            test_objects.hass, test_objects.config_entry, test_objects.ac_infinity, 10, settings_polling_interval=120
+        )
+        refresh = mocker.patch.object(test_objects.ac_infinity, "refresh", return_value=None)
+
+        await coordinator._async_update_data()
+
+        args, _ = refresh.call_args
+        assert args[1] == 120
+        assert args[2].func is settings_needed_fn
+        assert args[2].args == (test_objects.config_entry,)
+
+    @pytest.mark.parametrize(
+        "entity_config,device_port,expected",
+        [
+            (None, 1, True),
+            (None, 0, True),
+            (EntityConfigValue.Disable, 1, False),
+            (EntityConfigValue.SensorsOnly, 1, True),
+            (EntityConfigValue.SensorsAndControls, 1, True),
+            (EntityConfigValue.Disable, 0, False),
+            (EntityConfigValue.SensorsOnly, 0, False),
+            (EntityConfigValue.SensorsAndControls, 0, False),
+            (EntityConfigValue.SensorsAndSettings, 0, True),
+            (EntityConfigValue.All, 0, True),
+        ],
+    )
+    async def test_settings_needed_fn(self, mocker: MockFixture, entity_config, device_port, expected):
+        """mode settings are read for any port with entities; controller settings only when setting entities are enabled"""
+        entry = mocker.MagicMock()
+        entity_config_key = f"port_{device_port}" if device_port else "controller"
+        entry.data = {ConfigurationKey.ENTITIES: {str(DEVICE_ID): {entity_config_key: entity_config}}} if entity_config else {}
+
+        assert settings_needed_fn(entry, str(DEVICE_ID), device_port) == expected
+
+    @pytest.mark.parametrize(
+        "current,changes,mode,next_transition,expected",
+        [
+            (10, 1, AtType.ON, None, 5),  # changing ports halve the interval
+            (6, 2, AtType.ON, None, 5),  # but not below the min
+            (10, 0, AtType.ON, None, 15),  # nothing changing backs off
+            (50, 0, AtType.ON, None, 60),  # up to the max
+            (10, 0, AtType.AUTO, None, 10),  # auto ports hold the polling interval
+            (40, 0, AtType.VPD, None, 10),  # vpd ports bring it back down to the polling interval
+            (30, 0, AtType.TIMER_TO_ON, 12, 13),  # a timer about to switch is polled right after it does
+            (30, 0, AtType.TIMER_TO_ON, 2, 5),  # but not sooner than the min
+        ],
+    )
+    async def test_coordinator_adapts_polling_interval(
+        self, mocker: MockFixture, setup, *, current, changes, mode, next_transition, expected
+    ):
+        """the next refresh is scheduled from the changes, modes and timers the last refresh saw"""
+        test_objects: ACTestObjects = setup
+        coordinator = ACInfinityDataUpdateCoordinator(
+            test_objects.hass,
+            test_objects.config_entry,
+            test_objects.ac_infinity,
+            10,
+            min_polling_interval=5,
+            max_polling_interval=60,
+        )
+        coordinator.update_interval = timedelta(seconds=current)
+        mocker.patch.object(test_objects.ac_infinity, "refresh", return_value=None)
+        test_objects.ac_infinity._last_refresh_changes = changes
+        publish(test_objects.ac_infinity, device_properties={
+            (str(DEVICE_ID), 1): {DevicePropertyKey.CURRENT_MODE: mode, DevicePropertyKey.REMAINING_TIME: next_transition}
+        })
+
+        await coordinator._async_update_data()
+
+        assert coordinator.polling_interval == expected
+
+    async def test_coordinator_holds_polling_interval_while_ports_await_first_read(self, mocker: MockFixture, setup):
+        """the polling interval does not back off while the first read of some ports is spread across refreshes"""
+        test_objects: ACTestObjects = setup
+        coordinator = ACInfinityDataUpdateCoordinator(
+            test_objects.hass, test_objects.config_entry, test_objects.ac_infinity, 10, max_polling_interval=60
+        )
+        coordinator.update_interval = timedelta(seconds=40)
+        mocker.patch.object(test_objects.ac_infinity, "refresh", return_value=None)
+        test_objects.ac_infinity._last_refresh_changes = 0
+        test_objects.ac_infinity._awaiting_first_read = frozenset({(str(DEVICE_ID), 2)})
+
+        await coordinator._async_update_data()
+
+        assert coordinator.polling_interval == 10
+
+    async def test_coordinator_backs_off_when_request_budget_runs_low(self, mocker: MockFixture, setup):
+        """the polling interval stretches while the request budget is nearly used up, even while ports are changing"""
+        test_objects: ACTestObjects = setup
+        coordinator = ACInfinityDataUpdateCoordinator(
+            test_objects.hass, test_objects.config_entry, test_objects.ac_infinity, 10, max_polling_interval=60
+        )
+        mocker.patch.object(test_objects.ac_infinity, "refresh", return_value=None)
+        mocker.patch.object(
+            ACInfinityService, "request_budget_remaining", new_callable=mocker.PropertyMock, return_value=0.1
+        )
+        test_objects.ac_infinity._last_refresh_changes = 1
+
+        await coordinator._async_update_data()
+
+        assert coordinator.polling_interval == 15
+
+    @pytest.mark.parametrize("failures,expected", [(1, 20), (2, 40), (3, 80), (8, 600)])
+    async def test_coordinator_backs_off_geometrically_while_refreshes_fail(self, mocker: MockFixture, setup, failures, expected):
+        """each failed refresh in a row doubles the polling interval, up to a ceiling"""
+        test_objects: ACTestObjects = setup
+        coordinator = ACInfinityDataUpdateCoordinator(test_objects.hass, test_objects.config_entry, test_objects.ac_infinity, 10)
+        mocker.patch.object(test_objects.ac_infinity, "refresh", side_effect=ACInfinityClientCannotConnect("unit-test"))
+        test_objects.ac_infinity._last_updated_from_api = {(str(DEVICE_ID), 0): dt_util.utcnow()}
+
+        for _ in range(failures):
+            await coordinator._async_update_data()
+
+        assert coordinator.polling_interval == expected
+        assert coordinator.error_rate == 1
+
+    async def test_coordinator_resets_backoff_once_refresh_succeeds(self, mocker: MockFixture, setup):
+        """the first successful refresh after failures starts over from the polling interval"""
+        test_objects: ACTestObjects = setup
+        coordinator = ACInfinityDataUpdateCoordinator(test_objects.hass, test_objects.config_entry, test_objects.ac_infinity, 10)
+        refresh = mocker.patch.object(test_objects.ac_infinity, "refresh", side_effect=ACInfinityClientCannotConnect("unit-test"))
+        test_objects.ac_infinity._last_updated_from_api = {(str(DEVICE_ID), 0): dt_util.utcnow()}
+        test_objects.ac_infinity._last_refresh_changes = 1
+
+        await coordinator._async_update_data()
+        await coordinator._async_update_data()
+        assert coordinator.polling_interval == 40
+
+        refresh.side_effect = None
+        await coordinator._async_update_data()
+
+        assert coordinator.polling_interval == 5
+        assert coordinator.error_rate == pytest.approx(2 / 3)
+
+    async def test_refresh_counts_ports_with_changed_activity(self, mock_client):
+        """ports whose speed, state, mode or online status changed since the last refresh are counted"""
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
+        mock_client.get_device_mode_settings.return_value = DEVICE_CONTROLS
+
+        ac_infinity = ACInfinityService(mock_client)
+        await ac_infinity.refresh()
+        assert ac_infinity.last_refresh_changes == 0
+
+        await ac_infinity.refresh()
+        assert ac_infinity.last_refresh_changes == 0
+
+        changed = [copy.deepcopy(DEVICE_INFO_LIST_ALL[0]), *DEVICE_INFO_LIST_ALL[1:]]
+        changed[0]["deviceInfo"]["ports"][0][DevicePropertyKey.SPEAK] += 1
+        changed[0]["deviceInfo"]["ports"][1][DevicePropertyKey.REMAINING_TIME] += 1
+        mock_client.get_account_controllers.return_value = changed
+        await ac_infinity.refresh()
+
+        assert ac_infinity.last_refresh_changes == 1
+
+    async def test_coordinator_serves_last_good_values_when_refresh_fails(self, mocker: MockFixture, setup):
+        """a failed refresh keeps serving the last good values, marked stale, while they are within the max staleness"""
+        test_objects: ACTestObjects = setup
+        coordinator = ACInfinityDataUpdateCoordinator(test_objects.hass, test_objects.config_entry, test_objects.ac_infinity, 10, max_staleness=60)
+        mocker.patch.object(test_objects.ac_infinity, "refresh", side_effect=ACInfinityClientCannotConnect("unit-test"))
+        test_objects.ac_infinity._is_stale = True
+        test_objects.ac_infinity._last_updated_from_api = {(str(DEVICE_ID), 0): dt_util.utcnow() - timedelta(seconds=30)}
+
+        assert await coordinator._async_update_data() is test_objects.ac_infinity
+
+    @pytest.mark.parametrize("max_staleness,age", [(60, 90), (0, 1)])
+    async def test_coordinator_refresh_failure_raised_past_max_staleness(self, mocker: MockFixture, setup, max_staleness, age):
+        """a failed refresh fails the update once the last good values are older than the max staleness"""
+        test_objects: ACTestObjects = setup
+        coordinator = ACInfinityDataUpdateCoordinator(test_objects.hass, test_objects.config_entry, test_objects.ac_infinity, 10, max_staleness=max_staleness)
+        mocker.patch.object(test_objects.ac_infinity, "refresh", side_effect=ACInfinityClientCannotConnect("unit-test"))
+        test_objects.ac_infinity._last_updated_from_api = {(str(DEVICE_ID), 0): dt_util.utcnow() - timedelta(seconds=age)}
+
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+
+    async def test_refresh_failure_marks_values_stale(self, mocker: MockFixture, mock_client):
+        """values kept after a failed refresh are stale until a refresh succeeds"""
+        future: Future = asyncio.Future()
+        future.set_result(None)
+
+        mocker.patch("asyncio.sleep", return_value=future)
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
+        mock_client.get_device_mode_settings.return_value = DEVICE_CONTROLS
+
+        ac_infinity = ACInfinityService(mock_client)
+        await ac_infinity.refresh()
+        last_updated = ac_infinity.get_last_updated_from_api(DEVICE_ID, 1)
+        assert last_updated is not None
+        assert not ac_infinity.is_stale
+
+        mock_client.get_account_controllers.side_effect = ACInfinityClientCannotConnect("unit-test")
+        with pytest.raises(ACInfinityClientCannotConnect):
+            await ac_infinity.refresh()
+
+        assert ac_infinity.is_stale
+        assert ac_infinity.get_last_updated_from_api(DEVICE_ID, 1) == last_updated
+
+    @pytest.mark.parametrize("age,expected_available", [(30, True), (90, False)])
+    async def test_entity_unavailable_once_stale_past_max_staleness(self, setup, age, expected_available):
+        """entities served stale show when they were last read, and go unavailable only past the max staleness"""
+        test_objects: ACTestObjects = setup
+        coordinator = ACInfinityDataUpdateCoordinator(test_objects.hass, test_objects.config_entry, test_objects.ac_infinity, 10, max_staleness=60)
+        controller = ACInfinityController(CONTROLLER_PROPERTIES)
+        entity = ACInfinityControllerEntity(coordinator, controller, enabled_fn_sensor, lambda e, c: True, "unit-test", "sensor")
+
+        assert entity.available
+        assert entity.extra_state_attributes is None
+
+        last_updated = dt_util.utcnow() - timedelta(seconds=age)
+        test_objects.ac_infinity._is_stale = True
+        test_objects.ac_infinity._last_updated_from_api = {(str(DEVICE_ID), 0): last_updated}
+
+        assert entity.available == expected_available
+        assert entity.extra_state_attributes == {"stale": True, "last_updated_from_api": last_updated}
+
+    async def test_entity_stale_only_for_its_own_controller(self, setup):
+        """entities of a controller that could not be refreshed are flagged stale; those of other controllers are not"""
+        test_objects: ACTestObjects = setup
+        coordinator = ACInfinityDataUpdateCoordinator(test_objects.hass, test_objects.config_entry, test_objects.ac_infinity, 10)
+        entity = ACInfinityControllerEntity(
+            coordinator, ACInfinityController(CONTROLLER_PROPERTIES), enabled_fn_sensor, lambda e, c: True, "unit-test", "sensor"
+        )
+        ai_entity = ACInfinityControllerEntity(
+            coordinator, ACInfinityController(AI_CONTROLLER_PROPERTIES), enabled_fn_sensor, lambda e, c: True, "unit-test", "sensor"
+        )
+
+        test_objects.ac_infinity._stale_controllers = frozenset({str(DEVICE_ID)})
+
+        assert entity.extra_state_attributes is not None
+        assert entity.extra_state_attributes["stale"]
+        assert ai_entity.extra_state_attributes is None
+
+    async def test_entity_state_written_only_when_generation_or_staleness_changes(self, setup):
+        """entities skip writing their state while neither the published values nor their staleness changed"""
+        test_objects: ACTestObjects = setup
+        entity = ACInfinityControllerEntity(
+            test_objects.coordinator, ACInfinityController(CONTROLLER_PROPERTIES), enabled_fn_sensor, lambda e, c: True, "unit-test", "sensor"
+        )
+
+        entity._handle_coordinator_update()
+        entity._handle_coordinator_update()
+        assert test_objects.write_ha_mock.call_count == 1
+
+        publish(test_objects.ac_infinity, device_settings={**test_objects.ac_infinity._device_settings, (str(DEVICE_ID), 0): {}})
+        entity._handle_coordinator_update()
+        assert test_objects.write_ha_mock.call_count == 2
+
+        test_objects.ac_infinity._stale_controllers = frozenset({str(DEVICE_ID)})
+        entity._handle_coordinator_update()
+        assert test_objects.write_ha_mock.call_count == 3
+
+    async def test_snapshot_round_trip_served_stale_until_refresh(self, mock_client):
+        """a persisted snapshot survives json serialization and is served, marked stale, until the next refresh"""
+        source = ACInfinityService(mock_client)
+        publish(
+            source,
+            controller_properties=CONTROLLER_PROPERTIES_DATA,
+            device_properties=DEVICE_PROPERTIES_DATA,
+            device_controls=DEVICE_CONTROLS_DATA,
+            device_settings=DEVICE_SETTINGS_DATA,
+            sensor_properties=SENSOR_PROPERTIES_DATA,
+        )
+        source._last_updated_from_api = {(str(DEVICE_ID), 1): dt_util.utcnow()}
+
+        snapshot = json.loads(json.dumps(source.export_snapshot()))
+
+        ac_infinity = ACInfinityService(mock_client)
+        assert ac_infinity.load_snapshot(snapshot)
+        assert ac_infinity.is_stale
+        assert ac_infinity._controller_properties == CONTROLLER_PROPERTIES_DATA
+        assert ac_infinity._device_properties == DEVICE_PROPERTIES_DATA
+        assert ac_infinity._device_controls == DEVICE_CONTROLS_DATA
+        assert ac_infinity._device_settings == DEVICE_SETTINGS_DATA
+        assert ac_infinity._sensor_properties == SENSOR_PROPERTIES_DATA
+        assert ac_infinity._last_updated_from_api == source._last_updated_from_api
+
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
+        mock_client.get_device_mode_settings.return_value = DEVICE_CONTROLS
+        await ac_infinity.refresh()
+        assert not ac_infinity.is_stale
+
+    @pytest.mark.parametrize("snapshot", [{}, {"version": 0}, {"version": 1, "controller_properties": []}, {"version": 1, "controller_properties": [["a"]]}])
+    async def test_snapshot_unusable_not_loaded(self, mock_client, snapshot):
+        """empty, outdated or malformed snapshots are ignored"""
+        ac_infinity = ACInfinityService(mock_client)
+        assert not ac_infinity.load_snapshot(snapshot)
+        assert not ac_infinity.is_stale
+
+    async def test_refresh_keeps_only_projected_fields(self, mock_client):
+        """fields no entity reads are dropped from the properties as a refresh ingests them"""
+        projection = ACInfinityPropertyProjection.from_descriptions(SENSOR_DESCRIPTIONS.values())
+        ac_infinity = ACInfinityService(mock_client, property_projection=projection)
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
+        mock_client.get_device_mode_settings.return_value = DEVICE_CONTROLS
+        await ac_infinity.refresh()
+
+        assert ac_infinity.raw_payload is None
+        assert "wifiName" not in ac_infinity._controller_properties[str(DEVICE_ID)]
+        assert "portResistance" not in ac_infinity._device_properties[(str(DEVICE_ID), 1)]
+        assert ac_infinity.get_controller_property(DEVICE_ID, ControllerPropertyKey.DEVICE_NAME) == DEVICE_NAME
+        assert ac_infinity.get_sensor_property_exists(AI_DEVICE_ID, CONTROLLER_ACCESS_PORT, SensorType.CONTROLLER_HUMIDITY, SensorPropertyKey.SENSOR_DATA)
+        assert ac_infinity.get_device_control_exists(DEVICE_ID, 1, DeviceControlKey.ON_SPEED)
+
+    async def test_refresh_keeps_raw_payload_when_asked(self, mock_client):
+        """the payload as returned by the API is kept for diagnostics only when asked for"""
+        projection = ACInfinityPropertyProjection([])
+        ac_infinity = ACInfinityService(mock_client, property_projection=projection, keep_raw_payload=True)
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
+        mock_client.get_device_mode_settings.return_value = DEVICE_CONTROLS
+        await ac_infinity.refresh()
+
+        assert ac_infinity.raw_payload is DEVICE_INFO_LIST_ALL
+        assert "wifiName" not in ac_infinity._controller_properties[str(DEVICE_ID)]
+
+    async def test_snapshot_projected_with_fewer_fields_not_loaded(self, mock_client):
+        """a snapshot saved before entities read a field is ignored, a projected snapshot of the same fields is not"""
+        source = ACInfinityService(mock_client, property_projection=ACInfinityPropertyProjection([]))
+        publish(source, controller_properties=CONTROLLER_PROPERTIES_DATA)
+        snapshot = json.loads(json.dumps(source.export_snapshot()))
+
+        projection = ACInfinityPropertyProjection.from_descriptions(SENSOR_DESCRIPTIONS.values())
+        assert not ACInfinityService(mock_client, property_projection=projection).load_snapshot(snapshot)
+        assert ACInfinityService(mock_client, property_projection=ACInfinityPropertyProjection([])).load_snapshot(snapshot)
+
+        snapshot["property_keys"] = None
+        ac_infinity = ACInfinityService(mock_client, property_projection=projection)
+        assert ac_infinity.load_snapshot(snapshot)
+        assert "wifiName" not in ac_infinity._controller_properties[str(DEVICE_ID)]
+
     async def test_update_retried_on_failure(self, mocker: MockFixture, mock_client):
         """update should be tried 5 times before raising an exception"""
         future: Future = asyncio.Future()
         future.set_result(None)
 
-        mocker.patch("asyncio.sleep", return_value=future)
+        mocker.patch("asyncio.sleep", return_value=future)
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.side_effect = ACInfinityClientCannotConnect("unit-test")
+        mock_client.get_device_mode_settings.return_value = DEVICE_CONTROLS
+
+
+        ac_infinity = ACInfinityService(mock_client)
+
+        with pytest.raises(ACInfinityClientCannotConnect):
+            await ac_infinity.refresh()
+
+        assert mock_client.get_account_controllers.call_count == 5
+
+    @pytest.mark.parametrize(
+        "exception_type",
+        [
+            ACInfinityClientCannotConnect("unit-test"),
+            ACInfinityClientRequestFailed("unit-test"),
+            aiohttp.ClientError("unit-test"),
+            asyncio.TimeoutError(),
+        ],
+    )
+    async def test_refresh_retries_on_retryable_exceptions(
+        self, mocker: MockFixture, mock_client, exception_type
+    ):
+        """refresh should retry on retryable exceptions"""
+        future: Future = asyncio.Future()
+        future.set_result(None)
+
+        mocker.patch("asyncio.sleep", return_value=future)
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.side_effect = exception_type
+
+        ac_infinity = ACInfinityService(mock_client)
+
+        with pytest.raises(type(exception_type)):
+            await ac_infinity.refresh()
+
+        # Should retry 5 times total (initial + 4 retries)
+        assert mock_client.get_account_controllers.call_count == 5
+
+    async def test_refresh_raises_immediately_on_invalid_auth(
+        self, mocker: MockFixture, mock_client
+    ):
+        """refresh should raise immediately on authentication failure without retrying"""
+        future: Future = asyncio.Future()
+        future.set_result(None)
+
+        mocker.patch("asyncio.sleep", return_value=future)
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.side_effect = ACInfinityClientInvalidAuth("unit-test")
+
+        ac_infinity = ACInfinityService(mock_client)
+
+        with pytest.raises(ACInfinityClientInvalidAuth):
+            await ac_infinity.refresh()
+
+        # Should NOT retry on auth failure
+        assert mock_client.get_account_controllers.call_count == 1
+
+    async def test_refresh_raises_immediately_on_unexpected_exception(
+        self, mocker: MockFixture, mock_client
+    ):
+        """refresh should raise immediately on unexpected exceptions without retrying"""
+        future: Future = asyncio.Future()
+        future.set_result(None)
+
+        mocker.patch("asyncio.sleep", return_value=future)
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.side_effect = ValueError("unexpected error")
+
+        ac_infinity = ACInfinityService(mock_client)
+
+        with pytest.raises(ValueError):
+            await ac_infinity.refresh()
+
+        # Should NOT retry on unexpected exceptions
+        assert mock_client.get_account_controllers.call_count == 1
+
+    async def test_refresh_retries_back_off_exponentially(self, mocker: MockFixture, mock_client):
+        """each retry waits roughly twice as long as the one before it, less up to half of it in jitter"""
+        future: Future = asyncio.Future()
+        future.set_result(None)
+
+        sleep = mocker.patch("asyncio.sleep", return_value=future)
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.side_effect = ACInfinityClientCannotConnect("unit-test")
+
+        ac_infinity = ACInfinityService(mock_client)
+        with pytest.raises(ACInfinityClientCannotConnect):
+            await ac_infinity.refresh()
+
+        delays = [args[0] for args, _ in sleep.call_args_list]
+        assert len(delays) == 4
+        for delay, expected in zip(delays, [0.5, 1.0, 2.0, 4.0]):
+            assert expected / 2 <= delay <= expected
+
+    async def test_refresh_circuit_opens_after_repeated_failures(self, mocker: MockFixture, mock_client):
+        """once refreshes have failed repeatedly, further calls are skipped without touching the API"""
+        future: Future = asyncio.Future()
+        future.set_result(None)
+
+        mocker.patch("asyncio.sleep", return_value=future)
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.side_effect = ACInfinityClientCannotConnect("unit-test")
+
+        ac_infinity = ACInfinityService(mock_client, request_executor=ACInfinityRequestExecutor(ACInfinityCircuitBreaker(failure_threshold=2)))
+        for _ in range(2):
+            with pytest.raises(ACInfinityClientCannotConnect):
+                await ac_infinity.refresh()
+
+        mock_client.get_account_controllers.reset_mock()
+        with pytest.raises(ACInfinityCircuitOpen):
+            await ac_infinity.refresh()
+
+        mock_client.get_account_controllers.assert_not_called()
+        stats = ac_infinity.request_stats
+        assert stats["circuit_state"] == ACInfinityCircuitBreaker.OPEN
+        assert stats["consecutive_failures"] == 2
+        assert stats["calls"] == 3
+        assert stats["attempts"] == 10
+        assert stats["retries"] == 8
+        assert stats["failures"] == 2
+        assert stats["rejected"] == 1
+
+    async def test_refresh_circuit_closes_after_successful_trial(self, mocker: MockFixture, mock_client):
+        """after the reset timeout a single trial call is let through, and its success closes the circuit"""
+        future: Future = asyncio.Future()
+        future.set_result(None)
+
+        mocker.patch("asyncio.sleep", return_value=future)
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.side_effect = ACInfinityClientCannotConnect("unit-test")
+        mock_client.get_device_mode_settings.return_value = DEVICE_CONTROLS
+
+        breaker = ACInfinityCircuitBreaker(failure_threshold=1, reset_timeout=0)
+        ac_infinity = ACInfinityService(mock_client, request_executor=ACInfinityRequestExecutor(breaker))
+        with pytest.raises(ACInfinityClientCannotConnect):
+            await ac_infinity.refresh()
+
+        assert breaker.state == ACInfinityCircuitBreaker.HALF_OPEN
+
+        mock_client.get_account_controllers.side_effect = None
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
+        await ac_infinity.refresh()
+
+        assert breaker.state == ACInfinityCircuitBreaker.CLOSED
+        assert breaker.consecutive_failures == 0
+
+    async def test_circuit_half_open_allows_a_single_trial(self):
+        """while a trial call is in flight, other calls are still skipped"""
+        breaker = ACInfinityCircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+        breaker.record_failure()
+        breaker.release(trial=True)
+        assert breaker.allow_request()
+
+    async def test_circuit_half_open_trial_not_released_by_other_calls(self):
+        """a call allowed before the circuit opened finishing does not let a second trial call through"""
+        breaker = ACInfinityCircuitBreaker(failure_threshold=1, reset_timeout=0)
+        executor = ACInfinityRequestExecutor(breaker)
+        policy = ACInfinityRetryPolicy("unit-test", max_retries=0)
+        earlier_call_sent = asyncio.Event()
+        earlier_call_done = asyncio.Event()
+        trial_done = asyncio.Event()
+
+        async def earlier_call(retry: int):
+            earlier_call_sent.set()
+            await earlier_call_done.wait()
+            raise ACInfinityClientInvalidAuth("unit-test")
+
+        async def trial_call(retry: int):
+            await trial_done.wait()
+
+        async def other_call(retry: int):
+            return None
+
+        earlier = asyncio.create_task(executor.execute(policy, earlier_call))
+        await earlier_call_sent.wait()
+
+        breaker.record_failure()
+        trial = asyncio.create_task(executor.execute(policy, trial_call))
+        await asyncio.sleep(0)
+
+        earlier_call_done.set()
+        with pytest.raises(ACInfinityClientInvalidAuth):
+            await earlier
+
+        with pytest.raises(ACInfinityCircuitOpen):
+            await executor.execute(policy, other_call)
+
+        trial_done.set()
+        await trial
+        assert breaker.state == ACInfinityCircuitBreaker.CLOSED
+
+    async def test_refresh_retries_limited_by_retry_budget(self, mocker: MockFixture, mock_client):
+        """retries stop once the retry budget is spent, and successful calls earn it back"""
+        future: Future = asyncio.Future()
+        future.set_result(None)
+
+        mocker.patch("asyncio.sleep", return_value=future)
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.side_effect = ACInfinityClientCannotConnect("unit-test")
+
+        ac_infinity = ACInfinityService(mock_client, request_executor=ACInfinityRequestExecutor(retry_budget=2))
+        with pytest.raises(ACInfinityClientCannotConnect):
+            await ac_infinity.refresh()
+
+        assert mock_client.get_account_controllers.call_count == 3
+        assert ac_infinity.request_stats["retry_budget"] == 0
+
+    async def test_refresh_auth_failure_does_not_open_circuit(self, mocker: MockFixture, mock_client):
+        """authentication failures mean the API answered, so they are not counted against it"""
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.side_effect = ACInfinityClientInvalidAuth("unit-test")
+
+        ac_infinity = ACInfinityService(mock_client, request_executor=ACInfinityRequestExecutor(ACInfinityCircuitBreaker(failure_threshold=1)))
+        for _ in range(3):
+            with pytest.raises(ACInfinityClientInvalidAuth):
+                await ac_infinity.refresh()
+
+        assert ac_infinity.request_stats["circuit_state"] == ACInfinityCircuitBreaker.CLOSED
+        assert mock_client.get_account_controllers.call_count == 3
+
+    async def test_refresh_not_retried_past_deadline(self, mocker: MockFixture, mock_client):
+        """retries stop once the time left until the deadline could not cover the backoff before them"""
+        sleep = mocker.patch("asyncio.sleep")
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.side_effect = ACInfinityClientCannotConnect("unit-test")
+
+        ac_infinity = ACInfinityService(mock_client)
+        with pytest.raises(ACInfinityClientCannotConnect):
+            await ac_infinity.refresh(ACInfinityDeadline(0.1))
+
+        assert mock_client.get_account_controllers.call_count == 1
+        sleep.assert_not_called()
+
+    async def test_refresh_commits_ports_read_before_deadline(self, mock_client):
+        """ports not read by the deadline keep their previous values, while everything read in time is kept"""
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
+
+        async def get_device_mode_settings(controller_id, device_port):
+            if device_port == 2:
+                raise ACInfinityClientDeadlineExceeded("unit-test")
+            return {**DEVICE_CONTROLS, DeviceControlKey.ON_SPEED: 7}
+
+        mock_client.get_device_mode_settings.side_effect = get_device_mode_settings
+
+        ac_infinity = ACInfinityService(mock_client)
+        publish(ac_infinity, device_controls={(str(DEVICE_ID), 2): {DeviceControlKey.ON_SPEED: 3}}, device_settings={})
+        await ac_infinity.refresh(ACInfinityDeadline(0))
+
+        assert not ac_infinity.last_refresh_complete
+        assert not ac_infinity.is_stale
+        assert ac_infinity.get_device_control(str(DEVICE_ID), 1, DeviceControlKey.ON_SPEED) == 7
+        assert ac_infinity.get_device_control(str(DEVICE_ID), 2, DeviceControlKey.ON_SPEED) == 3
+
+    async def test_refresh_skips_ports_request_budget_would_not_allow(self, mocker: MockFixture, mock_client):
+        """a port whose request the budget would only allow past the deadline is skipped like one the deadline cut
+        short, without retries or counting against the circuit breaker, while the other ports are published"""
+        sleep = mocker.patch("asyncio.sleep")
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
+
+        async def get_device_mode_settings(controller_id, device_port):
+            if device_port != 1:
+                raise ACInfinityClientDeadlineExceeded("unit-test")
+            return {**DEVICE_CONTROLS, DeviceControlKey.ON_SPEED: 7}
+
+        mock_client.get_device_mode_settings.side_effect = get_device_mode_settings
+
+        ac_infinity = ACInfinityService(mock_client)
+        await ac_infinity.refresh(ACInfinityDeadline(10))
+
+        assert not ac_infinity.last_refresh_complete
+        assert not ac_infinity.is_stale
+        assert ac_infinity.get_device_control(str(DEVICE_ID), 1, DeviceControlKey.ON_SPEED) == 7
+        assert ac_infinity.request_stats["retries"] == 0
+        assert ac_infinity.request_stats["consecutive_failures"] == 0
+        sleep.assert_not_called()
+
+    async def test_refresh_deadline_errors_raised_before_deadline(self, mock_client):
+        """a timeout while time is still left is a failure of the request, not the deadline, and fails the refresh"""
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
+        mock_client.get_device_mode_settings.side_effect = TimeoutError()
+
+        ac_infinity = ACInfinityService(mock_client, request_executor=ACInfinityRequestExecutor(retry_budget=0))
+        with pytest.raises(TimeoutError):
+            await ac_infinity.refresh(ACInfinityDeadline(10))
+
+    async def test_refresh_reads_mode_settings_only_once_due(self, mock_client):
+        """with a settings max age, later refreshes only read the controller properties until the mode settings are due"""
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
+        mock_client.get_device_mode_settings.return_value = DEVICE_CONTROLS
+
+        ac_infinity = ACInfinityService(mock_client)
+        await ac_infinity.refresh(settings_max_age=300)
+        assert mock_client.get_device_mode_settings.call_count > 0
+
+        mock_client.get_device_mode_settings.reset_mock()
+        await ac_infinity.refresh(settings_max_age=300)
+
+        assert mock_client.get_account_controllers.call_count == 2
+        mock_client.get_device_mode_settings.assert_not_called()
+
+        await ac_infinity.refresh(settings_max_age=0)
+        assert mock_client.get_device_mode_settings.call_count > 0
+
+    @pytest.mark.parametrize(
+        "changed_key,expected_ports",
+        [
+            (DevicePropertyKey.CURRENT_MODE, {(str(DEVICE_ID), 2)}),
+            (DevicePropertyKey.ONLINE, {(str(DEVICE_ID), 2)}),
+            (DevicePropertyKey.SPEAK, set()),
+            (DevicePropertyKey.REMAINING_TIME, set()),
+        ],
+    )
+    async def test_refresh_reads_mode_settings_of_port_whose_summary_changed(self, mock_client, changed_key, expected_ports):
+        """a port whose configuration summary changed has its mode settings read before they are due; live readings don't count"""
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
+        mock_client.get_device_mode_settings.return_value = DEVICE_CONTROLS
+
+        ac_infinity = ACInfinityService(mock_client)
+        await ac_infinity.refresh(settings_max_age=300)
+
+        changed = [copy.deepcopy(DEVICE_INFO_LIST_ALL[0]), *DEVICE_INFO_LIST_ALL[1:]]
+        port = changed[0][ControllerPropertyKey.DEVICE_INFO][ControllerPropertyKey.PORTS][1]
+        port[changed_key] = 99
+        mock_client.get_account_controllers.return_value = changed
+        mock_client.get_device_mode_settings.reset_mock()
+
+        await ac_infinity.refresh(settings_max_age=300)
+
+        ports = {args for args, _ in mock_client.get_device_mode_settings.call_args_list}
+        assert ports == expected_ports
+
+    async def test_refresh_skips_settings_filtered_out(self, mock_client):
+        """ports the settings filter leaves out, and the controller, are never read; their properties still are"""
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
+        mock_client.get_device_mode_settings.return_value = DEVICE_CONTROLS
+
+        ac_infinity = ACInfinityService(mock_client)
+        await ac_infinity.refresh(settings_filter=lambda controller_id, port: controller_id == str(DEVICE_ID) and port == 2)
+
+        ports = {args for args, _ in mock_client.get_device_mode_settings.call_args_list}
+        assert ports == {(str(DEVICE_ID), 2)}
+        assert ac_infinity.get_device_property_exists(str(DEVICE_ID), 1, DevicePropertyKey.SPEAK)
+
+    async def test_refresh_reads_mode_settings_of_written_port_again(self, mocker: MockFixture, mock_client):
+        """a port written to since its mode settings were read has them read again on the next refresh"""
+        future: Future = asyncio.Future()
+        future.set_result(None)
+
+        mocker.patch("asyncio.sleep", return_value=future)
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
+        mock_client.get_device_mode_settings.return_value = DEVICE_CONTROLS
+        mock_client.update_device_controls.return_value = future
+
+        ac_infinity = ACInfinityService(mock_client)
+        await ac_infinity.refresh(settings_max_age=300)
+
+        controller = ACInfinityController(CONTROLLER_PROPERTIES)
+        await ac_infinity.update_device_controls(controller.devices[0], {DeviceControlKey.AT_TYPE: 2})
+
+        mock_client.get_device_mode_settings.reset_mock()
+        await ac_infinity.refresh(settings_max_age=300)
+
+        ports = {args for args, _ in mock_client.get_device_mode_settings.call_args_list}
+        assert ports == {(str(DEVICE_ID), 1)}
+
+    async def test_refresh_publishes_values_at_once(self, mock_client):
+        """values read by a refresh are only served once all of them are, so reads in between see the previous refresh"""
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
+        mock_client.get_device_mode_settings.return_value = DEVICE_CONTROLS
+
+        ac_infinity = ACInfinityService(mock_client)
+        await ac_infinity.refresh()
+        previous = ac_infinity.snapshot
+
+        served = []
+
+        async def get_device_mode_settings(controller_id, device_port):
+            await asyncio.sleep(0)
+            served.append(ac_infinity.snapshot)
+            return {**DEVICE_CONTROLS, DeviceControlKey.ON_SPEED: 7}
+
+        mock_client.get_device_mode_settings.side_effect = get_device_mode_settings
+        await ac_infinity.refresh()
+
+        assert served and all(snapshot is previous for snapshot in served)
+        assert ac_infinity.generation == previous.generation + 1
+        assert ac_infinity.get_device_control(DEVICE_ID, 1, DeviceControlKey.ON_SPEED) == 7
+        assert previous.device_controls[(str(DEVICE_ID), 1)][DeviceControlKey.ON_SPEED] != 7
+
+    async def test_generation_unchanged_while_values_are(self, mock_client):
+        """refreshes that read the same values keep the generation, so consumers can skip their work"""
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
+        mock_client.get_device_mode_settings.return_value = DEVICE_CONTROLS
+
+        ac_infinity = ACInfinityService(mock_client)
+        await ac_infinity.refresh()
+        generation = ac_infinity.generation
+
+        await ac_infinity.refresh()
+        assert ac_infinity.generation == generation
+
+        mock_client.get_device_mode_settings.return_value = {**DEVICE_CONTROLS, DeviceControlKey.ON_SPEED: 7}
+        await ac_infinity.refresh()
+        assert ac_infinity.generation == generation + 1
+
+    async def test_snapshot_is_read_only(self, mock_client):
+        """published snapshots can't be changed in place"""
+        ac_infinity = ACInfinityService(mock_client)
+        publish(ac_infinity, device_controls=DEVICE_CONTROLS_DATA)
+
+        with pytest.raises(TypeError):
+            ac_infinity.snapshot.device_controls[(str(DEVICE_ID), 1)] = {}  # type: ignore[index]
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            ac_infinity.snapshot.generation = 0  # type: ignore[misc]
+
+    async def test_refresh_keeps_previous_values_of_failed_controller(self, mock_client):
+        """a controller whose requests fail keeps its previous values and is marked stale, and its ports keep the time
+        they were last read at, while the others refresh"""
         mock_client.is_logged_in.return_value = True
-        mock_client.get_account_controllers.side_effect = ACInfinityClientCannotConnect("unit-test")
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
         mock_client.get_device_mode_settings.return_value = DEVICE_CONTROLS
 
-
         ac_infinity = ACInfinityService(mock_client)
+        await ac_infinity.refresh()
+        previous = ac_infinity._device_controls[(str(DEVICE_ID), 1)]
+        last_read = dt_util.utcnow() - timedelta(minutes=1)
+        ac_infinity._last_updated_from_api = dict.fromkeys(ac_infinity._last_updated_from_api, last_read)
 
-        with pytest.raises(ACInfinityClientCannotConnect):
-            await ac_infinity.refresh()
+        async def get_device_mode_settings(controller_id, device_port):
+            if controller_id == str(DEVICE_ID):
+                raise ACInfinityClientCannotConnect("unit-test")
+            return {**DEVICE_CONTROLS, DeviceControlKey.AT_TYPE: 1}
 
-        assert mock_client.get_account_controllers.call_count == 5
+        mock_client.get_device_mode_settings.side_effect = get_device_mode_settings
+        await ac_infinity.refresh()
+
+        assert ac_infinity.stale_controllers == {str(DEVICE_ID)}
+        assert ac_infinity.get_is_stale(DEVICE_ID)
+        assert not ac_infinity.get_is_stale(AI_DEVICE_ID)
+        assert ac_infinity._device_controls[(str(DEVICE_ID), 1)] is previous
+        assert ac_infinity._device_controls[(str(AI_DEVICE_ID), 1)][DeviceControlKey.AT_TYPE] == 1
+        assert ac_infinity.get_last_updated_from_api(DEVICE_ID, 0) == last_read
+        assert ac_infinity.get_last_updated_from_api(DEVICE_ID, 1) == last_read
+        assert ac_infinity.get_last_updated_from_api(AI_DEVICE_ID, 1) not in (None, last_read)
+
+        mock_client.get_device_mode_settings.side_effect = None
+        await ac_infinity.refresh()
+
+        assert ac_infinity.stale_controllers == frozenset()
+        assert not ac_infinity.get_is_stale(DEVICE_ID)
 
     @pytest.mark.parametrize(
-        "exception_type",
+        "failing,error",
         [
-            ACInfinityClientCannotConnect("unit-test"),
-            ACInfinityClientRequestFailed("unit-test"),
-            aiohttp.ClientError("unit-test"),
-            asyncio.TimeoutError(),
+            ({str(DEVICE_ID), str(AI_DEVICE_ID)}, ACInfinityClientCannotConnect("unit-test")),
+            ({str(DEVICE_ID)}, ACInfinityClientInvalidAuth("unit-test")),
         ],
     )
-    async def test_refresh_retries_on_retryable_exceptions(
-        self, mocker: MockFixture, mock_client, exception_type
-    ):
-        """refresh should retry on retryable exceptions"""
+    async def test_refresh_fails_on_account_wide_failure(self, mocker: MockFixture, mock_client, failing, error):
+        """the refresh still fails if every controller fails, or if one fails because the login expired"""
         future: Future = asyncio.Future()
         future.set_result(None)
 
         mocker.patch("asyncio.sleep", return_value=future)
         mock_client.is_logged_in.return_value = True
-        mock_client.get_account_controllers.side_effect = exception_type
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
 
-        ac_infinity = ACInfinityService(mock_client)
+        async def get_device_mode_settings(controller_id, device_port):
+            if controller_id in failing:
+                raise error
+            return DEVICE_CONTROLS
 
-        with pytest.raises(type(exception_type)):
+        mock_client.get_device_mode_settings.side_effect = get_device_mode_settings
+
+        ac_infinity = ACInfinityService(mock_client)
+        with pytest.raises(type(error)):
             await ac_infinity.refresh()
 
-        # Should retry 5 times total (initial + 4 retries)
-        assert mock_client.get_account_controllers.call_count == 5
+        assert ac_infinity.is_stale
 
-    async def test_refresh_raises_immediately_on_invalid_auth(
-        self, mocker: MockFixture, mock_client
-    ):
-        """refresh should raise immediately on authentication failure without retrying"""
+    async def test_refresh_reads_due_settings_round_robin(self, mock_client):
+        """settings due on every refresh are read a bounded slice at a time, those never read first, then the longest
+        overdue"""
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
+        mock_client.get_device_mode_settings.return_value = DEVICE_CONTROLS
+
+        await ACInfinityService(mock_client).refresh(settings_max_age=0)
+        everything = {args for args, _ in mock_client.get_device_mode_settings.call_args_list}
+        slices = -(-len(everything) // 3)
+        assert slices > 1
+
+        # the first read of every port is spread across one refresh per slice
+        ac_infinity = ACInfinityService(mock_client, max_requests_per_refresh=3)
+        read: set[tuple] = set()
+        for refresh in range(slices):
+            mock_client.get_device_mode_settings.reset_mock()
+            await ac_infinity.refresh(settings_max_age=0)
+            ports = {args for args, _ in mock_client.get_device_mode_settings.call_args_list}
+            assert len(ports) <= 3
+            assert bool(ac_infinity.awaiting_first_read) == (refresh < slices - 1)
+            read |= ports
+
+        assert read == everything
+
+        # every port is read again within one refresh per slice
+        read = set()
+        for _ in range(slices):
+            mock_client.get_device_mode_settings.reset_mock()
+            await ac_infinity.refresh(settings_max_age=0)
+            ports = {args for args, _ in mock_client.get_device_mode_settings.call_args_list}
+            assert len(ports) <= 3
+            read |= ports
+
+        assert read == everything
+
+    async def test_refresh_reads_changed_ports_ahead_of_overdue_ones(self, mock_client):
+        """a port whose summary shows a change is read ahead of ports that are merely due"""
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
+        mock_client.get_device_mode_settings.return_value = DEVICE_CONTROLS
+
+        ac_infinity = ACInfinityService(mock_client, max_requests_per_refresh=1)
+        await ac_infinity.refresh(settings_max_age=0)
+        while ac_infinity.awaiting_first_read:
+            await ac_infinity.refresh(settings_max_age=0)
+
+        changed = [copy.deepcopy(DEVICE_INFO_LIST_ALL[0]), *DEVICE_INFO_LIST_ALL[1:]]
+        changed[0]["deviceInfo"]["ports"][2][DevicePropertyKey.CURRENT_MODE] = AtType.OFF
+        mock_client.get_account_controllers.return_value = changed
+        mock_client.get_device_mode_settings.reset_mock()
+        await ac_infinity.refresh(settings_max_age=0)
+
+        ports = {args for args, _ in mock_client.get_device_mode_settings.call_args_list}
+        assert ports == {(str(DEVICE_ID), changed[0]["deviceInfo"]["ports"][2][DevicePropertyKey.PORT])}
+
+    async def test_service_stores_belong_to_one_instance(self, mocker: MockFixture):
+        """each service, such as one per account or the one created by a reload, holds only what it refreshed itself"""
+        client = mocker.create_autospec(ACInfinityClient, spec_set=True)
+        client.is_logged_in.return_value = True
+        client.get_account_controllers.return_value = [CONTROLLER_PROPERTIES]
+        client.get_device_mode_settings.return_value = DEVICE_CONTROLS
+        other_client = mocker.create_autospec(ACInfinityClient, spec_set=True)
+        other_client.is_logged_in.return_value = True
+        other_client.get_account_controllers.return_value = [AI_CONTROLLER_PROPERTIES]
+        other_client.get_device_mode_settings.return_value = DEVICE_CONTROLS
+
+        ac_infinity = ACInfinityService(client)
+        other_account = ACInfinityService(other_client)
+        await ac_infinity.refresh()
+        await other_account.refresh()
+
+        assert ac_infinity.get_device_ids() == [str(DEVICE_ID)]
+        assert other_account.get_device_ids() == [str(AI_DEVICE_ID)]
+        assert {key[0] for key in ac_infinity._device_controls} == {str(DEVICE_ID)}
+
+        reloaded = ACInfinityService(client)
+        assert reloaded.get_device_ids() == []
+
+        await reloaded.refresh()
+        assert len(reloaded._device_properties) == len(CONTROLLER_PROPERTIES["deviceInfo"]["ports"])
+
+    async def test_service_memory_bounded_across_refreshes_and_released_on_close(self, mock_client):
+        """refreshing again doesn't grow the stores, and a closed service is not kept alive by anything shared"""
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
+        mock_client.get_device_mode_settings.return_value = DEVICE_CONTROLS
+
+        ac_infinity = ACInfinityService(mock_client)
+        await ac_infinity.refresh(settings_max_age=0)
+        sizes = [len(store) for store in ac_infinity.export_snapshot().values() if isinstance(store, list)]
+        for _ in range(5):
+            await ac_infinity.refresh(settings_max_age=0)
+        assert [len(store) for store in ac_infinity.export_snapshot().values() if isinstance(store, list)] == sizes
+
+        await ac_infinity.close()
+        assert ac_infinity.get_device_ids() == []
+        assert ac_infinity.export_snapshot()["last_updated_from_api"] == []
+        assert not ac_infinity._snapshot_fetched_at
+        assert not ac_infinity._port_fingerprints
+
+        released = weakref.ref(ac_infinity)
+        del ac_infinity
+        gc.collect()
+        assert released() is None
+
+    async def test_refresh_evicts_removed_controllers_and_ports(self, mock_client):
+        """controllers and ports no longer on the account are dropped from every store"""
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
+        mock_client.get_device_mode_settings.return_value = DEVICE_CONTROLS
+
+        ac_infinity = ACInfinityService(mock_client)
+        await ac_infinity.refresh()
+        assert (str(AI_DEVICE_ID), 0) in ac_infinity._device_settings
+
+        remaining = copy.deepcopy(CONTROLLER_PROPERTIES)
+        removed_port = remaining["deviceInfo"]["ports"].pop()[DevicePropertyKey.PORT]
+        mock_client.get_account_controllers.return_value = [remaining]
+        await ac_infinity.refresh()
+
+        assert ac_infinity.get_device_ids() == [str(DEVICE_ID)]
+        for store in (
+            ac_infinity._device_properties,
+            ac_infinity._device_controls,
+            ac_infinity._device_settings,
+            ac_infinity._last_updated_from_api,
+            ac_infinity._snapshot_fetched_at,
+            ac_infinity._port_fingerprints,
+        ):
+            assert all(str(key[0]) == str(DEVICE_ID) for key in store)
+            assert (str(DEVICE_ID), removed_port) not in store
+        assert all(str(key[0]) == str(DEVICE_ID) for key in ac_infinity._sensor_properties)
+
+    @pytest.mark.parametrize("max_concurrent_requests", [1, 3])
+    async def test_refresh_port_requests_limited_by_concurrency_cap(self, mock_client, max_concurrent_requests):
+        """per-port requests are sent concurrently, but never more than the configured cap at once for each controller"""
+        in_flight: dict[str, int] = {}
+        max_in_flight: dict[str, int] = {}
+
+        async def get_device_mode_settings(controller_id, device_port):
+            in_flight[controller_id] = in_flight.get(controller_id, 0) + 1
+            max_in_flight[controller_id] = max(max_in_flight.get(controller_id, 0), in_flight[controller_id])
+            await asyncio.sleep(0.01)
+            in_flight[controller_id] -= 1
+            return DEVICE_CONTROLS
+
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
+        mock_client.get_device_mode_settings.side_effect = get_device_mode_settings
+
+        ac_infinity = ACInfinityService(mock_client, max_concurrent_requests=max_concurrent_requests)
+        await ac_infinity.refresh()
+
+        assert max(max_in_flight.values()) == max_concurrent_requests
+        assert ac_infinity._device_controls[(str(DEVICE_ID), 4)] == DEVICE_CONTROLS
+
+    async def test_refresh_duration_bounded_by_slowest_request(self, mock_client):
+        """with requests sent concurrently, refresh takes about as long as the slowest request rather than the sum"""
+
+        async def get_device_mode_settings(controller_id, device_port):
+            await asyncio.sleep(0.05)
+            return DEVICE_CONTROLS
+
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
+        mock_client.get_device_mode_settings.side_effect = get_device_mode_settings
+
+        ac_infinity = ACInfinityService(mock_client, max_concurrent_requests=16)
+        assert ac_infinity.last_refresh_duration is None
+
+        await ac_infinity.refresh()
+
+        # 2 controllers, 8 ports, 2 requests per port; sequentially this would take at least 0.9 seconds
+        assert ac_infinity.last_refresh_duration is not None
+        assert ac_infinity.last_refresh_duration < 0.5
+
+    async def test_refresh_remaining_requests_cancelled_on_failure(self, mocker: MockFixture, mock_client):
+        """when one port request fails, the others are cancelled and the whole refresh is retried"""
         future: Future = asyncio.Future()
         future.set_result(None)
 
         mocker.patch("asyncio.sleep", return_value=future)
         mock_client.is_logged_in.return_value = True
-        mock_client.get_account_controllers.side_effect = ACInfinityClientInvalidAuth("unit-test")
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
+        mock_client.get_device_mode_settings.side_effect = ACInfinityClientCannotConnect("unit-test")
 
         ac_infinity = ACInfinityService(mock_client)
 
-        with pytest.raises(ACInfinityClientInvalidAuth):
+        with pytest.raises(ACInfinityClientCannotConnect):
             await ac_infinity.refresh()
 
-        # Should NOT retry on auth failure
-        assert mock_client.get_account_controllers.call_count == 1
+        assert mock_client.get_account_controllers.call_count == 5
+        assert ac_infinity.last_refresh_duration is None
 
-    async def test_refresh_raises_immediately_on_unexpected_exception(
-        self, mocker: MockFixture, mock_client
-    ):
-        """refresh should raise immediately on unexpected exceptions without retrying"""
+    async def test_refresh_begins_new_client_generation_per_attempt(self, mocker: MockFixture, mock_client):
+        """each refresh attempt starts a new client generation so memoized reads from earlier attempts are not reused"""
         future: Future = asyncio.Future()
         future.set_result(None)
 
         mocker.patch("asyncio.sleep", return_value=future)
         mock_client.is_logged_in.return_value = True
-        mock_client.get_account_controllers.side_effect = ValueError("unexpected error")
+        mock_client.get_account_controllers.side_effect = [
+            ACInfinityClientCannotConnect("unit-test"),
+            DEVICE_INFO_LIST_ALL,
+        ]
+        mock_client.get_device_mode_settings.return_value = DEVICE_CONTROLS
 
         ac_infinity = ACInfinityService(mock_client)
+        await ac_infinity.refresh()
 
-        with pytest.raises(ValueError):
-            await ac_infinity.refresh()
-
-        # Should NOT retry on unexpected exceptions
-        assert mock_client.get_account_controllers.call_count == 1
+        assert mock_client.begin_refresh_generation.call_count == 2
 
     @pytest.mark.parametrize(
         "property_key, value",
@@ -224,7 +1308,7 @@ class TestACInfinity:
     ):
         """getting a device property returns the correct value"""
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA)
 
         result = ac_infinity.get_controller_property_exists(device_id, property_key)
         assert result == (value if device_id != "12345" else False)
@@ -244,7 +1328,7 @@ class TestACInfinity:
     ):
         """getting a device property returns the correct value"""
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA)
 
         result = ac_infinity.get_controller_property(device_id, property_key)
         assert result == value
@@ -262,11 +1346,30 @@ class TestACInfinity:
     ):
         """the absence of a value should return None instead of keyerror"""
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA)
 
         result = ac_infinity.get_controller_property(device_id, property_key)
         assert result is None
 
+    async def test_records_flatten_nested_fields_with_outer_fields_winning(self, mock_client):
+        """records merge deviceInfo into the controller properties and devSetting into the port controls"""
+        ac_infinity = ACInfinityService(mock_client)
+        publish(
+            ac_infinity,
+            controller_properties={"1": {"devName": "outer", ControllerPropertyKey.DEVICE_INFO: {"devName": "inner", "nested": 1}}},
+            device_controls={("1", 1): {"onSpead": None, DeviceControlKey.DEV_SETTING: {"onSpead": 5, "nested": 2}}},
+        )
+
+        record = ac_infinity.snapshot.records["1"][1]
+        assert record.properties is None
+        assert record.settings is None
+        assert ac_infinity.get_controller_property(1, "devName") == "outer"
+        assert ac_infinity.get_controller_property(1, "nested") == 1
+        assert ac_infinity.get_device_control(1, 1, "onSpead", 3) == 3
+        assert ac_infinity.get_device_control(1, 1, "nested") == 2
+        assert ac_infinity.get_device_control_exists(1, 1, "nested")
+        assert not ac_infinity.get_device_control_exists(1, 2, "nested")
+
     @pytest.mark.parametrize(
         "property_key, value",
         [
@@ -281,7 +1384,7 @@ class TestACInfinity:
     ):
         """getting a device property returns the correct value"""
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._sensor_properties = SENSOR_PROPERTIES_DATA
+        publish(ac_infinity, sensor_properties=SENSOR_PROPERTIES_DATA)
 
         result = ac_infinity.get_sensor_property_exists(
             device_id,
@@ -304,7 +1407,7 @@ class TestACInfinity:
     ):
         """getting a device property returns the correct value"""
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._sensor_properties = SENSOR_PROPERTIES_DATA
+        publish(ac_infinity, sensor_properties=SENSOR_PROPERTIES_DATA)
 
         result = ac_infinity.get_sensor_property(
             device_id,
@@ -354,7 +1457,7 @@ class TestACInfinity:
     ):
         """the absence of a value should return None instead of keyerror"""
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA)
 
         result = ac_infinity.get_sensor_property(
             device_id, access_port, sensor_type, property_key
@@ -375,8 +1478,7 @@ class TestACInfinity:
     ):
         """getting a port property gets the correct property from the correct port"""
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_properties = DEVICE_PROPERTIES_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_properties=DEVICE_PROPERTIES_DATA)
 
         result = ac_infinity.get_device_property_exists(device_id, 1, property_key)
         assert result == (value if device_id != "12345" else False)
@@ -396,8 +1498,7 @@ class TestACInfinity:
     ):
         """getting a port property gets the correct property from the correct port"""
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_properties = DEVICE_PROPERTIES_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_properties=DEVICE_PROPERTIES_DATA)
 
         result = ac_infinity.get_device_property(device_id, port_num, property_key)
         assert result == value
@@ -417,8 +1518,7 @@ class TestACInfinity:
     ):
         """the absence of a value should return None instead of keyerror"""
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_properties = DEVICE_PROPERTIES_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_properties=DEVICE_PROPERTIES_DATA)
 
         result = ac_infinity.get_device_property(device_id, port_num, property_key)
         assert result is None
@@ -426,7 +1526,7 @@ class TestACInfinity:
     async def test_get_device_all_device_meta_data_returns_meta_data(self, mock_client):
         """getting port device ids should return ids"""
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA)
 
         result = ac_infinity.get_all_controller_properties()
         assert len(result) > 0
@@ -488,11 +1588,49 @@ class TestACInfinity:
     async def test_get_device_all_device_meta_data_returns_empty_list(self, mock_client, data):
         """getting device metadata returns empty list if no device exists or data isn't initialized"""
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = data
+        publish(ac_infinity, controller_properties=data)
 
         result = ac_infinity.get_all_controller_properties()
         assert result == []
 
+    async def test_get_all_controller_properties_models_reused_until_topology_changes(self, mock_client):
+        """the models are shared between calls, surviving value changes, and rebuilt only for a changed controller"""
+        ac_infinity = ACInfinityService(mock_client)
+        publish(ac_infinity, controller_properties={str(DEVICE_ID): copy.deepcopy(CONTROLLER_PROPERTIES), str(AI_DEVICE_ID): copy.deepcopy(AI_CONTROLLER_PROPERTIES)})
+        controller, ai_controller = ac_infinity.get_all_controller_properties()
+        assert not hasattr(controller, "__dict__")
+
+        controller_properties = copy.deepcopy(dict(ac_infinity._controller_properties))
+        controller_properties[str(DEVICE_ID)][ControllerPropertyKey.DEVICE_INFO][ControllerPropertyKey.TEMPERATURE] += 1
+        publish(ac_infinity, controller_properties=controller_properties)
+        assert ac_infinity.get_all_controller_properties()[0] is controller
+
+        controller_properties = copy.deepcopy(controller_properties)
+        controller_properties[str(DEVICE_ID)][ControllerPropertyKey.DEVICE_INFO][ControllerPropertyKey.PORTS][0][DevicePropertyKey.NAME] = "Renamed"
+        publish(ac_infinity, controller_properties=controller_properties)
+        renamed, same = ac_infinity.get_all_controller_properties()
+        assert renamed is not controller
+        assert renamed.devices[0].device_name == "Renamed"
+        assert same is ai_controller
+
+    async def test_topology_changes_since_reports_added_and_removed(self, mock_client):
+        """controllers, ports and sensors that appear or disappear between topologies are reported"""
+        ac_infinity = ACInfinityService(mock_client)
+        publish(ac_infinity, controller_properties={str(DEVICE_ID): copy.deepcopy(CONTROLLER_PROPERTIES)})
+        first = ac_infinity.topology
+        assert (str(DEVICE_ID), 1) in first.changes_since(None).added
+        assert not first.changes_since(first)
+
+        controller_properties = {str(AI_DEVICE_ID): copy.deepcopy(AI_CONTROLLER_PROPERTIES), **copy.deepcopy(dict(ac_infinity._controller_properties))}
+        controller_properties[str(DEVICE_ID)][ControllerPropertyKey.DEVICE_INFO][ControllerPropertyKey.PORTS].pop()
+        publish(ac_infinity, controller_properties=controller_properties)
+
+        change = ac_infinity.topology.changes_since(first)
+        assert change.removed == {(str(DEVICE_ID), 4)}
+        assert (str(AI_DEVICE_ID),) in change.added
+        assert (str(AI_DEVICE_ID), CONTROLLER_ACCESS_PORT, SensorType.CONTROLLER_HUMIDITY) in change.added
+        assert (str(DEVICE_ID),) not in change.added
+
     @pytest.mark.parametrize(
         "dev_type,expected_model",
         [
@@ -509,8 +1647,9 @@ class TestACInfinity:
     ):
         """getting device returns a model object that contains correct device info for the device registry"""
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA)
         ac_infinity._controller_properties[str(DEVICE_ID)]["devType"] = dev_type
+        republish(ac_infinity)
 
         result = ac_infinity.get_all_controller_properties()
         assert len(result) > 0
@@ -540,8 +1679,7 @@ class TestACInfinity:
     ):
         """getting a port setting gets the correct setting from the correct port"""
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_controls=DEVICE_CONTROLS_DATA)
 
         result = ac_infinity.get_device_control_exists(device_id, 1, setting_key)
         assert result == (value if device_id != "12345" else False)
@@ -564,8 +1702,7 @@ class TestACInfinity:
     ):
         """getting a port setting gets the correct setting from the correct port"""
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_controls=DEVICE_CONTROLS_DATA)
 
         result = ac_infinity.get_device_control(device_id, 1, setting_key)
         assert result == value
@@ -577,10 +1714,10 @@ class TestACInfinity:
     ):
         """getting a port setting returns 0 instead of null if the key exists but the value is null"""
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_controls=DEVICE_CONTROLS_DATA)
 
         ac_infinity._device_controls[(str(DEVICE_ID), 1)][DeviceControlKey.SURPLUS] = None
+        republish(ac_infinity)
 
         result = ac_infinity.get_device_control(
             device_id, 1, DeviceControlKey.SURPLUS, default_value=default_value
@@ -601,9 +1738,12 @@ class TestACInfinity:
     ):
         """getting a port setting gets the correct setting from the correct port"""
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_settings = DEVICE_SETTINGS_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
+        publish(
+            ac_infinity,
+            controller_properties=CONTROLLER_PROPERTIES_DATA,
+            device_settings=DEVICE_SETTINGS_DATA,
+            device_controls=DEVICE_CONTROLS_DATA,
+        )
 
         result = ac_infinity.get_controller_setting_exists(device_id, setting_key)
         assert result == (value if device_id != "12345" else False)
@@ -621,9 +1761,12 @@ class TestACInfinity:
     ):
         """getting a port setting gets the correct setting from the correct port"""
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_settings = DEVICE_SETTINGS_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
+        publish(
+            ac_infinity,
+            controller_properties=CONTROLLER_PROPERTIES_DATA,
+            device_settings=DEVICE_SETTINGS_DATA,
+            device_controls=DEVICE_CONTROLS_DATA,
+        )
 
         result = ac_infinity.get_controller_setting(device_id, setting_key)
         assert result == value
@@ -635,13 +1778,17 @@ class TestACInfinity:
     ):
         """getting a port setting returns 0 instead of null if the key exists but the value is null"""
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
-        ac_infinity._device_settings = DEVICE_SETTINGS_DATA
+        publish(
+            ac_infinity,
+            controller_properties=CONTROLLER_PROPERTIES_DATA,
+            device_controls=DEVICE_CONTROLS_DATA,
+            device_settings=DEVICE_SETTINGS_DATA,
+        )
 
         ac_infinity._device_settings[(str(DEVICE_ID), 1)][
             AdvancedSettingsKey.CALIBRATE_HUMIDITY
         ] = None
+        republish(ac_infinity)
 
         result = ac_infinity.get_controller_setting(
             device_id,
@@ -665,8 +1812,7 @@ class TestACInfinity:
     ):
         """the absence of a value should return None instead of keyerror"""
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_settings = DEVICE_SETTINGS_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_settings=DEVICE_SETTINGS_DATA)
 
         result = ac_infinity.get_device_setting(device_id, port_num, setting_key)
         assert result is None
@@ -689,8 +1835,7 @@ class TestACInfinity:
     ):
         """the absence of a value should return None instead of keyerror"""
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_controls=DEVICE_CONTROLS_DATA)
 
         result = ac_infinity.get_device_control(device_id, 1, setting_key)
         assert result is None
@@ -703,13 +1848,12 @@ class TestACInfinity:
         mock_client.update_device_controls.return_value = future
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_controls=DEVICE_CONTROLS_DATA)
 
         controller = ACInfinityController(CONTROLLER_PROPERTIES)
         await ac_infinity.update_device_control(controller.devices[0], DeviceControlKey.AT_TYPE, 2)
 
-        mock_client.update_device_controls.assert_called_with(str(DEVICE_ID), 1, {DeviceControlKey.AT_TYPE: 2})
+        mock_client.update_device_controls.assert_called_with(str(DEVICE_ID), 1, {DeviceControlKey.AT_TYPE: 2}, existing_values=None)
 
     async def test_update_port_controls(self, mock_client):
         future: Future = asyncio.Future()
@@ -719,13 +1863,12 @@ class TestACInfinity:
         mock_client.update_device_controls.return_value = future
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_controls=DEVICE_CONTROLS_DATA)
 
         controller = ACInfinityController(CONTROLLER_PROPERTIES)
         await ac_infinity.update_device_controls(controller.devices[0], {DeviceControlKey.AT_TYPE: 2})
 
-        mock_client.update_device_controls.assert_called_with(str(DEVICE_ID), 1, {DeviceControlKey.AT_TYPE: 2})
+        mock_client.update_device_controls.assert_called_with(str(DEVICE_ID), 1, {DeviceControlKey.AT_TYPE: 2}, existing_values=None)
 
     async def test_update_port_controls_retried_on_failure(self, mocker: MockFixture, mock_client):
         """updating settings should be tried 5 times before failing"""
@@ -736,8 +1879,7 @@ class TestACInfinity:
         mock_client.update_device_controls.side_effect = ACInfinityClientCannotConnect("unit-test")
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_controls=DEVICE_CONTROLS_DATA)
 
         controller = ACInfinityController(CONTROLLER_PROPERTIES)
         with pytest.raises(ACInfinityClientCannotConnect):
@@ -765,8 +1907,7 @@ class TestACInfinity:
         mock_client.update_device_controls.side_effect = exception_type
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_controls=DEVICE_CONTROLS_DATA)
 
         controller = ACInfinityController(CONTROLLER_PROPERTIES)
         with pytest.raises(type(exception_type)):
@@ -786,8 +1927,7 @@ class TestACInfinity:
         mock_client.update_device_controls.side_effect = ACInfinityClientInvalidAuth("unit-test")
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_controls=DEVICE_CONTROLS_DATA)
 
         controller = ACInfinityController(CONTROLLER_PROPERTIES)
         with pytest.raises(ACInfinityClientInvalidAuth):
@@ -807,8 +1947,7 @@ class TestACInfinity:
         mock_client.update_device_controls.side_effect = ValueError("unexpected error")
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_controls=DEVICE_CONTROLS_DATA)
 
         controller = ACInfinityController(CONTROLLER_PROPERTIES)
         with pytest.raises(ValueError):
@@ -825,7 +1964,7 @@ class TestACInfinity:
         mock_client.update_device_settings.return_value = future
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA)
 
         controller = ACInfinityController(CONTROLLER_PROPERTIES)
         await ac_infinity.update_controller_setting(
@@ -833,7 +1972,7 @@ class TestACInfinity:
         )
 
         mock_client.update_device_settings.assert_called_with(
-            str(DEVICE_ID), 0, DEVICE_NAME, {AdvancedSettingsKey.CALIBRATE_HUMIDITY: 2}
+            str(DEVICE_ID), 0, DEVICE_NAME, {AdvancedSettingsKey.CALIBRATE_HUMIDITY: 2}, existing_values=None
         )
 
     async def test_update_controller_settings(self, mock_client):
@@ -844,8 +1983,7 @@ class TestACInfinity:
         mock_client.update_device_settings.return_value = future
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_settings = DEVICE_SETTINGS_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_settings=DEVICE_SETTINGS_DATA)
 
         controller = ACInfinityController(CONTROLLER_PROPERTIES)
         await ac_infinity.update_controller_settings(
@@ -853,13 +1991,13 @@ class TestACInfinity:
         )
 
         mock_client.update_device_settings.assert_called_with(
-            str(DEVICE_ID), 0, DEVICE_NAME, {AdvancedSettingsKey.CALIBRATE_HUMIDITY: 2}
+            str(DEVICE_ID), 0, DEVICE_NAME, {AdvancedSettingsKey.CALIBRATE_HUMIDITY: 2}, existing_values=None
         )
 
     async def test_update_controller_settings_raises_for_ai_controller(self, mock_client):
         """updating controller settings should raise NotImplementedError for AI controllers"""
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA)
 
         ai_controller = ACInfinityController(AI_CONTROLLER_PROPERTIES)
 
@@ -879,9 +2017,12 @@ class TestACInfinity:
         mock_client.update_device_settings.side_effect = ACInfinityClientCannotConnect("unit-test")
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
-        ac_infinity._device_settings = DEVICE_SETTINGS_DATA
+        publish(
+            ac_infinity,
+            controller_properties=CONTROLLER_PROPERTIES_DATA,
+            device_controls=DEVICE_CONTROLS_DATA,
+            device_settings=DEVICE_SETTINGS_DATA,
+        )
 
         controller = ACInfinityController(CONTROLLER_PROPERTIES)
         with pytest.raises(ACInfinityClientCannotConnect):
@@ -911,9 +2052,12 @@ class TestACInfinity:
         mock_client.update_device_settings.side_effect = exception_type
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
-        ac_infinity._device_settings = DEVICE_SETTINGS_DATA
+        publish(
+            ac_infinity,
+            controller_properties=CONTROLLER_PROPERTIES_DATA,
+            device_controls=DEVICE_CONTROLS_DATA,
+            device_settings=DEVICE_SETTINGS_DATA,
+        )
 
         controller = ACInfinityController(CONTROLLER_PROPERTIES)
         with pytest.raises(type(exception_type)):
@@ -935,9 +2079,12 @@ class TestACInfinity:
         mock_client.update_device_settings.side_effect = ACInfinityClientInvalidAuth("unit-test")
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
-        ac_infinity._device_settings = DEVICE_SETTINGS_DATA
+        publish(
+            ac_infinity,
+            controller_properties=CONTROLLER_PROPERTIES_DATA,
+            device_controls=DEVICE_CONTROLS_DATA,
+            device_settings=DEVICE_SETTINGS_DATA,
+        )
 
         controller = ACInfinityController(CONTROLLER_PROPERTIES)
         with pytest.raises(ACInfinityClientInvalidAuth):
@@ -959,9 +2106,12 @@ class TestACInfinity:
         mock_client.update_device_settings.side_effect = ValueError("unexpected error")
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
-        ac_infinity._device_settings = DEVICE_SETTINGS_DATA
+        publish(
+            ac_infinity,
+            controller_properties=CONTROLLER_PROPERTIES_DATA,
+            device_controls=DEVICE_CONTROLS_DATA,
+            device_settings=DEVICE_SETTINGS_DATA,
+        )
 
         controller = ACInfinityController(CONTROLLER_PROPERTIES)
         with pytest.raises(ValueError):
@@ -980,11 +2130,11 @@ class TestACInfinity:
         mock_client.update_device_settings.return_value = future
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_properties = DEVICE_PROPERTIES_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_properties=DEVICE_PROPERTIES_DATA)
         ac_infinity._device_properties[(str(DEVICE_ID), 1)][
             DevicePropertyKey.NAME
         ] = DEVICE_NAME
+        republish(ac_infinity)
 
         controller = ACInfinityController(CONTROLLER_PROPERTIES)
         await ac_infinity.update_device_setting(
@@ -996,6 +2146,7 @@ class TestACInfinity:
             1,
             DEVICE_NAME,
             {AdvancedSettingsKey.DYNAMIC_TRANSITION_HUMIDITY: 2},
+            existing_values=None,
         )
 
     async def test_update_port_settings(self, mock_client):
@@ -1006,11 +2157,11 @@ class TestACInfinity:
         mock_client.update_device_settings.return_value = future
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_properties = DEVICE_PROPERTIES_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_properties=DEVICE_PROPERTIES_DATA)
         ac_infinity._device_properties[(str(DEVICE_ID), 1)][
             DevicePropertyKey.NAME
         ] = DEVICE_NAME
+        republish(ac_infinity)
 
         controller = ACInfinityController(CONTROLLER_PROPERTIES)
         await ac_infinity.update_device_settings(
@@ -1022,6 +2173,7 @@ class TestACInfinity:
             1,
             DEVICE_NAME,
             {AdvancedSettingsKey.DYNAMIC_TRANSITION_HUMIDITY: 2},
+            existing_values=None,
         )
 
     async def test_update_port_settings_retried_on_failure(self, mocker: MockFixture, mock_client):
@@ -1033,8 +2185,7 @@ class TestACInfinity:
         mock_client.update_device_settings.side_effect = ACInfinityClientCannotConnect("unit-test")
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_controls=DEVICE_CONTROLS_DATA)
 
         controller = ACInfinityController(CONTROLLER_PROPERTIES)
         with pytest.raises(ACInfinityClientCannotConnect):
@@ -1064,8 +2215,7 @@ class TestACInfinity:
         mock_client.update_device_settings.side_effect = exception_type
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_controls=DEVICE_CONTROLS_DATA)
 
         controller = ACInfinityController(CONTROLLER_PROPERTIES)
         with pytest.raises(type(exception_type)):
@@ -1087,8 +2237,7 @@ class TestACInfinity:
         mock_client.update_device_settings.side_effect = ACInfinityClientInvalidAuth("unit-test")
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_controls=DEVICE_CONTROLS_DATA)
 
         controller = ACInfinityController(CONTROLLER_PROPERTIES)
         with pytest.raises(ACInfinityClientInvalidAuth):
@@ -1110,8 +2259,7 @@ class TestACInfinity:
         mock_client.update_device_settings.side_effect = ValueError("unexpected error")
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_controls=DEVICE_CONTROLS_DATA)
 
         controller = ACInfinityController(CONTROLLER_PROPERTIES)
         with pytest.raises(ValueError):
@@ -1131,14 +2279,13 @@ class TestACInfinity:
         mock_client.update_ai_device_control_and_settings.return_value = future
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_controls=DEVICE_CONTROLS_DATA)
 
         ai_controller = ACInfinityController(AI_CONTROLLER_PROPERTIES)
         await ac_infinity.update_device_control(ai_controller.devices[0], DeviceControlKey.AT_TYPE, 2)
 
         mock_client.update_ai_device_control_and_settings.assert_called_with(
-            str(AI_DEVICE_ID), 1, {DeviceControlKey.AT_TYPE: 2}
+            str(AI_DEVICE_ID), 1, {DeviceControlKey.AT_TYPE: 2}, existing_values=None
         )
 
     async def test_update_ai_device_controls(self, mock_client):
@@ -1150,14 +2297,13 @@ class TestACInfinity:
         mock_client.update_ai_device_control_and_settings.return_value = future
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_controls=DEVICE_CONTROLS_DATA)
 
         ai_controller = ACInfinityController(AI_CONTROLLER_PROPERTIES)
         await ac_infinity.update_device_controls(ai_controller.devices[0], {DeviceControlKey.AT_TYPE: 2})
 
         mock_client.update_ai_device_control_and_settings.assert_called_with(
-            str(AI_DEVICE_ID), 1, {DeviceControlKey.AT_TYPE: 2}
+            str(AI_DEVICE_ID), 1, {DeviceControlKey.AT_TYPE: 2}, existing_values=None
         )
 
     async def test_update_ai_device_settings(self, mock_client):
@@ -1169,8 +2315,7 @@ class TestACInfinity:
         mock_client.update_ai_device_control_and_settings.return_value = future
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_controls=DEVICE_CONTROLS_DATA)
 
         ai_controller = ACInfinityController(AI_CONTROLLER_PROPERTIES)
         await ac_infinity.update_device_settings(
@@ -1178,9 +2323,294 @@ class TestACInfinity:
         )
 
         mock_client.update_ai_device_control_and_settings.assert_called_with(
-            str(AI_DEVICE_ID), 1, {AdvancedSettingsKey.DYNAMIC_TRANSITION_HUMIDITY: 2}
+            str(AI_DEVICE_ID), 1, {AdvancedSettingsKey.DYNAMIC_TRANSITION_HUMIDITY: 2}, existing_values=None
+        )
+
+    async def __refreshed_service(self, mock_client) -> ACInfinityService:
+        future: Future = asyncio.Future()
+        future.set_result(None)
+
+        mock_client.is_logged_in.return_value = True
+        mock_client.get_account_controllers.return_value = DEVICE_INFO_LIST_ALL
+        mock_client.get_device_mode_settings.return_value = DEVICE_CONTROLS
+        mock_client.update_device_controls.return_value = future
+        mock_client.update_device_settings.return_value = future
+        mock_client.update_ai_device_control_and_settings.return_value = future
+
+        ac_infinity = ACInfinityService(mock_client)
+        await ac_infinity.refresh()
+        return ac_infinity
+
+    async def test_update_port_controls_built_from_fresh_snapshot(self, mock_client):
+        """a write made shortly after a refresh passes the refreshed values, with the written values applied,
+        so the client can skip its read"""
+        ac_infinity = await self.__refreshed_service(mock_client)
+
+        controller = ACInfinityController(CONTROLLER_PROPERTIES)
+        await ac_infinity.update_device_controls(controller.devices[0], {DeviceControlKey.AT_TYPE: 2})
+
+        args, kwargs = mock_client.update_device_controls.call_args
+        assert args == (str(DEVICE_ID), 1, {DeviceControlKey.AT_TYPE: 2})
+        assert kwargs["existing_values"][DeviceControlKey.ON_SPEED] == DEVICE_CONTROLS[DeviceControlKey.ON_SPEED]
+        assert kwargs["existing_values"][DeviceControlKey.AT_TYPE] == 2
+
+    async def test_update_port_settings_built_from_fresh_snapshot(self, mock_client):
+        """a settings write made shortly after a refresh passes the refreshed port settings"""
+        ac_infinity = await self.__refreshed_service(mock_client)
+
+        controller = ACInfinityController(CONTROLLER_PROPERTIES)
+        await ac_infinity.update_device_settings(controller.devices[0], {AdvancedSettingsKey.DYNAMIC_TRANSITION_HUMIDITY: 2})
+
+        mock_client.update_device_settings.assert_called_with(
+            str(DEVICE_ID),
+            1,
+            controller.devices[0].device_name,
+            {AdvancedSettingsKey.DYNAMIC_TRANSITION_HUMIDITY: 2},
+            existing_values={
+                **DEVICE_CONTROLS[DeviceControlKey.DEV_SETTING],
+                AdvancedSettingsKey.DYNAMIC_TRANSITION_HUMIDITY: 2,
+            },
+        )
+
+    async def test_update_ai_device_controls_built_from_fresh_snapshot(self, mock_client):
+        """an AI write made shortly after a refresh passes the refreshed values so the client can skip its read"""
+        ac_infinity = await self.__refreshed_service(mock_client)
+
+        ai_controller = ACInfinityController(AI_CONTROLLER_PROPERTIES)
+        await ac_infinity.update_device_controls(ai_controller.devices[0], {DeviceControlKey.AT_TYPE: 2})
+
+        args, kwargs = mock_client.update_ai_device_control_and_settings.call_args
+        assert args == (str(AI_DEVICE_ID), 1, {DeviceControlKey.AT_TYPE: 2})
+        assert kwargs["existing_values"][DeviceControlKey.ON_SPEED] == DEVICE_CONTROLS[DeviceControlKey.ON_SPEED]
+        assert kwargs["existing_values"][DeviceControlKey.AT_TYPE] == 2
+
+    async def test_update_port_controls_stale_snapshot_read_live(self, mock_client):
+        """a snapshot older than the freshness threshold is not used to build a write payload"""
+        ac_infinity = await self.__refreshed_service(mock_client)
+        ac_infinity._snapshot_fetched_at[(str(DEVICE_ID), 1)] -= DEFAULT_WRITE_SNAPSHOT_MAX_AGE + 1
+
+        controller = ACInfinityController(CONTROLLER_PROPERTIES)
+        await ac_infinity.update_device_controls(controller.devices[0], {DeviceControlKey.AT_TYPE: 2})
+
+        mock_client.update_device_controls.assert_called_with(
+            str(DEVICE_ID), 1, {DeviceControlKey.AT_TYPE: 2}, existing_values=None
+        )
+
+    async def test_update_port_controls_stale_snapshot_not_built_from_memoized_read(self):
+        """a write whose snapshot is too old sends a read of its own, rather than reusing the one the client memoized
+        for the refresh that took the snapshot"""
+        client = ACInfinityClient(HOST, EMAIL, PASSWORD)
+        client._user_id = USER_ID
+        ac_infinity = ACInfinityService(client, write_coalesce_window=0)
+
+        def count_reads() -> int:
+            return sum(len(calls) for (_, url), calls in mocked.requests.items() if API_URL_GET_DEV_MODE_SETTING in str(url))
+
+        try:
+            with aioresponses() as mocked:
+                mocked.post(f"{HOST}{API_URL_GET_DEVICE_INFO_LIST_ALL}", status=200, payload=DEVICE_INFO_LIST_ALL_PAYLOAD)
+                mocked.post(
+                    re.compile(rf"{HOST}{API_URL_GET_DEV_MODE_SETTING}.*"),
+                    status=200,
+                    payload=GET_DEV_MODE_SETTING_LIST_PAYLOAD,
+                    repeat=True,
+                )
+                mocked.post(re.compile(rf"{HOST}{API_URL_ADD_DEV_MODE}.*"), status=200, payload=UPDATE_SUCCESS_PAYLOAD)
+
+                await ac_infinity.refresh()
+                refresh_reads = count_reads()
+                ac_infinity._snapshot_fetched_at[(str(DEVICE_ID), 1)] -= DEFAULT_WRITE_SNAPSHOT_MAX_AGE + 1
+
+                controller = ACInfinityController(CONTROLLER_PROPERTIES)
+                await ac_infinity.update_device_controls(controller.devices[0], {DeviceControlKey.AT_TYPE: 2})
+
+                assert count_reads() == refresh_reads + 1
+        finally:
+            await ac_infinity.close()
+
+    async def test_update_port_controls_snapshot_not_reused_after_write(self, mock_client):
+        """once a write lands the snapshot no longer reflects the port, so the next write reads it live"""
+        ac_infinity = await self.__refreshed_service(mock_client)
+
+        controller = ACInfinityController(CONTROLLER_PROPERTIES)
+        await ac_infinity.update_device_controls(controller.devices[0], {DeviceControlKey.AT_TYPE: 2})
+        await ac_infinity.update_device_controls(controller.devices[0], {DeviceControlKey.ON_SPEED: 5})
+
+        mock_client.update_device_controls.assert_called_with(
+            str(DEVICE_ID), 1, {DeviceControlKey.ON_SPEED: 5}, existing_values=None
+        )
+
+    async def test_update_port_controls_retry_reads_live(self, mocker: MockFixture, mock_client):
+        """only the first attempt of a write uses the snapshot; retries read the port live"""
+        future: Future = asyncio.Future()
+        future.set_result(None)
+        ac_infinity = await self.__refreshed_service(mock_client)
+
+        mocker.patch("asyncio.sleep", return_value=future)
+        mock_client.update_device_controls.side_effect = [ACInfinityClientCannotConnect("unit-test"), None]
+
+        controller = ACInfinityController(CONTROLLER_PROPERTIES)
+        await ac_infinity.update_device_controls(controller.devices[0], {DeviceControlKey.AT_TYPE: 2})
+
+        first, second = mock_client.update_device_controls.call_args_list
+        assert first.kwargs["existing_values"][DeviceControlKey.ON_SPEED] == DEVICE_CONTROLS[DeviceControlKey.ON_SPEED]
+        assert second.kwargs["existing_values"] is None
+
+    async def test_update_port_controls_burst_coalesced_into_one_call(self, mock_client):
+        """writes to the same port within the coalesce window are merged into a single call, later values winning"""
+        mock_client.is_logged_in.return_value = True
+        ac_infinity = ACInfinityService(mock_client, write_coalesce_window=0.05)
+
+        controller = ACInfinityController(CONTROLLER_PROPERTIES)
+        device = controller.devices[0]
+        await asyncio.gather(
+            ac_infinity.update_device_control(device, DeviceControlKey.ON_SPEED, 2),
+            ac_infinity.update_device_control(device, DeviceControlKey.OFF_SPEED, 1),
+            ac_infinity.update_device_control(device, DeviceControlKey.ON_SPEED, 7),
+        )
+
+        mock_client.update_device_controls.assert_called_once_with(
+            str(DEVICE_ID), 1, {DeviceControlKey.ON_SPEED: 7, DeviceControlKey.OFF_SPEED: 1}, existing_values=None
+        )
+
+    async def test_update_port_controls_different_ports_not_coalesced(self, mock_client):
+        """writes to different ports are sent separately"""
+        mock_client.is_logged_in.return_value = True
+        ac_infinity = ACInfinityService(mock_client, write_coalesce_window=0.05)
+
+        controller = ACInfinityController(CONTROLLER_PROPERTIES)
+        await asyncio.gather(
+            ac_infinity.update_device_control(controller.devices[0], DeviceControlKey.ON_SPEED, 2),
+            ac_infinity.update_device_control(controller.devices[1], DeviceControlKey.ON_SPEED, 3),
+        )
+
+        assert mock_client.update_device_controls.call_count == 2
+
+    async def test_update_ai_device_controls_and_settings_coalesced_into_one_call(self, mock_client):
+        """AI controls and settings share an endpoint, so writes to both are merged into one call"""
+        mock_client.is_logged_in.return_value = True
+        ac_infinity = ACInfinityService(mock_client, write_coalesce_window=0.05)
+
+        ai_controller = ACInfinityController(AI_CONTROLLER_PROPERTIES)
+        device = ai_controller.devices[0]
+        await asyncio.gather(
+            ac_infinity.update_device_control(device, DeviceControlKey.AT_TYPE, 2),
+            ac_infinity.update_device_setting(device, AdvancedSettingsKey.DYNAMIC_TRANSITION_HUMIDITY, 4),
+        )
+
+        mock_client.update_ai_device_control_and_settings.assert_called_once_with(
+            str(AI_DEVICE_ID),
+            1,
+            {DeviceControlKey.AT_TYPE: 2, AdvancedSettingsKey.DYNAMIC_TRANSITION_HUMIDITY: 4},
+            existing_values=None,
+        )
+
+    async def test_update_port_controls_coalesced_failure_raised_to_every_caller(self, mock_client):
+        """when a merged write fails, every caller waiting on it receives the error"""
+        mock_client.is_logged_in.return_value = True
+        mock_client.update_device_controls.side_effect = ValueError("unexpected error")
+        ac_infinity = ACInfinityService(mock_client, write_coalesce_window=0.05)
+
+        controller = ACInfinityController(CONTROLLER_PROPERTIES)
+        device = controller.devices[0]
+        results = await asyncio.gather(
+            ac_infinity.update_device_control(device, DeviceControlKey.ON_SPEED, 2),
+            ac_infinity.update_device_control(device, DeviceControlKey.OFF_SPEED, 1),
+            return_exceptions=True,
         )
 
+        assert all(isinstance(result, ValueError) for result in results)
+        assert mock_client.update_device_controls.call_count == 1
+
+    async def test_update_port_controls_queued_during_write_sent_after_it(self, mock_client):
+        """writes queued while an earlier write is in flight are sent in a following call, after it lands"""
+        mock_client.is_logged_in.return_value = True
+        ac_infinity = ACInfinityService(mock_client, write_coalesce_window=0)
+        controller = ACInfinityController(CONTROLLER_PROPERTIES)
+        device = controller.devices[0]
+
+        in_flight = asyncio.Event()
+        release = asyncio.Event()
+        sent: list[dict] = []
+
+        async def update_device_controls(controller_id, device_port, key_values, existing_values=None):
+            sent.append(key_values)
+            in_flight.set()
+            await release.wait()
+
+        mock_client.update_device_controls.side_effect = update_device_controls
+
+        first = asyncio.ensure_future(ac_infinity.update_device_control(device, DeviceControlKey.ON_SPEED, 2))
+        await in_flight.wait()
+        second = asyncio.ensure_future(ac_infinity.update_device_control(device, DeviceControlKey.ON_SPEED, 3))
+        third = asyncio.ensure_future(ac_infinity.update_device_control(device, DeviceControlKey.OFF_SPEED, 1))
+        await asyncio.sleep(0.01)
+        release.set()
+        await asyncio.gather(first, second, third)
+
+        assert sent == [
+            {DeviceControlKey.ON_SPEED: 2},
+            {DeviceControlKey.ON_SPEED: 3, DeviceControlKey.OFF_SPEED: 1},
+        ]
+
+    async def test_update_port_controls_applied_optimistically_before_write_lands(self, mock_client):
+        """written values are visible and listeners notified as soon as the write is queued"""
+        mock_client.is_logged_in.return_value = True
+        ac_infinity = ACInfinityService(mock_client, write_coalesce_window=0)
+        publish(ac_infinity, device_controls=DEVICE_CONTROLS_DATA)
+        notified: list[tuple[str, int]] = []
+        ac_infinity.add_listener(lambda controller_id, device_port: notified.append((controller_id, device_port)))
+
+        release = asyncio.Event()
+
+        async def update_device_controls(controller_id, device_port, key_values, existing_values=None):
+            await release.wait()
+
+        mock_client.update_device_controls.side_effect = update_device_controls
+
+        controller = ACInfinityController(CONTROLLER_PROPERTIES)
+        write = asyncio.ensure_future(ac_infinity.update_device_control(controller.devices[0], DeviceControlKey.ON_SPEED, 9))
+        await asyncio.sleep(0)
+
+        assert ac_infinity.get_device_control(str(DEVICE_ID), 1, DeviceControlKey.ON_SPEED) == 9
+        assert notified == [(str(DEVICE_ID), 1)]
+        assert not write.done()
+
+        release.set()
+        await write
+
+        # the shared test data is replaced, never modified
+        assert DEVICE_CONTROLS_DATA[(str(DEVICE_ID), 1)][DeviceControlKey.ON_SPEED] == DEVICE_CONTROLS[DeviceControlKey.ON_SPEED]
+
+    async def test_update_port_controls_rolled_back_on_failure(self, mock_client):
+        """when a write fails, the optimistically applied values are restored and the rollback counted"""
+        mock_client.is_logged_in.return_value = True
+        mock_client.update_device_controls.side_effect = ValueError("unexpected error")
+        ac_infinity = ACInfinityService(mock_client, write_coalesce_window=0)
+        publish(ac_infinity, device_controls=DEVICE_CONTROLS_DATA)
+
+        controller = ACInfinityController(CONTROLLER_PROPERTIES)
+        with pytest.raises(ValueError):
+            await ac_infinity.update_device_control(controller.devices[0], DeviceControlKey.ON_SPEED, 9)
+
+        assert ac_infinity.get_device_control(str(DEVICE_ID), 1, DeviceControlKey.ON_SPEED) == DEVICE_CONTROLS[DeviceControlKey.ON_SPEED]
+        assert ac_infinity.optimistic_rollbacks == 1
+
+    @pytest.mark.parametrize("reported_speed, expected_rollbacks", [(9, 0), (4, 1)])
+    async def test_refresh_reconciles_optimistic_values(self, mock_client, reported_speed, expected_rollbacks):
+        """the next read of a written port replaces optimistic values, counting a rollback if the API disagrees"""
+        ac_infinity = await self.__refreshed_service(mock_client)
+
+        controller = ACInfinityController(CONTROLLER_PROPERTIES)
+        await ac_infinity.update_device_control(controller.devices[0], DeviceControlKey.ON_SPEED, 9)
+        assert ac_infinity.get_device_control(str(DEVICE_ID), 1, DeviceControlKey.ON_SPEED) == 9
+
+        mock_client.get_device_mode_settings.return_value = {**DEVICE_CONTROLS, DeviceControlKey.ON_SPEED: reported_speed}
+        await ac_infinity.refresh_device(str(DEVICE_ID), 1)
+
+        assert ac_infinity.get_device_control(str(DEVICE_ID), 1, DeviceControlKey.ON_SPEED) == reported_speed
+        assert ac_infinity.optimistic_rollbacks == expected_rollbacks
+
     async def test_update_ai_device_controls_retried_on_failure(self, mocker: MockFixture, mock_client):
         """AI device controls update should be tried 5 times before failing"""
         future: Future = asyncio.Future()
@@ -1190,8 +2620,7 @@ class TestACInfinity:
         mock_client.update_ai_device_control_and_settings.side_effect = ACInfinityClientCannotConnect("unit-test")
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_controls=DEVICE_CONTROLS_DATA)
 
         ai_controller = ACInfinityController(AI_CONTROLLER_PROPERTIES)
         with pytest.raises(ACInfinityClientCannotConnect):
@@ -1219,8 +2648,7 @@ class TestACInfinity:
         mock_client.update_ai_device_control_and_settings.side_effect = exception_type
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_controls=DEVICE_CONTROLS_DATA)
 
         ai_controller = ACInfinityController(AI_CONTROLLER_PROPERTIES)
         with pytest.raises(type(exception_type)):
@@ -1240,8 +2668,7 @@ class TestACInfinity:
         mock_client.update_ai_device_control_and_settings.side_effect = ACInfinityClientInvalidAuth("unit-test")
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_controls=DEVICE_CONTROLS_DATA)
 
         ai_controller = ACInfinityController(AI_CONTROLLER_PROPERTIES)
         with pytest.raises(ACInfinityClientInvalidAuth):
@@ -1261,8 +2688,7 @@ class TestACInfinity:
         mock_client.update_ai_device_control_and_settings.side_effect = ValueError("unexpected error")
 
         ac_infinity = ACInfinityService(mock_client)
-        ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
-        ac_infinity._device_controls = DEVICE_CONTROLS_DATA
+        publish(ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA, device_controls=DEVICE_CONTROLS_DATA)
 
         ai_controller = ACInfinityController(AI_CONTROLLER_PROPERTIES)
         with pytest.raises(ValueError):
@@ -1327,6 +2753,48 @@ class TestACInfinity:
 
         assert len(entities) == (1 if is_enabled else 0)
 
+    async def test_entities_awaiting_first_read_added_once_read(self, mocker: MockFixture, setup):
+        """an entity of a port whose first read was spread to a later refresh is deferred rather than ignored, and is
+        added once that read lands"""
+        test_objects: ACTestObjects = setup
+        test_objects.ac_infinity._awaiting_first_read = frozenset({(str(DEVICE_ID), 0)})
+        add_listener = mocker.patch.object(test_objects.coordinator, "async_add_listener")
+        add_entities = mocker.MagicMock()
+
+        description = ACInfinityControllerSensorEntityDescription(
+            key=ControllerPropertyKey.TEMPERATURE,
+            device_class=SensorDeviceClass.TEMPERATURE,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+            icon=None,  # default
+            translation_key="temperature",
+            suggested_unit_of_measurement=None,
+            enabled_fn=lambda entry, device_id, entity_config_key: True,
+            suitable_fn=lambda e, c: not e.ac_infinity.get_is_awaiting_first_read(c.controller_id, 0),
+            get_value_fn=lambda e, c: None,
+        )
+
+        entity = ACInfinityControllerSensorEntity(
+            test_objects.coordinator,
+            description,
+            ACInfinityController(CONTROLLER_PROPERTIES),
+        )
+
+        entities = ACInfinityEntities(test_objects.config_entry)
+        entities.append_if_suitable(entity)
+        entities.async_add(test_objects.coordinator, add_entities)
+        add_entities.assert_called_once_with([])
+
+        add_read_entities = add_listener.call_args.args[0]
+        add_read_entities()
+        assert add_entities.call_count == 1
+
+        test_objects.ac_infinity._awaiting_first_read = frozenset()
+        add_read_entities()
+        add_read_entities()
+        assert add_entities.call_count == 2
+        add_entities.assert_called_with([entity])
+
     @pytest.mark.parametrize(
         "online_status, expected_available",
         [
@@ -1372,6 +2840,7 @@ class TestACInfinity:
         test_objects.ac_infinity._device_properties[(str(DEVICE_ID), port)][
             DevicePropertyKey.ONLINE
         ] = online_status
+        republish(test_objects.ac_infinity)
 
         # Check availability
         assert entity.available == expected_available
@@ -1455,6 +2924,7 @@ class TestACInfinity:
         test_objects.ac_infinity._device_controls[(str(DEVICE_ID), port)][
             DeviceControlKey.AT_TYPE
         ] = current_at_type
+        republish(test_objects.ac_infinity)
 
         # Check availability
         assert entity.available == expected_available
@@ -0,0 +1,49 @@
+import pytest
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from pytest_mock import MockFixture
+
+from custom_components.ac_infinity.client import API_URL_GET_DEVICE_INFO_LIST_ALL
+from custom_components.ac_infinity.core import ACInfinityCircuitBreaker
+from custom_components.ac_infinity.diagnostics import async_get_config_entry_diagnostics
+from tests import ACTestObjects, setup_entity_mocks
+
+
+@pytest.fixture
+def setup(mocker: MockFixture):
+    return setup_entity_mocks(mocker)
+
+
+@pytest.mark.asyncio
+class TestDiagnostics:
+    async def test_diagnostics_include_request_stats(self, setup):
+        """the circuit breaker and the call counters are in the diagnostics"""
+        test_objects: ACTestObjects = setup
+
+        diagnostics = await async_get_config_entry_diagnostics(test_objects.hass, test_objects.config_entry)
+
+        requests = diagnostics["requests"]
+        assert requests["circuit_state"] == ACInfinityCircuitBreaker.CLOSED
+        assert requests["calls"] == 0
+        assert diagnostics["refresh"]["polling_interval"] == 10
+        assert "raw_payload" not in diagnostics
+
+    async def test_diagnostics_include_requests_per_endpoint(self, setup):
+        """the requests sent in the last minute by endpoint and the part of the request budget left are in the diagnostics"""
+        test_objects: ACTestObjects = setup
+        rate_limiter = test_objects.ac_infinity._client.rate_limiter
+        await rate_limiter.acquire(API_URL_GET_DEVICE_INFO_LIST_ALL)
+        await rate_limiter.acquire(API_URL_GET_DEVICE_INFO_LIST_ALL)
+
+        diagnostics = await async_get_config_entry_diagnostics(test_objects.hass, test_objects.config_entry)
+
+        assert diagnostics["requests"]["requests_per_minute"] == {API_URL_GET_DEVICE_INFO_LIST_ALL: 2}
+        assert diagnostics["requests"]["request_budget_remaining"] < 1
+
+    async def test_diagnostics_redact_credentials(self, setup):
+        """the e-mail and password of the account are not in the diagnostics"""
+        test_objects: ACTestObjects = setup
+
+        diagnostics = await async_get_config_entry_diagnostics(test_objects.hass, test_objects.config_entry)
+
+        assert diagnostics["entry"][CONF_EMAIL] == "**REDACTED**"
+        assert diagnostics["entry"][CONF_PASSWORD] == "**REDACTED**"
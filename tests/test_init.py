@@ -1,33 +1,50 @@
 import asyncio
 from asyncio import Future
+from time import perf_counter
 from types import MappingProxyType
-from unittest.mock import AsyncMock, MagicMock
+from typing import cast
+from unittest.mock import AsyncMock, MagicMock, PropertyMock
 
 import pytest
 from homeassistant.config_entries import ConfigEntries, ConfigEntry, ConfigEntryState
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import UpdateFailed
 from homeassistant.util.hass_dict import HassDict
 from pytest_mock import MockFixture
 
 from custom_components.ac_infinity import (
+    _PROPERTY_PROJECTION,
     ACInfinityDataUpdateCoordinator,
     async_migrate_entry,
+    async_remove_entry,
     async_setup_entry,
     async_unload_entry,
 )
-from custom_components.ac_infinity.client import ACInfinityClient
+from custom_components.ac_infinity import binary_sensor, number, select, sensor, switch, time
+from custom_components.ac_infinity.client import ACInfinityClient, ACInfinityRateLimiter
 from custom_components.ac_infinity.const import (
     DOMAIN,
     PLATFORMS,
     ConfigurationKey,
     EntityConfigValue,
-    ControllerPropertyKey
+    ControllerPropertyKey,
+    DevicePropertyKey,
+    SensorPropertyKey,
+    SNAPSHOT_SAVE_DELAY,
+)
+from custom_components.ac_infinity.core import ACInfinityDescription, ACInfinityPropertyProjection, ACInfinityService
+from tests import HOST, CONFIG_ENTRY_DATA, publish
+from tests.data_models import (
+    AI_DEVICE_ID,
+    CONTROLLER_PROPERTIES_DATA,
+    DEVICE_CONTROLS_DATA,
+    DEVICE_ID,
+    DEVICE_PROPERTIES_DATA,
+    DEVICE_SETTINGS_DATA,
+    SENSOR_PROPERTIES_DATA,
 )
-from custom_components.ac_infinity.core import ACInfinityService
-from tests import HOST, CONFIG_ENTRY_DATA
-from tests.data_models import DEVICE_ID, AI_DEVICE_ID, CONTROLLER_PROPERTIES_DATA
 
 EMAIL = "myemail@unittest.com"
 PASSWORD = "hunter2"
@@ -45,6 +62,7 @@ def setup(mocker: MockFixture):
     mocker.patch.object(ACInfinityService, "refresh", return_value=future)
     mocker.patch.object(ACInfinityClient, "__init__", return_value=None)
     mocker.patch.object(ACInfinityClient, "close", return_value=future)
+    mocker.patch.object(ACInfinityClient, "rate_limiter", new_callable=PropertyMock, return_value=ACInfinityRateLimiter())
     mocker.patch.object(HomeAssistant, "__init__", return_value=None)
     mocker.patch.object(ConfigEntries, "__init__", return_value=None)
     mocker.patch.object(
@@ -102,6 +120,7 @@ class TestInit:
     async def test_async_unload_entry(self, setup):
         """When unloading, all platforms should be unloaded"""
         coordinator = MagicMock()
+        coordinator.async_flush_snapshot = AsyncMock()
         coordinator.ac_infinity.close = AsyncMock()
 
         hass: HomeAssistant
@@ -115,6 +134,33 @@ class TestInit:
         hass.config_entries.async_unload_platforms.assert_called_with(
             config_entry, PLATFORMS
         )
+        coordinator.async_flush_snapshot.assert_awaited_once()
+
+    async def test_property_projection_keeps_every_property_read_by_descriptions(self):
+        """a description naming a controller, port or sensor field as its key or data keys finds it after ingest"""
+        property_fields = {
+            value
+            for kind in (ControllerPropertyKey, DevicePropertyKey, SensorPropertyKey)
+            for name, value in vars(kind).items()
+            if not name.startswith("_") and isinstance(value, str)
+        }
+        descriptions: list[ACInfinityDescription] = [
+            *binary_sensor.CONTROLLER_DESCRIPTIONS,
+            *binary_sensor.SENSOR_DESCRIPTIONS.values(),
+            *binary_sensor.DEVICE_DESCRIPTIONS,
+            *number.CONTROLLER_DESCRIPTIONS,
+            *number.DEVICE_DESCRIPTIONS,
+            *select.CONTROLLER_DESCRIPTIONS,
+            *select.DEVICE_DESCRIPTIONS,
+            *sensor.CONTROLLER_DESCRIPTIONS,
+            *sensor.SENSOR_DESCRIPTIONS.values(),
+            *sensor.DEVICE_DESCRIPTIONS,
+            *switch.DEVICE_DESCRIPTIONS,
+            *time.DEVICE_DESCRIPTIONS,
+        ]
+
+        read = ACInfinityPropertyProjection.from_descriptions(descriptions).keys & property_fields
+        assert read <= _PROPERTY_PROJECTION.keys
 
     async def test_update_update_failed_thrown(self, mocker: MockFixture, setup):
         (hass, config_entry) = setup
@@ -163,7 +209,7 @@ class TestInit:
         mock_ac_infinity.close = AsyncMock(return_value=future)
 
         # Set up the service's internal data structures like the real service
-        mock_ac_infinity._controller_properties = CONTROLLER_PROPERTIES_DATA
+        publish(mock_ac_infinity, controller_properties=CONTROLLER_PROPERTIES_DATA)
 
         # Mock the get_device_ids method to return our test device IDs
         mock_ac_infinity.get_device_ids = MagicMock(return_value=[DEVICE_ID, AI_DEVICE_ID])
@@ -370,7 +416,7 @@ class TestInit:
         mock_ac_infinity.refresh = AsyncMock(return_value=future)
 
         # Set up the service's internal data structures with new device data
-        mock_ac_infinity._controller_properties = {**new_device_1_properties, **new_device_2_properties}
+        publish(mock_ac_infinity, controller_properties={**new_device_1_properties, **new_device_2_properties})
 
         # Mock the get_device_ids method to return our new test device IDs
         mock_ac_infinity.get_device_ids = MagicMock(return_value=[new_device_id_1, new_device_id_2])
@@ -415,3 +461,184 @@ class TestInit:
         assert device2_config["port_4"] == EntityConfigValue.SensorsOnly
         assert device2_config["port_5"] == EntityConfigValue.SensorsOnly
         assert device2_config["port_6"] == EntityConfigValue.SensorsOnly
+
+    @staticmethod
+    def __setup_startup_mocks(mocker: MockFixture, snapshot, refresh_delay: float):
+        """patch storage, the device registry and a slow refresh for the startup tests"""
+
+        async def slow_refresh(*args, **kwargs):
+            await asyncio.sleep(refresh_delay)
+
+        mocker.patch.object(ACInfinityService, "refresh", side_effect=slow_refresh)
+        mocker.patch.object(Store, "__init__", return_value=None)
+        mocker.patch.object(Store, "async_load", return_value=snapshot)
+        delay_save = mocker.patch.object(Store, "async_delay_save")
+        mocker.patch("custom_components.ac_infinity.dr.async_get")
+        mocker.patch("custom_components.ac_infinity.dr.async_entries_for_config_entry", return_value=[])
+        background_tasks: list[asyncio.Task] = []
+        mocker.patch.object(
+            ConfigEntry,
+            "async_create_background_task",
+            side_effect=lambda hass, target, name: background_tasks.append(asyncio.ensure_future(target)),
+        )
+        mocker.patch.object(ACInfinityDataUpdateCoordinator, "_schedule_refresh")
+        return delay_save, background_tasks
+
+    @staticmethod
+    def __snapshot() -> dict:
+        ac_infinity = ACInfinityService(MagicMock())
+        publish(
+            ac_infinity,
+            controller_properties=CONTROLLER_PROPERTIES_DATA,
+            device_properties=DEVICE_PROPERTIES_DATA,
+            device_controls=DEVICE_CONTROLS_DATA,
+            device_settings=DEVICE_SETTINGS_DATA,
+            sensor_properties=SENSOR_PROPERTIES_DATA,
+        )
+        return ac_infinity.export_snapshot()
+
+    async def test_async_setup_entry_serves_persisted_snapshot_without_waiting_for_refresh(self, mocker: MockFixture, setup):
+        """with a persisted snapshot, platforms are set up from it while the first refresh runs in the background"""
+        (hass, config_entry) = setup
+        _, background_tasks = self.__setup_startup_mocks(mocker, self.__snapshot(), refresh_delay=0.2)
+
+        await async_setup_entry(hass, config_entry)
+
+        coordinator: ACInfinityDataUpdateCoordinator = hass.data[DOMAIN][ENTRY_ID]
+        hass.config_entries.async_forward_entry_setups.assert_called_with(config_entry, PLATFORMS)
+        assert coordinator.ac_infinity.is_stale
+        assert coordinator.ac_infinity.get_controller_property(str(DEVICE_ID), ControllerPropertyKey.DEVICE_NAME) == "Grow Tent"
+
+        await asyncio.gather(*background_tasks)
+        cast(MagicMock, ACInfinityService.refresh).assert_called_once()
+
+    async def test_async_setup_entry_persists_snapshot_after_refresh(self, mocker: MockFixture, setup):
+        """after a successful refresh, the data is saved to be loaded on the next startup"""
+        (hass, config_entry) = setup
+        delay_save, _ = self.__setup_startup_mocks(mocker, None, refresh_delay=0)
+
+        await async_setup_entry(hass, config_entry)
+
+        coordinator: ACInfinityDataUpdateCoordinator = hass.data[DOMAIN][ENTRY_ID]
+        delay_save.assert_called_once_with(coordinator.ac_infinity.export_snapshot, SNAPSHOT_SAVE_DELAY)
+
+    @pytest.mark.parametrize("persisted, expected_events", [(False, ["refreshed", "platforms"]), (True, ["platforms"])])
+    async def test_async_setup_entry_waits_on_refresh_only_without_snapshot(
+        self, mocker: MockFixture, setup, persisted, expected_events
+    ):
+        """a cold start sets up platforms after the first refresh, a start from a persisted snapshot before it"""
+        (hass, config_entry) = setup
+        _, background_tasks = self.__setup_startup_mocks(mocker, self.__snapshot() if persisted else None, refresh_delay=0)
+        events: list[str] = []
+
+        async def refresh(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            events.append("refreshed")
+
+        mocker.patch.object(ACInfinityService, "refresh", side_effect=refresh)
+        hass.config_entries.async_forward_entry_setups.side_effect = lambda *args: events.append("platforms")
+
+        await async_setup_entry(hass, config_entry)
+        assert events == expected_events
+
+        await asyncio.gather(*background_tasks)
+        assert events[-1] == ("refreshed" if persisted else "platforms")
+
+    async def test_async_setup_entry_startup_benchmark_cold_vs_cached(self, mocker: MockFixture, setup):
+        """benchmark: a cold start takes at least as long as the first refresh, while a start from a persisted
+        snapshot takes a fraction of it. The bounds leave room for slow machines"""
+        (hass, config_entry) = setup
+        refresh_delay = 0.3
+        self.__setup_startup_mocks(mocker, None, refresh_delay)
+
+        started = perf_counter()
+        await async_setup_entry(hass, config_entry)
+        cold = perf_counter() - started
+
+        hass.data = HassDict({})
+        _, background_tasks = self.__setup_startup_mocks(mocker, self.__snapshot(), refresh_delay)
+
+        started = perf_counter()
+        await async_setup_entry(hass, config_entry)
+        cached = perf_counter() - started
+        await asyncio.gather(*background_tasks)
+
+        assert cold >= refresh_delay
+        assert cached < refresh_delay / 2
+
+    async def test_async_unload_and_remove_entry_use_the_store_that_saves_the_snapshot(self, mocker: MockFixture, setup):
+        """unloading writes the pending snapshot before the service is closed, and removing the entry goes through
+        the store that scheduled the save, cancelling it"""
+        (hass, config_entry) = setup
+        self.__setup_startup_mocks(mocker, None, refresh_delay=0)
+        save = mocker.patch.object(Store, "async_save", autospec=True)
+        remove = mocker.patch.object(Store, "async_remove", autospec=True)
+
+        await async_setup_entry(hass, config_entry)
+        coordinator: ACInfinityDataUpdateCoordinator = hass.data[DOMAIN][ENTRY_ID]
+        coordinator.ac_infinity.load_snapshot(self.__snapshot())
+        snapshot_store = coordinator._snapshot_store
+
+        await async_unload_entry(hass, config_entry)
+        store, snapshot = save.call_args.args
+        assert store is snapshot_store
+        assert snapshot["controller_properties"]
+
+        await async_remove_entry(hass, config_entry)
+        assert any(call.args[0] is snapshot_store for call in remove.call_args_list)
+
+    async def test_async_remove_entry_uses_the_store_that_saves_the_token(self, mocker: MockFixture, setup):
+        """removing the entry goes through the store a token obtained by the client is saved with, cancelling a save
+        it still has pending"""
+        (hass, config_entry) = setup
+        self.__setup_startup_mocks(mocker, None, refresh_delay=0)
+        saved_by: list[Store] = []
+        mocker.patch.object(Store, "async_delay_save", new=lambda store, data_func, delay=0: saved_by.append(store))
+        remove = mocker.patch.object(Store, "async_remove", autospec=True)
+        client_init = cast(MagicMock, ACInfinityClient.__init__)
+
+        await async_setup_entry(hass, config_entry)
+        saved_by.clear()
+        client_init.call_args.kwargs["token_listener"]("new-token")
+        token_store, = saved_by
+
+        await async_unload_entry(hass, config_entry)
+        await async_remove_entry(hass, config_entry)
+        assert any(call.args[0] is token_store for call in remove.call_args_list)
+
+    @pytest.mark.parametrize(
+        "persisted, expected_token",
+        [
+            (None, None),
+            ({"email": CONFIG_ENTRY_DATA[CONF_EMAIL], "token": "persisted-token"}, "persisted-token"),
+            ({"email": "someone-else@unittest.com", "token": "persisted-token"}, None),
+        ],
+    )
+    async def test_async_setup_entry_reuses_persisted_token(self, mocker: MockFixture, setup, persisted, expected_token):
+        """a token persisted for the configured e-mail is handed to the client so it doesn't log in again"""
+        (hass, config_entry) = setup
+        self.__setup_startup_mocks(mocker, None, refresh_delay=0)
+        mocker.patch.object(Store, "async_load", side_effect=[persisted, None])
+        client_init = cast(MagicMock, ACInfinityClient.__init__)
+
+        await async_setup_entry(hass, config_entry)
+
+        args, kwargs = client_init.call_args
+        assert args[1:3] == (config_entry.data[CONF_EMAIL], config_entry.data[CONF_PASSWORD])
+        assert kwargs["token"] == expected_token
+
+    async def test_async_setup_entry_token_persisted_when_obtained(self, mocker: MockFixture, setup):
+        """a token obtained by the client is saved alongside the config entry"""
+        (hass, config_entry) = setup
+        delay_save, _ = self.__setup_startup_mocks(mocker, None, refresh_delay=0)
+        client_init = cast(MagicMock, ACInfinityClient.__init__)
+
+        await async_setup_entry(hass, config_entry)
+
+        token_listener = client_init.call_args.kwargs["token_listener"]
+        delay_save.reset_mock()
+        token_listener("new-token")
+
+        data_func, delay = delay_save.call_args.args
+        assert data_func() == {"email": config_entry.data[CONF_EMAIL], "token": "new-token"}
+        assert delay == 0
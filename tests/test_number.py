@@ -19,6 +19,7 @@ from tests import (
     ACTestObjects,
     execute_and_get_controller_entity,
     execute_and_get_device_entity,
+    republish,
     setup_entity_mocks,
 )
 from tests.data_models import DEVICE_ID, MAC_ADDR
@@ -80,6 +81,7 @@ class TestNumbers:
             setup, async_setup_entry, port, setting
         )
         test_objects.ac_infinity._device_controls[(str(DEVICE_ID), port)][setting] = value
+        republish(test_objects.ac_infinity)
         entity._handle_coordinator_update()
 
         assert isinstance(entity, ACInfinityDeviceNumberEntity)
@@ -148,6 +150,7 @@ class TestNumbers:
         )
 
         test_objects.ac_infinity._device_controls[(str(DEVICE_ID), port)][setting] = value
+        republish(test_objects.ac_infinity)
         entity._handle_coordinator_update()
 
         assert isinstance(entity, ACInfinityDeviceNumberEntity)
@@ -248,6 +251,7 @@ class TestNumbers:
         )
 
         test_objects.ac_infinity._device_controls[(str(DEVICE_ID), port)][setting] = value
+        republish(test_objects.ac_infinity)
         entity._handle_coordinator_update()
 
         assert isinstance(entity, ACInfinityDeviceNumberEntity)
@@ -276,6 +280,7 @@ class TestNumbers:
         )
 
         test_objects.ac_infinity._device_controls[(str(DEVICE_ID), port)][setting] = value
+        republish(test_objects.ac_infinity)
         entity._handle_coordinator_update()
 
         assert isinstance(entity, ACInfinityDeviceNumberEntity)
@@ -307,6 +312,7 @@ class TestNumbers:
         test_objects.ac_infinity._device_controls[(str(DEVICE_ID), port)][
             setting
         ] = prev_value
+        republish(test_objects.ac_infinity)
         entity = await execute_and_get_device_entity(
             setup, async_setup_entry, port, setting
         )
@@ -344,6 +350,7 @@ class TestNumbers:
         test_objects.ac_infinity._device_controls[(str(DEVICE_ID), port)][
             setting
         ] = prev_value
+        republish(test_objects.ac_infinity)
         entity = await execute_and_get_device_entity(
             setup, async_setup_entry, port, setting
         )
@@ -396,6 +403,7 @@ class TestNumbers:
         )
 
         test_objects.ac_infinity._device_controls[(str(DEVICE_ID), port)][setting] = value
+        republish(test_objects.ac_infinity)
         entity._handle_coordinator_update()
 
         assert isinstance(entity, ACInfinityDeviceNumberEntity)
@@ -460,6 +468,7 @@ class TestNumbers:
         )
 
         test_objects.ac_infinity._device_controls[(str(DEVICE_ID), port)][setting] = value
+        republish(test_objects.ac_infinity)
         entity._handle_coordinator_update()
 
         assert isinstance(entity, ACInfinityDeviceNumberEntity)
@@ -522,6 +531,7 @@ class TestNumbers:
         test_objects.ac_infinity._device_settings[(str(DEVICE_ID), 1)][
             AdvancedSettingsKey.TEMP_UNIT
         ] = temp_unit
+        republish(test_objects.ac_infinity)
 
         entity = await execute_and_get_controller_entity(
             setup, async_setup_entry, setting
@@ -580,6 +590,7 @@ class TestNumbers:
         test_objects.ac_infinity._device_settings[(str(DEVICE_ID), port)][
             setting
         ] = value
+        republish(test_objects.ac_infinity)
         entity._handle_coordinator_update()
 
         assert isinstance(entity, ACInfinityControllerNumberEntity)
@@ -610,6 +621,7 @@ class TestNumbers:
         test_objects.ac_infinity._device_settings[(str(DEVICE_ID), 0)][
             AdvancedSettingsKey.TEMP_UNIT
         ] = temp_unit
+        republish(test_objects.ac_infinity)
 
         entity = await execute_and_get_controller_entity(
             setup, async_setup_entry, AdvancedSettingsKey.CALIBRATE_TEMP
@@ -660,6 +672,7 @@ class TestNumbers:
         test_objects.ac_infinity._device_settings[(str(DEVICE_ID), 0)][
             AdvancedSettingsKey.TEMP_UNIT
         ] = temp_unit
+        republish(test_objects.ac_infinity)
 
         entity = await execute_and_get_controller_entity(
             setup, async_setup_entry, AdvancedSettingsKey.VPD_LEAF_TEMP_OFFSET
@@ -722,6 +735,7 @@ class TestNumbers:
         test_objects.ac_infinity._device_settings[(str(DEVICE_ID), port)][
             AdvancedSettingsKey.TEMP_UNIT
         ] = temp_unit
+        republish(test_objects.ac_infinity)
 
         entity = await execute_and_get_device_entity(
             setup, async_setup_entry, port, setting
@@ -797,6 +811,7 @@ class TestNumbers:
         test_objects.ac_infinity._device_settings[(str(DEVICE_ID), port)][
             setting
         ] = value
+        republish(test_objects.ac_infinity)
         entity._handle_coordinator_update()
 
         assert isinstance(entity, ACInfinityDeviceNumberEntity)
@@ -844,6 +859,7 @@ class TestNumbers:
         test_objects.ac_infinity._device_settings[(str(DEVICE_ID), port)][
             AdvancedSettingsKey.TEMP_UNIT
         ] = temp_unit
+        republish(test_objects.ac_infinity)
 
         entity = await execute_and_get_device_entity(
             setup, async_setup_entry, port, setting
@@ -964,6 +980,7 @@ class TestNumbers:
         test_objects.ac_infinity._device_settings[(str(DEVICE_ID), port)][
             AdvancedSettingsKey.SUNRISE_TIMER_DURATION
         ] = 154
+        republish(test_objects.ac_infinity)
         entity._handle_coordinator_update()
 
         assert isinstance(entity, ACInfinityDeviceNumberEntity)
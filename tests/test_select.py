@@ -18,6 +18,7 @@ from tests import (
     ACTestObjects,
     execute_and_get_controller_entity,
     execute_and_get_device_entity,
+    republish,
     setup_entity_mocks,
 )
 from tests.data_models import DEVICE_ID, MAC_ADDR
@@ -115,6 +116,7 @@ class TestSelectors:
         )
 
         test_objects.ac_infinity._device_settings[(str(DEVICE_ID), 0)][setting] = value
+        republish(test_objects.ac_infinity)
         entity._handle_coordinator_update()
 
         assert isinstance(entity, ACInfinityControllerSelectEntity)
@@ -185,6 +187,7 @@ class TestSelectors:
         test_objects.ac_infinity._device_controls[(str(DEVICE_ID), port)][
             DeviceControlKey.AT_TYPE
         ] = at_type
+        republish(test_objects.ac_infinity)
         entity._handle_coordinator_update()
 
         assert isinstance(entity, ACInfinityDeviceSelectEntity)
@@ -257,6 +260,7 @@ class TestSelectors:
         test_objects.ac_infinity._device_controls[(str(DEVICE_ID), port)][
             setting
         ] = setting_mode
+        republish(test_objects.ac_infinity)
         entity._handle_coordinator_update()
 
         assert isinstance(entity, ACInfinityDeviceSelectEntity)
@@ -322,6 +326,7 @@ class TestSelectors:
         test_objects.ac_infinity._device_settings[(str(DEVICE_ID), port)][
             AdvancedSettingsKey.DYNAMIC_RESPONSE_TYPE
         ] = value
+        republish(test_objects.ac_infinity)
         entity._handle_coordinator_update()
 
         assert isinstance(entity, ACInfinityDeviceSelectEntity)
@@ -388,6 +393,7 @@ class TestSelectors:
         test_objects.ac_infinity._device_settings[(str(DEVICE_ID), port)][
             AdvancedSettingsKey.DEVICE_LOAD_TYPE
         ] = load_type
+        republish(test_objects.ac_infinity)
         entity._handle_coordinator_update()
 
         assert isinstance(entity, ACInfinityDeviceSelectEntity)
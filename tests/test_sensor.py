@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
 import pytest
@@ -7,14 +7,17 @@ from homeassistant.components.sensor import SensorDeviceClass
 from homeassistant.const import (
     CONCENTRATION_PARTS_PER_MILLION,
     PERCENTAGE,
+    EntityCategory,
     UnitOfPressure,
     UnitOfTemperature,
+    UnitOfTime,
 )
 from pytest_mock import MockFixture
 
 from custom_components.ac_infinity.const import (
     DOMAIN,
     ControllerPropertyKey,
+    CustomControllerPropertyKey,
     CustomDevicePropertyKey,
     DevicePropertyKey,
     SensorPropertyKey,
@@ -32,6 +35,8 @@ from tests import (
     execute_and_get_controller_entity,
     execute_and_get_device_entity,
     execute_and_get_sensor_entity,
+    publish,
+    republish,
     setup_entity_mocks,
 )
 from tests.data_models import (
@@ -68,7 +73,7 @@ class TestSensors:
             test_objects.entities.add_entities_callback,
         )
 
-        assert len(test_objects.entities._added_entities) == 28
+        assert len(test_objects.entities._added_entities) == 26
 
     async def test_async_setup_entry_temperature_created(self, setup):
         """Sensor for device reported temperature is created on setup for non-ai controllers"""
@@ -101,6 +106,7 @@ class TestSensors:
         test_objects.ac_infinity._controller_properties[str(DEVICE_ID)][
             ControllerPropertyKey.TEMPERATURE
         ] = value
+        republish(test_objects.ac_infinity)
 
         entity._handle_coordinator_update()
 
@@ -135,6 +141,7 @@ class TestSensors:
         test_objects.ac_infinity._controller_properties[str(DEVICE_ID)][
             ControllerPropertyKey.HUMIDITY
         ] = value
+        republish(test_objects.ac_infinity)
         entity._handle_coordinator_update()
 
         assert isinstance(entity, ACInfinityControllerSensorEntity)
@@ -156,6 +163,87 @@ class TestSensors:
         )
         assert entity.device_info is not None
 
+    async def test_async_setup_entry_polling_interval_created(self, setup):
+        """Diagnostic sensor for the polling interval is created on setup"""
+
+        entity = await execute_and_get_controller_entity(
+            setup, async_setup_entry, CustomControllerPropertyKey.POLLING_INTERVAL
+        )
+
+        assert isinstance(entity, ACInfinityControllerSensorEntity)
+        assert entity.unique_id == f"{DOMAIN}_{MAC_ADDR}_{CustomControllerPropertyKey.POLLING_INTERVAL}"
+        assert entity.entity_description.device_class == SensorDeviceClass.DURATION
+        assert entity.entity_description.native_unit_of_measurement == UnitOfTime.SECONDS
+        assert entity.entity_description.entity_category == EntityCategory.DIAGNOSTIC
+        assert entity.device_info is not None
+
+    async def test_async_update_polling_interval_value_correct(self, setup):
+        """Reported polling interval matches the interval the coordinator picked for the next refresh"""
+
+        test_objects: ACTestObjects = setup
+        entity = await execute_and_get_controller_entity(
+            setup, async_setup_entry, CustomControllerPropertyKey.POLLING_INTERVAL
+        )
+
+        test_objects.coordinator.update_interval = timedelta(seconds=45)
+        entity._handle_coordinator_update()
+
+        assert isinstance(entity, ACInfinityControllerSensorEntity)
+        assert entity.native_value == 45
+
+    async def test_async_setup_entry_polling_interval_created_once(self, setup):
+        """The account-wide polling interval is reported by the first controller only"""
+
+        test_objects: ACTestObjects = setup
+
+        await async_setup_entry(
+            test_objects.hass,
+            test_objects.config_entry,
+            test_objects.entities.add_entities_callback,
+        )
+
+        found = [
+            entity.unique_id
+            for entity in test_objects.entities.added_entities
+            if CustomControllerPropertyKey.POLLING_INTERVAL in entity.unique_id
+        ]
+        assert found == [f"{DOMAIN}_{MAC_ADDR}_{CustomControllerPropertyKey.POLLING_INTERVAL}"]
+
+    async def test_async_update_refresh_error_rate_value_correct(self, setup):
+        """Reported error rate is the percentage of recent refreshes that failed, and stays available while they fail"""
+
+        test_objects: ACTestObjects = setup
+        entity = await execute_and_get_controller_entity(
+            setup, async_setup_entry, CustomControllerPropertyKey.REFRESH_ERROR_RATE
+        )
+
+        test_objects.coordinator._refresh_outcomes.extend([True, False, False, True])
+        test_objects.coordinator.last_update_success = False
+        entity._handle_coordinator_update()
+
+        assert isinstance(entity, ACInfinityControllerSensorEntity)
+        assert entity.entity_description.entity_category == EntityCategory.DIAGNOSTIC
+        assert entity.native_value == 50
+        assert entity.available
+
+    async def test_async_setup_entry_refresh_error_rate_created_once(self, setup):
+        """The account-wide refresh error rate is reported by the first controller only"""
+
+        test_objects: ACTestObjects = setup
+
+        await async_setup_entry(
+            test_objects.hass,
+            test_objects.config_entry,
+            test_objects.entities.add_entities_callback,
+        )
+
+        found = [
+            entity.unique_id
+            for entity in test_objects.entities.added_entities
+            if CustomControllerPropertyKey.REFRESH_ERROR_RATE in entity.unique_id
+        ]
+        assert found == [f"{DOMAIN}_{MAC_ADDR}_{CustomControllerPropertyKey.REFRESH_ERROR_RATE}"]
+
     @pytest.mark.parametrize("value,expected", [(0, 0), (105, 1.05), (None, 0)])
     async def test_async_update_vpd_value_correct(self, setup, value, expected):
         """Reported sensor value matches the value in the json payload"""
@@ -168,6 +256,7 @@ class TestSensors:
         test_objects.ac_infinity._controller_properties[str(DEVICE_ID)][
             ControllerPropertyKey.VPD
         ] = value
+        republish(test_objects.ac_infinity)
         entity._handle_coordinator_update()
 
         assert isinstance(entity, ACInfinityControllerSensorEntity)
@@ -215,14 +304,15 @@ class TestSensors:
         """Sensor for device reported temperature is created on setup for AI controllers"""
 
         test_objects: ACTestObjects = setup
-        test_objects.ac_infinity._sensor_properties[
+        sensor_properties = dict(test_objects.ac_infinity._sensor_properties)
+        sensor_properties[
             (
                 str(AI_DEVICE_ID),
                 CONTROLLER_ACCESS_PORT,
                 SensorType.CONTROLLER_TEMPERATURE_F,
             )
         ] = SENSOR_PROPERTY_CONTROLLER_TEMP_F
-        test_objects.ac_infinity._sensor_properties.pop(
+        sensor_properties.pop(
             (
                 str(AI_DEVICE_ID),
                 CONTROLLER_ACCESS_PORT,
@@ -230,6 +320,7 @@ class TestSensors:
             ),
             None,
         )
+        publish(test_objects.ac_infinity, sensor_properties=sensor_properties)
 
         entity = await execute_and_get_sensor_entity(
             setup,
@@ -259,14 +350,15 @@ class TestSensors:
         """Reported sensor value matches the value in the json payload.  Fahrenheit should be represented as Celsius"""
 
         test_objects: ACTestObjects = setup
-        test_objects.ac_infinity._sensor_properties[
+        sensor_properties = dict(test_objects.ac_infinity._sensor_properties)
+        sensor_properties[
             (
                 str(AI_DEVICE_ID),
                 CONTROLLER_ACCESS_PORT,
                 SensorType.CONTROLLER_TEMPERATURE_F,
             )
         ] = SENSOR_PROPERTY_CONTROLLER_TEMP_F
-        test_objects.ac_infinity._sensor_properties.pop(
+        sensor_properties.pop(
             (
                 str(AI_DEVICE_ID),
                 CONTROLLER_ACCESS_PORT,
@@ -274,6 +366,7 @@ class TestSensors:
             ),
             None,
         )
+        publish(test_objects.ac_infinity, sensor_properties=sensor_properties)
 
         entity = await execute_and_get_sensor_entity(
             setup,
@@ -299,7 +392,8 @@ class TestSensors:
         """Sensor for device reported temperature is created on setup for AI controllers"""
 
         test_objects: ACTestObjects = setup
-        test_objects.ac_infinity._sensor_properties.pop(
+        sensor_properties = dict(test_objects.ac_infinity._sensor_properties)
+        sensor_properties.pop(
             (
                 str(AI_DEVICE_ID),
                 CONTROLLER_ACCESS_PORT,
@@ -307,13 +401,14 @@ class TestSensors:
             ),
             None,
         )
-        test_objects.ac_infinity._sensor_properties[
+        sensor_properties[
             (
                 str(AI_DEVICE_ID),
                 CONTROLLER_ACCESS_PORT,
                 SensorType.CONTROLLER_TEMPERATURE_C,
             )
         ] = SENSOR_PROPERTY_CONTROLLER_TEMP_C
+        publish(test_objects.ac_infinity, sensor_properties=sensor_properties)
 
         entity = await execute_and_get_sensor_entity(
             setup,
@@ -341,7 +436,8 @@ class TestSensors:
         """Reported sensor value matches the value in the json payload.  Celsius should continue to be represented as Celsius"""
 
         test_objects: ACTestObjects = setup
-        test_objects.ac_infinity._sensor_properties.pop(
+        sensor_properties = dict(test_objects.ac_infinity._sensor_properties)
+        sensor_properties.pop(
             (
                 str(AI_DEVICE_ID),
                 CONTROLLER_ACCESS_PORT,
@@ -349,13 +445,14 @@ class TestSensors:
             ),
             None,
         )
-        test_objects.ac_infinity._sensor_properties[
+        sensor_properties[
             (
                 str(AI_DEVICE_ID),
                 CONTROLLER_ACCESS_PORT,
                 SensorType.CONTROLLER_TEMPERATURE_C,
             )
         ] = SENSOR_PROPERTY_CONTROLLER_TEMP_C
+        publish(test_objects.ac_infinity, sensor_properties=sensor_properties)
 
         entity = await execute_and_get_sensor_entity(
             setup,
@@ -469,13 +566,15 @@ class TestSensors:
         """Sensor for device reported temperature is created on setup for AI controllers"""
 
         test_objects: ACTestObjects = setup
-        test_objects.ac_infinity._sensor_properties[
+        sensor_properties = dict(test_objects.ac_infinity._sensor_properties)
+        sensor_properties[
             (str(AI_DEVICE_ID), PROBE_ACCESS_PORT, SensorType.PROBE_TEMPERATURE_F)
         ] = SENSOR_PROPERTY_PROBE_TEMP_F
-        test_objects.ac_infinity._sensor_properties.pop(
+        sensor_properties.pop(
             (str(AI_DEVICE_ID), PROBE_ACCESS_PORT, SensorType.CONTROLLER_TEMPERATURE_C),
             None,
         )
+        publish(test_objects.ac_infinity, sensor_properties=sensor_properties)
 
         entity = await execute_and_get_sensor_entity(
             setup,
@@ -505,13 +604,15 @@ class TestSensors:
         """Reported sensor value matches the value in the json payload.  Fahrenheit should be represented as Celsius"""
 
         test_objects: ACTestObjects = setup
-        test_objects.ac_infinity._sensor_properties[
+        sensor_properties = dict(test_objects.ac_infinity._sensor_properties)
+        sensor_properties[
             (str(AI_DEVICE_ID), PROBE_ACCESS_PORT, SensorType.PROBE_TEMPERATURE_F)
         ] = SENSOR_PROPERTY_PROBE_TEMP_F
-        test_objects.ac_infinity._sensor_properties.pop(
+        sensor_properties.pop(
             (str(AI_DEVICE_ID), PROBE_ACCESS_PORT, SensorType.CONTROLLER_TEMPERATURE_C),
             None,
         )
+        publish(test_objects.ac_infinity, sensor_properties=sensor_properties)
 
         entity = await execute_and_get_sensor_entity(
             setup,
@@ -533,12 +634,14 @@ class TestSensors:
         """Sensor for device reported temperature is created on setup for AI controllers"""
 
         test_objects: ACTestObjects = setup
-        test_objects.ac_infinity._sensor_properties.pop(
+        sensor_properties = dict(test_objects.ac_infinity._sensor_properties)
+        sensor_properties.pop(
             (str(AI_DEVICE_ID), PROBE_ACCESS_PORT, SensorType.PROBE_TEMPERATURE_F), None
         )
-        test_objects.ac_infinity._sensor_properties[
+        sensor_properties[
             (str(AI_DEVICE_ID), PROBE_ACCESS_PORT, SensorType.PROBE_TEMPERATURE_C)
         ] = SENSOR_PROPERTY_PROBE_TEMP_C
+        publish(test_objects.ac_infinity, sensor_properties=sensor_properties)
 
         entity = await execute_and_get_sensor_entity(
             setup,
@@ -566,13 +669,15 @@ class TestSensors:
         """Reported sensor value matches the value in the json payload.  Celsius should continue to be represented as Celsius"""
 
         test_objects: ACTestObjects = setup
-        test_objects.ac_infinity._sensor_properties.pop(
-            (str(AI_DEVICE_ID), PROBE_ACCESS_PORT, SensorType.CONTROLLER_TEMPERATURE_F),
+        sensor_properties = dict(test_objects.ac_infinity._sensor_properties)
+        sensor_properties.pop(
+            (str(AI_DEVICE_ID), PROBE_ACCESS_PORT, SensorType.PROBE_TEMPERATURE_F),
             None,
         )
-        test_objects.ac_infinity._sensor_properties[
+        sensor_properties[
             (str(AI_DEVICE_ID), PROBE_ACCESS_PORT, SensorType.PROBE_TEMPERATURE_C)
         ] = SENSOR_PROPERTY_CONTROLLER_TEMP_C
+        publish(test_objects.ac_infinity, sensor_properties=sensor_properties)
 
         entity = await execute_and_get_sensor_entity(
             setup,
@@ -873,6 +978,7 @@ class TestSensors:
         test_objects.ac_infinity._device_properties[(str(DEVICE_ID), port)][
             DevicePropertyKey.SPEAK
         ] = value
+        republish(test_objects.ac_infinity)
 
         entity = await execute_and_get_device_entity(
             setup, async_setup_entry, port, DevicePropertyKey.SPEAK
@@ -897,6 +1003,7 @@ class TestSensors:
         test_objects.ac_infinity._device_properties[(str(DEVICE_ID), port)][
             DevicePropertyKey.REMAINING_TIME
         ] = value
+        republish(test_objects.ac_infinity)
         entity._handle_coordinator_update()
 
         assert isinstance(entity, ACInfinityDeviceSensorEntity)
@@ -936,6 +1043,7 @@ class TestSensors:
         test_objects.ac_infinity._device_properties[(str(DEVICE_ID), port)][
             DevicePropertyKey.REMAINING_TIME
         ] = value
+        republish(test_objects.ac_infinity)
         entity._handle_coordinator_update()
 
         assert isinstance(entity, ACInfinityDeviceSensorEntity)
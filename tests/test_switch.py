@@ -19,6 +19,7 @@ from custom_components.ac_infinity.switch import (
 from tests import (
     ACTestObjects,
     execute_and_get_device_entity,
+    republish,
     setup_entity_mocks,
 )
 from tests.data_models import DEVICE_ID, MAC_ADDR
@@ -130,6 +131,7 @@ class TestSwitches:
         )
 
         test_objects.ac_infinity._device_controls[(str(DEVICE_ID), port)][setting] = value
+        republish(test_objects.ac_infinity)
 
         entity._handle_coordinator_update()
 
@@ -162,6 +164,7 @@ class TestSwitches:
         test_objects.ac_infinity._device_settings[(str(DEVICE_ID), port)][
             setting
         ] = value
+        republish(test_objects.ac_infinity)
 
         entity._handle_coordinator_update()
 
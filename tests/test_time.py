@@ -14,7 +14,12 @@ from custom_components.ac_infinity.time import (
     ACInfinityDeviceTimeEntity,
     async_setup_entry,
 )
-from tests import ACTestObjects, execute_and_get_device_entity, setup_entity_mocks
+from tests import (
+    ACTestObjects,
+    execute_and_get_device_entity,
+    republish,
+    setup_entity_mocks,
+)
 from tests.data_models import DEVICE_ID, MAC_ADDR
 
 
@@ -81,6 +86,7 @@ class TestTimes:
         )
 
         test_objects.ac_infinity._device_controls[(str(DEVICE_ID), port)][setting] = value
+        republish(test_objects.ac_infinity)
         entity._handle_coordinator_update()
 
         assert isinstance(entity, ACInfinityDeviceTimeEntity)
@@ -106,6 +112,7 @@ class TestTimes:
         )
 
         test_objects.ac_infinity._device_controls[(str(DEVICE_ID), port)][setting] = value
+        republish(test_objects.ac_infinity)
         entity._handle_coordinator_update()
 
         assert isinstance(entity, ACInfinityDeviceTimeEntity)